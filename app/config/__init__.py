@@ -40,6 +40,10 @@ class AzureSpeechSettings(BaseModel):
 class AzureDocumentIntelligenceSettings(BaseModel):
     endpoint: str
     api_key: str
+    poll_deadline_seconds: float = 180.0
+    max_concurrency: int = 4
+    cache_dir: str | None = ".cache/ocr"
+    cache_max_mb: int = 512
 
 
 class AWSSettings(BaseModel):
@@ -53,6 +57,7 @@ class AWSSettings(BaseModel):
     cdn_html_base: str
     cdn_base: str
     default_error_image: str
+    s3_max_pool_connections: int = 32
 
 
 class AIImageSettings(BaseModel):
@@ -84,6 +89,73 @@ class VoiceStorageSettings(BaseModel):
     prefix: str
 
 
+class VoiceFailoverSettings(BaseModel):
+    enabled: bool = True
+    provider_timeout_seconds: float = 30.0
+    hedge_percentile: float = 0.95
+    hedge_initial_delay_seconds: float = 3.0
+    hedge_max_delay_seconds: float = 10.0
+    failure_threshold: int = 3
+    cooldown_seconds: float = 60.0
+
+
+class VoiceChunkingSettings(BaseModel):
+    enabled: bool = True
+    threshold_chars: int = 400
+    chunk_chars: int = 200
+    max_parallel: int = 4
+
+
+class URLExtractionSettings(BaseModel):
+    fetch_workers: int = 8
+    parse_workers: int = 0
+    deadline_seconds: float = 20.0
+    request_timeout_seconds: float = 15.0
+    parser_mode: str = "native"
+    cache_enabled: bool = True
+    cache_max_entries: int = 512
+    cache_ttl_seconds: float = 86400.0
+
+
+class PdfTextLayerSettings(BaseModel):
+    enabled: bool = True
+    min_chars_per_page: int = 200
+
+
+class LanguageDetectionSettings(BaseModel):
+    min_confidence: float = 0.7
+    fasttext_model_path: str = ""
+    fasttext_preload: bool = False
+
+
+class KeywordSettings(BaseModel):
+    df_path: str = ".cache/keywords/df.json"
+    max_ngram: int = 3
+
+
+class GazetteerSettings(BaseModel):
+    enabled: bool = True
+    path: str = "config/gazetteers"
+    check_interval_seconds: float = 30.0
+
+
+class StoryClassifierSettings(BaseModel):
+    model_path: str = ""
+    min_confidence: float = 0.7
+
+
+class HTMLTemplateSettings(BaseModel):
+    cache_max_age_seconds: float = 300.0
+    rendered_cache_enabled: bool = True
+    rendered_cache_max_entries: int = 256
+    rendered_cache_ttl_seconds: float = 600.0
+
+
+class NarrationTrackSettings(BaseModel):
+    enabled: bool = True
+    silence_padding_ms: int = 400
+
+
 class DatabaseSettings(BaseModel):
     url: str = "sqlite:///./stories.db"
 
@@ -100,6 +172,16 @@ class AppSettings(BaseModel):
     elevenlabs: ElevenLabsSettings | None = None
     azure_voice: AzureVoiceSettings | None = None
     voice_storage: VoiceStorageSettings | None = None
+    voice_failover: VoiceFailoverSettings = VoiceFailoverSettings()
+    voice_chunking: VoiceChunkingSettings = VoiceChunkingSettings()
+    url_extraction: URLExtractionSettings = URLExtractionSettings()
+    pdf_text_layer: PdfTextLayerSettings = PdfTextLayerSettings()
+    language_detection: LanguageDetectionSettings = LanguageDetectionSettings()
+    keywords: KeywordSettings = KeywordSettings()
+    gazetteer: GazetteerSettings = GazetteerSettings()
+    story_classifier: StoryClassifierSettings = StoryClassifierSettings()
+    html_templates: HTMLTemplateSettings = HTMLTemplateSettings()
+    narration_track: NarrationTrackSettings = NarrationTrackSettings()
     database: DatabaseSettings = DatabaseSettings()
 
 
@@ -130,6 +212,10 @@ def _env_override() -> Dict[str, Any]:
         "azure_di": {
             "endpoint": os.getenv("AZURE_DI_ENDPOINT"),
             "api_key": os.getenv("AZURE_DI_KEY"),
+            "poll_deadline_seconds": os.getenv("AZURE_DI_POLL_DEADLINE_SECONDS"),
+            "max_concurrency": os.getenv("AZURE_DI_MAX_CONCURRENCY"),
+            "cache_dir": os.getenv("AZURE_DI_CACHE_DIR"),
+            "cache_max_mb": os.getenv("AZURE_DI_CACHE_MAX_MB"),
         },
         "aws": {
             "access_key": os.getenv("AWS_ACCESS_KEY"),
@@ -142,6 +228,7 @@ def _env_override() -> Dict[str, Any]:
             "cdn_html_base": os.getenv("CDN_HTML_BASE"),
             "cdn_base": os.getenv("CDN_BASE"),
             "default_error_image": os.getenv("DEFAULT_ERROR_IMAGE"),
+            "s3_max_pool_connections": os.getenv("AWS_S3_MAX_POOL_CONNECTIONS"),
         },
         "ai_image": {
             "endpoint": os.getenv("AI_IMAGE_ENDPOINT"),
@@ -162,6 +249,63 @@ def _env_override() -> Dict[str, Any]:
             "bucket": os.getenv("VOICE_BUCKET"),
             "prefix": os.getenv("VOICE_PREFIX"),
         },
+        "voice_failover": {
+            "enabled": os.getenv("VOICE_FAILOVER_ENABLED"),
+            "provider_timeout_seconds": os.getenv("VOICE_PROVIDER_TIMEOUT_SECONDS"),
+            "hedge_percentile": os.getenv("VOICE_HEDGE_PERCENTILE"),
+            "hedge_initial_delay_seconds": os.getenv("VOICE_HEDGE_INITIAL_DELAY_SECONDS"),
+            "hedge_max_delay_seconds": os.getenv("VOICE_HEDGE_MAX_DELAY_SECONDS"),
+            "failure_threshold": os.getenv("VOICE_FAILURE_THRESHOLD"),
+            "cooldown_seconds": os.getenv("VOICE_COOLDOWN_SECONDS"),
+        },
+        "voice_chunking": {
+            "enabled": os.getenv("VOICE_CHUNKING_ENABLED"),
+            "threshold_chars": os.getenv("VOICE_CHUNKING_THRESHOLD_CHARS"),
+            "chunk_chars": os.getenv("VOICE_CHUNK_CHARS"),
+            "max_parallel": os.getenv("VOICE_CHUNKING_MAX_PARALLEL"),
+        },
+        "url_extraction": {
+            "fetch_workers": os.getenv("URL_FETCH_WORKERS"),
+            "parse_workers": os.getenv("URL_PARSE_WORKERS"),
+            "deadline_seconds": os.getenv("URL_EXTRACTION_DEADLINE_SECONDS"),
+            "request_timeout_seconds": os.getenv("URL_REQUEST_TIMEOUT_SECONDS"),
+            "parser_mode": os.getenv("URL_PARSER_MODE"),
+            "cache_enabled": os.getenv("URL_CACHE_ENABLED"),
+            "cache_max_entries": os.getenv("URL_CACHE_MAX_ENTRIES"),
+            "cache_ttl_seconds": os.getenv("URL_CACHE_TTL_SECONDS"),
+        },
+        "pdf_text_layer": {
+            "enabled": os.getenv("PDF_TEXT_LAYER_ENABLED"),
+            "min_chars_per_page": os.getenv("PDF_MIN_CHARS_PER_PAGE"),
+        },
+        "language_detection": {
+            "min_confidence": os.getenv("LANGUAGE_MIN_CONFIDENCE"),
+            "fasttext_model_path": os.getenv("FASTTEXT_MODEL_PATH"),
+            "fasttext_preload": os.getenv("FASTTEXT_PRELOAD"),
+        },
+        "keywords": {
+            "df_path": os.getenv("KEYWORD_DF_PATH"),
+            "max_ngram": os.getenv("KEYWORD_MAX_NGRAM"),
+        },
+        "gazetteer": {
+            "enabled": os.getenv("GAZETTEER_ENABLED"),
+            "path": os.getenv("GAZETTEER_PATH"),
+            "check_interval_seconds": os.getenv("GAZETTEER_CHECK_INTERVAL_SECONDS"),
+        },
+        "story_classifier": {
+            "model_path": os.getenv("STORY_CLASSIFIER_MODEL_PATH"),
+            "min_confidence": os.getenv("STORY_CLASSIFIER_MIN_CONFIDENCE"),
+        },
+        "html_templates": {
+            "cache_max_age_seconds": os.getenv("TEMPLATE_CACHE_MAX_AGE_SECONDS"),
+            "rendered_cache_enabled": os.getenv("RENDERED_HTML_CACHE_ENABLED"),
+            "rendered_cache_max_entries": os.getenv("RENDERED_HTML_CACHE_MAX_ENTRIES"),
+            "rendered_cache_ttl_seconds": os.getenv("RENDERED_HTML_CACHE_TTL_SECONDS"),
+        },
+        "narration_track": {
+            "enabled": os.getenv("NARRATION_TRACK_ENABLED"),
+            "silence_padding_ms": os.getenv("NARRATION_SILENCE_PADDING_MS"),
+        },
         "database": {
             "url": os.getenv("DATABASE_URL"),
         },
@@ -205,6 +349,10 @@ SECTION_MAPPING: Dict[str, Dict[str, str]] = {
     "azure_di": {
         "AZURE_DI_ENDPOINT": "endpoint",
         "AZURE_DI_KEY": "api_key",
+        "AZURE_DI_POLL_DEADLINE_SECONDS": "poll_deadline_seconds",
+        "AZURE_DI_MAX_CONCURRENCY": "max_concurrency",
+        "AZURE_DI_CACHE_DIR": "cache_dir",
+        "AZURE_DI_CACHE_MAX_MB": "cache_max_mb",
     },
     "aws": {
         "AWS_ACCESS_KEY": "access_key",
@@ -217,6 +365,7 @@ SECTION_MAPPING: Dict[str, Dict[str, str]] = {
         "CDN_HTML_BASE": "cdn_html_base",
         "CDN_BASE": "cdn_base",
         "DEFAULT_ERROR_IMAGE": "default_error_image",
+        "AWS_S3_MAX_POOL_CONNECTIONS": "s3_max_pool_connections",
     },
     "ai_image": {
         "AI_IMAGE_ENDPOINT": "endpoint",
@@ -241,6 +390,63 @@ SECTION_MAPPING: Dict[str, Dict[str, str]] = {
         "VOICE_BUCKET": "bucket",
         "VOICE_PREFIX": "prefix",
     },
+    "voice_failover": {
+        "VOICE_FAILOVER_ENABLED": "enabled",
+        "VOICE_PROVIDER_TIMEOUT_SECONDS": "provider_timeout_seconds",
+        "VOICE_HEDGE_PERCENTILE": "hedge_percentile",
+        "VOICE_HEDGE_INITIAL_DELAY_SECONDS": "hedge_initial_delay_seconds",
+        "VOICE_HEDGE_MAX_DELAY_SECONDS": "hedge_max_delay_seconds",
+        "VOICE_FAILURE_THRESHOLD": "failure_threshold",
+        "VOICE_COOLDOWN_SECONDS": "cooldown_seconds",
+    },
+    "voice_chunking": {
+        "VOICE_CHUNKING_ENABLED": "enabled",
+        "VOICE_CHUNKING_THRESHOLD_CHARS": "threshold_chars",
+        "VOICE_CHUNK_CHARS": "chunk_chars",
+        "VOICE_CHUNKING_MAX_PARALLEL": "max_parallel",
+    },
+    "url_extraction": {
+        "URL_FETCH_WORKERS": "fetch_workers",
+        "URL_PARSE_WORKERS": "parse_workers",
+        "URL_EXTRACTION_DEADLINE_SECONDS": "deadline_seconds",
+        "URL_REQUEST_TIMEOUT_SECONDS": "request_timeout_seconds",
+        "URL_PARSER_MODE": "parser_mode",
+        "URL_CACHE_ENABLED": "cache_enabled",
+        "URL_CACHE_MAX_ENTRIES": "cache_max_entries",
+        "URL_CACHE_TTL_SECONDS": "cache_ttl_seconds",
+    },
+    "pdf_text_layer": {
+        "PDF_TEXT_LAYER_ENABLED": "enabled",
+        "PDF_MIN_CHARS_PER_PAGE": "min_chars_per_page",
+    },
+    "language_detection": {
+        "LANGUAGE_MIN_CONFIDENCE": "min_confidence",
+        "FASTTEXT_MODEL_PATH": "fasttext_model_path",
+        "FASTTEXT_PRELOAD": "fasttext_preload",
+    },
+    "keywords": {
+        "KEYWORD_DF_PATH": "df_path",
+        "KEYWORD_MAX_NGRAM": "max_ngram",
+    },
+    "gazetteer": {
+        "GAZETTEER_ENABLED": "enabled",
+        "GAZETTEER_PATH": "path",
+        "GAZETTEER_CHECK_INTERVAL_SECONDS": "check_interval_seconds",
+    },
+    "story_classifier": {
+        "STORY_CLASSIFIER_MODEL_PATH": "model_path",
+        "STORY_CLASSIFIER_MIN_CONFIDENCE": "min_confidence",
+    },
+    "html_templates": {
+        "TEMPLATE_CACHE_MAX_AGE_SECONDS": "cache_max_age_seconds",
+        "RENDERED_HTML_CACHE_ENABLED": "rendered_cache_enabled",
+        "RENDERED_HTML_CACHE_MAX_ENTRIES": "rendered_cache_max_entries",
+        "RENDERED_HTML_CACHE_TTL_SECONDS": "rendered_cache_ttl_seconds",
+    },
+    "narration_track": {
+        "NARRATION_TRACK_ENABLED": "enabled",
+        "NARRATION_SILENCE_PADDING_MS": "silence_padding_ms",
+    },
     "database": {
         "DATABASE_URL": "url",
     },
@@ -290,6 +496,16 @@ __all__ = [
     "ElevenLabsSettings",
     "AzureVoiceSettings",
     "VoiceStorageSettings",
+    "VoiceFailoverSettings",
+    "VoiceChunkingSettings",
+    "URLExtractionSettings",
+    "PdfTextLayerSettings",
+    "LanguageDetectionSettings",
+    "KeywordSettings",
+    "GazetteerSettings",
+    "StoryClassifierSettings",
+    "HTMLTemplateSettings",
+    "NarrationTrackSettings",
     "DatabaseSettings",
     "get_settings",
     "load_settings",
@@ -50,6 +50,10 @@ class LanguageMetadata(BaseModel):
     source_text_preview: Optional[str] = Field(
         default=None, description="Optional snippet used for detection transparency."
     )
+    detection_path: List[str] = Field(
+        default_factory=list,
+        description="Detectors consulted in order, as 'stage:language:confidence' (or 'stage:error').",
+    )
 
 
 class Entity(BaseModel):
@@ -177,6 +181,26 @@ class VoiceAsset(BaseModel):
     duration_seconds: Optional[float] = Field(default=None, gt=0, description="Length of audio when known.")
 
 
+class NarrationSegment(BaseModel):
+    """Position of a single slide's narration inside the combined story track."""
+
+    slide_index: int = Field(..., ge=0, description="Index of the slide in the slide deck.")
+    placeholder_id: str = Field(..., description="Placeholder identifier of the narrated slide.")
+    start_seconds: float = Field(..., ge=0, description="Offset of the slide audio within the track.")
+    duration_seconds: float = Field(..., ge=0, description="Length of the slide audio.")
+    audio_url: Optional[HttpUrl] = Field(default=None, description="Per-slide audio asset, when stored separately.")
+
+
+class NarrationTrack(BaseModel):
+    """Full-story narration assembled from per-slide audio."""
+
+    provider: constr(min_length=1) = Field(..., description="Voice provider identifier.")
+    audio_url: HttpUrl = Field(..., description="Location of the combined audio asset.")
+    duration_seconds: float = Field(..., ge=0, description="Total length of the combined track.")
+    silence_padding_ms: int = Field(default=0, ge=0, description="Silence inserted between slides.")
+    segments: List[NarrationSegment] = Field(default_factory=list, description="Per-slide offset table.")
+
+
 class ImageAsset(BaseModel):
     """Stored image asset metadata."""
 
@@ -199,6 +223,9 @@ class StoryRecord(BaseModel):
     slide_deck: SlideDeck = Field(..., description="Final slide deck representation.")
     image_assets: List[ImageAsset] = Field(default_factory=list, description="List of all resolved image assets.")
     voice_assets: List[VoiceAsset] = Field(default_factory=list, description="Narration assets linked to the story.")
+    narration_track: Optional[NarrationTrack] = Field(
+        default=None, description="Combined narration track with per-slide offsets."
+    )
     prompt_news: Optional[str] = Field(default=None, description="Prompt text used when generating news content.")
     prompt_curious: Optional[str] = Field(default=None, description="Prompt text used when generating curious content.")
     canurl: Optional[HttpUrl] = Field(default=None, description="Primary shareable URL.")
@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import logging
 import os
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
-import httpx
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Response
 
 from app.api.schemas import StoryCreateRequest, StoryResponse
 from app.config import get_settings
@@ -17,10 +18,22 @@ from app.domain.dto import AttachmentDescriptor, Mode
 from app.domain.interfaces import PromptTemplateService
 from app.persistence import Base, SqlAlchemyStoryRepository, create_session_factory
 from app.services.analysis import CompositeAnalysisFacade, HeuristicFunctionAnalyzer, PromptRecommendationAnalyzer
+from app.services.attachment_source import (
+    AttachmentSource,
+    LocalFileSource,
+    SharedSourceLoader,
+    http_source,
+    s3_source,
+)
+from app.services.cache import DiskCache, TTLCache
+from app.services.classification import load_story_classifier
+from app.services.s3_clients import get_s3_client, s3_client_registry
 from app.services.document_intelligence import (
     AzureDocumentIntelligenceAdapter,
     DefaultDocumentIntelligencePipeline,
+    PdfTextLayerAdapter,
 )
+from app.services.gazetteer import GazetteerEntityExtractor, GazetteerParserAdapter
 from app.services.image_pipeline import (
     AIImageProvider,
     DefaultImageAssetPipeline,
@@ -29,28 +42,48 @@ from app.services.image_pipeline import (
     UserUploadProvider,
 )
 from app.services.ingestion import DefaultIngestionAggregator
+from app.services.keywords import DocumentFrequencyTable, KeywordExtractor
 from app.services.language_detection import (
     AzureLanguageDetectionStrategy,
+    CascadingLanguageDetectionStrategy,
     DefaultLanguageDetectionService,
+    FastTextLanguageDetectionStrategy,
     LanguageDetectionStrategy,
+    ScriptProfileLanguageStrategy,
+    preload_fasttext_model,
 )
 from app.services.azure_openai_client import AzureOpenAILanguageModel
 from app.services.model_clients import CuriousModelClient, LanguageModel, NewsModelClient
 from app.services.model_router import DefaultModelRouter
+from app.services.narration_track import NarrationTrackAssembler
 from app.services.orchestrator import StoryOrchestrator
 from app.services.prompt_templates import DefaultPromptTemplateService, PromptSelectionController
+from app.services.url_extractor import URLContentExtractor
 from app.services.user_input import DefaultUserInputService
 from app.services.voice_synthesis import (
     AzureTTSClient,
+    ChunkedVoiceProvider,
     DefaultVoiceSynthesisService,
     ElevenLabsClient,
+    HedgedVoiceProvider,
+    LatencyTracker,
+    ProviderCircuitBreaker,
     S3VoiceStorageService,
 )
-from app.services.html_renderer import HTMLTemplateRenderer
+from app.services.html_renderer import HTMLTemplateRenderer, TemplateLoader
+from app.services.rendered_html import RenderedStoryCache, etag_matches
 from app.utils import is_placeholder_value
 
 
-app = FastAPI(title="NewsLab Service v2")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Keyword document frequencies gathered since the last autosave
+    if get_keyword_df_table.cache_info().currsize:
+        get_keyword_df_table().save()
+
+
+app = FastAPI(title="NewsLab Service v2", lifespan=lifespan)
 
 # Add custom exception handler for better error messages
 from fastapi.responses import JSONResponse
@@ -81,6 +114,26 @@ async def global_exception_handler(request, exc):
     )
 
 
+def _preload_shared_models() -> None:
+    """Load large read-only models at import time when configured.
+
+    Under ``gunicorn --preload`` the app is imported once in the master before workers
+    fork, so the FastText model is read from disk once and shared by all workers.
+    """
+    try:
+        detection_settings = get_settings().language_detection
+    except Exception:  # incomplete configuration surfaces when the orchestrator is built
+        return
+    if detection_settings.fasttext_preload and detection_settings.fasttext_model_path:
+        try:
+            preload_fasttext_model(detection_settings.fasttext_model_path)
+        except Exception as e:
+            logging.getLogger(__name__).warning("FastText preload failed: %s", e)
+
+
+_preload_shared_models()
+
+
 class EchoLanguageModel(LanguageModel):
     """Stub language model that echoes prompts (fallback)."""
 
@@ -112,17 +165,28 @@ def get_session_factory():
         return None
 
 
+@lru_cache(maxsize=1)
+def get_keyword_df_table() -> DocumentFrequencyTable:
+    return DocumentFrequencyTable(get_settings().keywords.df_path or None)
+
+
 @lru_cache(maxsize=1)
 def get_orchestrator() -> StoryOrchestrator:
     settings = get_settings()
+    s3_client_registry().configure(max_pool_connections=settings.aws.s3_max_pool_connections)
 
     user_input_service = DefaultUserInputService()
     language_service = _build_language_service(settings)
     ingestion = DefaultIngestionAggregator()
-    doc_pipeline = _build_document_pipeline(settings)
+    doc_pipeline = _build_document_pipeline(settings, url_extractor=_build_url_extractor(settings))
 
+    keyword_extractor = KeywordExtractor(get_keyword_df_table(), max_ngram=settings.keywords.max_ngram)
     analysis = CompositeAnalysisFacade(
-        [HeuristicFunctionAnalyzer(), PromptRecommendationAnalyzer()]
+        [
+            HeuristicFunctionAnalyzer(keyword_extractor=keyword_extractor),
+            PromptRecommendationAnalyzer(keyword_extractor=keyword_extractor),
+        ],
+        keyword_extractor=keyword_extractor,
     )
     prompt_service = get_prompt_service()
     prompt_controller = PromptSelectionController(prompt_service)
@@ -138,7 +202,11 @@ def get_orchestrator() -> StoryOrchestrator:
     else:
         language_model = EchoLanguageModel()
     curious_client = CuriousModelClient(language_model=language_model)
-    news_client = NewsModelClient(language_model=language_model)
+    news_client = NewsModelClient(
+        language_model=language_model,
+        classifier=load_story_classifier(settings.story_classifier.model_path),
+        min_classifier_confidence=settings.story_classifier.min_confidence,
+    )
     model_router = DefaultModelRouter({Mode.CURIOUS: curious_client, Mode.NEWS: news_client})
 
     image_providers = []
@@ -172,11 +240,17 @@ def get_orchestrator() -> StoryOrchestrator:
     )
     image_pipeline = DefaultImageAssetPipeline(image_providers, image_storage)
 
+    failover = settings.voice_failover
     voice_providers = []
     default_voice_provider = None
     if settings.elevenlabs and not is_placeholder_value(settings.elevenlabs.api_key):
         voice_providers.append(
-            ElevenLabsClient(api_key=settings.elevenlabs.api_key, voice_id=settings.elevenlabs.voice_id)
+            ElevenLabsClient(
+                api_key=settings.elevenlabs.api_key,
+                voice_id=settings.elevenlabs.voice_id,
+                timeout=failover.provider_timeout_seconds,
+                fallback_on_error=not failover.enabled,
+            )
         )
         default_voice_provider = "elevenlabs_pro"
     if settings.azure_voice and not is_placeholder_value(settings.azure_voice.speech_key):
@@ -185,10 +259,26 @@ def get_orchestrator() -> StoryOrchestrator:
                 api_key=settings.azure_voice.speech_key,
                 region=settings.azure_voice.region,
                 voice=settings.azure_voice.voice,
+                timeout=failover.provider_timeout_seconds,
+                fallback_on_error=not failover.enabled,
             )
         )
         if not default_voice_provider:
             default_voice_provider = "azure_basic"
+    if voice_providers and failover.enabled:
+        voice_providers = _build_hedged_voice_providers(voice_providers, failover)
+    chunking = settings.voice_chunking
+    if voice_providers and chunking.enabled:
+        chunk_executor = ThreadPoolExecutor(max_workers=chunking.max_parallel, thread_name_prefix="voice-chunk")
+        voice_providers = [
+            ChunkedVoiceProvider(
+                provider,
+                threshold_chars=chunking.threshold_chars,
+                chunk_chars=chunking.chunk_chars,
+                executor=chunk_executor,
+            )
+            for provider in voice_providers
+        ]
     if not voice_providers:
         # fallback stub provider
         voice_providers.append(AzureTTSClient(api_key="stub", region="eastus", voice="en-US-AriaNeural"))
@@ -203,7 +293,12 @@ def get_orchestrator() -> StoryOrchestrator:
         aws_secret_key=settings.aws.secret_key,
         aws_region=settings.aws.region,
     )
-    voice_service = DefaultVoiceSynthesisService(voice_providers, voice_storage)
+    track_assembler = None
+    if settings.narration_track.enabled:
+        track_assembler = NarrationTrackAssembler(
+            voice_storage, silence_padding_ms=settings.narration_track.silence_padding_ms
+        )
+    voice_service = DefaultVoiceSynthesisService(voice_providers, voice_storage, track_assembler=track_assembler)
 
     # Use database repository only if database is available, otherwise use no-op repository
     from app.persistence.noop_repository import NoOpStoryRepository
@@ -221,7 +316,10 @@ def get_orchestrator() -> StoryOrchestrator:
 
     # HTML Template Renderer
     html_renderer = HTMLTemplateRenderer(
-        template_base_path=Path("app/news_template"),
+        template_loader=TemplateLoader(
+            template_base_path=Path("app/news_template"),
+            max_age_seconds=settings.html_templates.cache_max_age_seconds,
+        ),
         cdn_prefix_media=settings.aws.cdn_prefix_media,
         aws_bucket=settings.aws.bucket,
     )
@@ -238,127 +336,195 @@ def get_orchestrator() -> StoryOrchestrator:
         voice_service=voice_service,
         repository=repository,
         html_renderer=html_renderer,
+        rendered_html=_build_rendered_html_cache(settings, html_renderer),
         default_voice_provider=default_voice_provider or "azure_basic",
         story_base_url=settings.aws.cdn_html_base,
         save_to_database=False,  # Disable database saving to avoid connection errors
     )
 
 
+def _build_rendered_html_cache(settings, html_renderer: HTMLTemplateRenderer) -> Optional[RenderedStoryCache]:
+    template_settings = settings.html_templates
+    if not template_settings.rendered_cache_enabled:
+        return None
+    return RenderedStoryCache(
+        html_renderer,
+        max_entries=template_settings.rendered_cache_max_entries,
+        ttl_seconds=template_settings.rendered_cache_ttl_seconds,
+    )
+
+
+def _build_hedged_voice_providers(providers: list, failover) -> list[HedgedVoiceProvider]:
+    """Wrap each provider in a chain that fails over to the others, sharing health state."""
+    breaker = ProviderCircuitBreaker(
+        failure_threshold=failover.failure_threshold,
+        cooldown_seconds=failover.cooldown_seconds,
+    )
+    latency = LatencyTracker(
+        percentile=failover.hedge_percentile,
+        initial_delay=failover.hedge_initial_delay_seconds,
+        max_delay=failover.hedge_max_delay_seconds,
+    )
+    executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="voice-hedge")
+    return [
+        HedgedVoiceProvider(
+            [primary, *(provider for provider in providers if provider is not primary)],
+            breaker=breaker,
+            latency=latency,
+            executor=executor,
+        )
+        for primary in providers
+    ]
+
+
 def _build_language_service(settings) -> DefaultLanguageDetectionService:
-    strategy: LanguageDetectionStrategy
+    # Cheapest first: in-process script/n-gram profiles, then FastText, then Azure Translator
+    script = ScriptProfileLanguageStrategy()
+    stages: list[tuple[str, LanguageDetectionStrategy]] = [("script", script)]
+    detection_settings = settings.language_detection
+    if detection_settings.fasttext_model_path:
+        try:
+            stages.append(("fasttext", FastTextLanguageDetectionStrategy(detection_settings.fasttext_model_path)))
+        except Exception as e:
+            logging.getLogger(__name__).warning("FastText language detection disabled: %s", e)
     translator_key = os.getenv("AZURE_TRANSLATOR_KEY")  # optional external key
     translator_endpoint = os.getenv("AZURE_TRANSLATOR_ENDPOINT")
     if translator_endpoint and translator_key and not is_placeholder_value(translator_key):
-        strategy = AzureLanguageDetectionStrategy(
-            endpoint=translator_endpoint,
-            api_key=translator_key,
-            region=os.getenv("AZURE_TRANSLATOR_REGION"),
+        stages.append(
+            (
+                "azure",
+                AzureLanguageDetectionStrategy(
+                    endpoint=translator_endpoint,
+                    api_key=translator_key,
+                    region=os.getenv("AZURE_TRANSLATOR_REGION"),
+                ),
+            )
         )
-    else:
-        strategy = SimpleLanguageStrategy()
+    strategy = CascadingLanguageDetectionStrategy(
+        stages, min_confidence=detection_settings.min_confidence, fallback=script.detect_by_script
+    )
     return DefaultLanguageDetectionService(strategy=strategy)
 
 
-class SimpleLanguageStrategy(LanguageDetectionStrategy):
-    """Basic language detection fallback."""
+def _build_url_extractor(settings) -> URLContentExtractor:
+    url_settings = settings.url_extraction
+    cache = None
+    if url_settings.cache_enabled:
+        cache = TTLCache(max_entries=url_settings.cache_max_entries, ttl_seconds=url_settings.cache_ttl_seconds)
+    return URLContentExtractor(
+        timeout=url_settings.request_timeout_seconds,
+        cache=cache,
+        parser_mode=url_settings.parser_mode,
+        # A fetch that overruns the pipeline's per-URL deadline gives its worker back
+        download_deadline_seconds=url_settings.deadline_seconds,
+    )
 
-    def detect(self, text: str) -> tuple[str, float]:
-        return ("en", 0.8)
+
+def _build_ocr_cache(di_settings) -> Optional[DiskCache]:
+    if not di_settings.cache_dir:
+        return None
+    try:
+        return DiskCache(di_settings.cache_dir, max_bytes=di_settings.cache_max_mb * 1024 * 1024)
+    except OSError as e:
+        logging.getLogger(__name__).warning("OCR cache disabled, cannot use %s: %s", di_settings.cache_dir, e)
+        return None
 
 
 def _build_document_pipeline(settings, url_extractor=None) -> DefaultDocumentIntelligencePipeline:
     ocr_adapters = []
+    # Local text-layer extraction first; Azure DI only sees scanned PDFs and images
+    if settings.pdf_text_layer.enabled:
+        ocr_adapters.append(
+            PdfTextLayerAdapter(
+                attachment_loader=_load_attachment_source,
+                min_chars_per_page=settings.pdf_text_layer.min_chars_per_page,
+            )
+        )
     if settings.azure_di and not is_placeholder_value(settings.azure_di.api_key):
         ocr_adapters.append(
             AzureDocumentIntelligenceAdapter(
                 endpoint=settings.azure_di.endpoint,
                 api_key=settings.azure_di.api_key,
-                attachment_loader=_load_attachment_bytes,
+                attachment_loader=_load_attachment_source,
+                poll_deadline_seconds=settings.azure_di.poll_deadline_seconds,
+                cache=_build_ocr_cache(settings.azure_di),
             )
         )
+    parser_adapters = []
+    entity_extractor = None
+    if settings.gazetteer.enabled:
+        entity_extractor = GazetteerEntityExtractor(
+            settings.gazetteer.path, check_interval_seconds=settings.gazetteer.check_interval_seconds
+        )
+        parser_adapters.append(GazetteerParserAdapter(entity_extractor))
+    url_settings = settings.url_extraction
+    parse_executor = (
+        ProcessPoolExecutor(max_workers=url_settings.parse_workers) if url_settings.parse_workers > 0 else None
+    )
     return DefaultDocumentIntelligencePipeline(
-        ocr_adapters=ocr_adapters, parser_adapters=[], url_extractor=url_extractor
+        ocr_adapters=ocr_adapters,
+        parser_adapters=parser_adapters,
+        url_extractor=url_extractor,
+        url_fetch_workers=url_settings.fetch_workers,
+        url_deadline_seconds=url_settings.deadline_seconds,
+        parse_executor=parse_executor,
+        ocr_workers=settings.azure_di.max_concurrency if settings.azure_di else 4,
+        attachment_scope=_load_attachment_source.scope,
+        entity_extractor=entity_extractor,
     )
 
 
-def _load_attachment_bytes(attachment: AttachmentDescriptor) -> Optional[bytes]:
-    """Load attachment bytes from local file, S3, or Azure Blob."""
-    settings = get_settings()
+def _open_attachment_source(attachment: AttachmentDescriptor) -> Optional[AttachmentSource]:
+    """Open attachment content from local file, S3, or Azure Blob without buffering it whole.
+
+    Local files are memory-mapped on demand; remote objects are streamed, and spooled to a
+    temporary file only when a consumer needs random access.
+    """
     uri = attachment.uri
+    settings = get_settings()
     logger = logging.getLogger(__name__)
-
+    source: Optional[AttachmentSource] = None
     try:
         # Check if it's an S3 URI (s3://bucket/key)
         if uri.startswith("s3://"):
-            return _load_from_s3(uri, settings, logger)
+            source = _s3_attachment_source(uri, settings, logger)
 
-        # Check if it's an S3 HTTPS URL
+        # S3 HTTPS URLs (public or signed) and Azure Blob URLs stream over plain GET;
+        # private blobs need a SAS token in the URL
         elif "s3" in uri.lower() or "amazonaws.com" in uri.lower():
-            return _load_from_s3_url(uri, logger)
-
-        # Check if it's an Azure Blob URI
+            source = http_source(uri, timeout=30.0)
         elif uri.startswith("https://") and ".blob.core.windows.net" in uri:
-            return _load_from_azure_blob(uri, logger)
+            source = http_source(uri, timeout=30.0)
 
         # Fallback to local file
-        path = Path(uri)
-        if path.exists():
-            return path.read_bytes()
+        elif Path(uri).is_file():
+            source = LocalFileSource(uri)
     except Exception as e:  # pragma: no cover - filesystem issues
-        logger.warning("Failed to load attachment %s: %s", attachment.uri, e)
-    return None
+        logger.warning("Failed to open attachment %s: %s", attachment.uri, e)
+    return source
 
 
-def _load_from_s3(s3_uri: str, settings, logger: logging.Logger) -> Optional[bytes]:
-    """Load file from S3 using boto3."""
+# Both OCR adapters may ask for the same attachment; share one (lazily spooled) source
+# while the pipeline processes it, then close it
+_load_attachment_source = SharedSourceLoader(_open_attachment_source)
+
+
+def _s3_attachment_source(s3_uri: str, settings, logger: logging.Logger) -> Optional[AttachmentSource]:
+    """Stream an object from S3 using boto3."""
+    from urllib.parse import urlparse
+
     try:
-        import boto3
-        from urllib.parse import urlparse
-
-        parsed = urlparse(s3_uri)
-        bucket = parsed.netloc
-        key = parsed.path.lstrip("/")
-
-        s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.aws.access_key,
-            aws_secret_access_key=settings.aws.secret_key,
-            region_name=settings.aws.region,
+        s3_client = get_s3_client(
+            region=settings.aws.region,
+            access_key=settings.aws.access_key,
+            secret_key=settings.aws.secret_key,
         )
-        response = s3_client.get_object(Bucket=bucket, Key=key)
-        return response["Body"].read()
     except ImportError:
         logger.warning("boto3 not installed, cannot load from S3")
         return None
-    except Exception as e:
-        logger.error("S3 load error: %s", e)
-        return None
-
-
-def _load_from_s3_url(url: str, logger: logging.Logger) -> Optional[bytes]:
-    """Load file from S3 public URL or signed URL."""
-    try:
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            return response.content
-    except Exception as e:
-        logger.error("S3 URL load error: %s", e)
-        return None
 
-
-def _load_from_azure_blob(blob_url: str, logger: logging.Logger) -> Optional[bytes]:
-    """Load file from Azure Blob Storage."""
-    try:
-        # For public blobs, direct GET works
-        # For private blobs, you'd need SAS token or account key
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(blob_url)
-            response.raise_for_status()
-            return response.content
-    except Exception as e:
-        logger.error("Azure Blob load error: %s", e)
-        return None
+    parsed = urlparse(s3_uri)
+    return s3_source(s3_client, parsed.netloc, parsed.path.lstrip("/"))
 
 
 @app.post("/stories", response_model=StoryResponse)
@@ -407,24 +573,29 @@ def healthcheck():
 
 
 @app.get("/stories/{story_id}/html")
-def get_story_html(story_id: str, orchestrator: StoryOrchestrator = Depends(get_orchestrator)):
-    """Get rendered HTML for a story."""
+def get_story_html(
+    story_id: str,
+    if_none_match: Optional[str] = Header(default=None),
+    orchestrator: StoryOrchestrator = Depends(get_orchestrator),
+):
+    """Get rendered HTML for a story; answers ``If-None-Match`` with 304 when it is unchanged."""
+    if not orchestrator.html_renderer:
+        raise HTTPException(status_code=503, detail="HTML renderer not available")
     try:
-        record = orchestrator.get_story(story_id)
-        if not orchestrator.html_renderer:
-            raise HTTPException(status_code=503, detail="HTML renderer not available")
-
-        html_content = orchestrator.html_renderer.render(
-            record=record,
-            template_key=record.template_key,
-            template_source="file",
-        )
-        return {"html": html_content, "story_id": story_id, "template_key": record.template_key}
+        rendered = orchestrator.get_story_html(story_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail="Story not found") from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"HTML rendering failed: {str(exc)}") from exc
 
+    headers = {"ETag": rendered.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, rendered.etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(
+        {"html": rendered.html, "story_id": story_id, "template_key": rendered.template_key},
+        headers=headers,
+    )
+
 
 @app.get("/stories/{story_id}/test")
 def test_story_generation(story_id: str, orchestrator: StoryOrchestrator = Depends(get_orchestrator)):
@@ -465,13 +636,9 @@ def test_story_generation(story_id: str, orchestrator: StoryOrchestrator = Depen
         # Test HTML rendering if available
         if orchestrator.html_renderer:
             try:
-                html_content = orchestrator.html_renderer.render(
-                    record=record,
-                    template_key=record.template_key,
-                    template_source="file",
-                )
+                rendered = orchestrator.get_story_html(story_id)
                 test_results["components"]["html_rendering"]["status"] = "success"
-                test_results["components"]["html_rendering"]["html_length"] = len(html_content)
+                test_results["components"]["html_rendering"]["html_length"] = len(rendered.html)
             except Exception as e:
                 test_results["components"]["html_rendering"]["status"] = "error"
                 test_results["components"]["html_rendering"]["error"] = str(e)
@@ -9,9 +9,13 @@ from uuid import UUID
 from sqlalchemy import DateTime, Integer, JSON, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
 
-from app.domain.dto import DocInsights, ImageAsset, Mode, SlideDeck, StoryRecord, VoiceAsset
+from app.domain.dto import DocInsights, ImageAsset, Mode, NarrationTrack, SlideDeck, StoryRecord, VoiceAsset
 from app.domain.interfaces import StoryRepository
 
+# The schema is created with ``create_all``, which never alters an existing table, so the
+# narration track rides inside the ``doc_insights`` JSON column instead of a column of its own.
+_NARRATION_TRACK_KEY = "narration_track"
+
 
 class Base(DeclarativeBase):
     pass
@@ -78,7 +82,7 @@ class SqlAlchemyStoryRepository(StoryRepository):
             "input_language": record.input_language,
             "slide_count": record.slide_count,
             "template_key": record.template_key,
-            "doc_insights": record.doc_insights.model_dump(mode="json"),
+            "doc_insights": self._serialize_doc_insights(record),
             "slide_deck": record.slide_deck.model_dump(mode="json"),
             "image_assets": [asset.model_dump(mode="json") for asset in record.image_assets],
             "voice_assets": [asset.model_dump(mode="json") for asset in record.voice_assets],
@@ -89,7 +93,16 @@ class SqlAlchemyStoryRepository(StoryRepository):
             "created_at": record.created_at,
         }
 
+    @staticmethod
+    def _serialize_doc_insights(record: StoryRecord) -> Dict[str, Any]:
+        payload = record.doc_insights.model_dump(mode="json")
+        if record.narration_track:
+            payload[_NARRATION_TRACK_KEY] = record.narration_track.model_dump(mode="json")
+        return payload
+
     def _deserialize(self, orm: StoryORM) -> StoryRecord:
+        doc_insights = dict(orm.doc_insights)
+        narration_track = doc_insights.pop(_NARRATION_TRACK_KEY, None)
         return StoryRecord(
             id=UUID(orm.id),
             mode=Mode(orm.mode),
@@ -97,10 +110,11 @@ class SqlAlchemyStoryRepository(StoryRepository):
             input_language=orm.input_language,
             slide_count=orm.slide_count,
             template_key=orm.template_key,
-            doc_insights=DocInsights(**orm.doc_insights),
+            doc_insights=DocInsights(**doc_insights),
             slide_deck=SlideDeck(**orm.slide_deck),
             image_assets=[ImageAsset(**item) for item in orm.image_assets],
             voice_assets=[VoiceAsset(**item) for item in orm.voice_assets],
+            narration_track=NarrationTrack(**narration_track) if narration_track else None,
             prompt_news=orm.prompt_news,
             prompt_curious=orm.prompt_curious,
             canurl=orm.canurl,
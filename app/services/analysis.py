@@ -2,19 +2,117 @@
 
 from __future__ import annotations
 
+import inspect
 import itertools
+import threading
+import weakref
 from abc import ABC, abstractmethod
 from collections import Counter
-from typing import Iterable, List, Optional, Protocol, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
 
 from app.domain.dto import AnalysisReport, DocInsights, Entity, EntityMap, SemanticChunk, TopicCluster
 from app.domain.interfaces import AnalysisFacade
+from app.services.keywords import KeywordExtractor, segment_terms
+from app.services.text_segmentation import split_sentences
+
+
+class AnalysisContext:
+    """Per-``DocInsights`` derived text shared by every analyzer of a request.
+
+    The flattened text, token stream, term counts, sentences and keyword rankings are
+    computed lazily, at most once, however many strategies ask for them. Use ``AnalysisContext.of`` to get
+    the memoized context of an insights object. The context only holds a weak reference to
+    its insights, so the memo entry (and everything derived) goes away with them.
+    """
+
+    _memo: Dict[int, "AnalysisContext"] = {}
+    _memo_lock = threading.Lock()
+
+    def __init__(self, insights: DocInsights) -> None:
+        self._insights = weakref.ref(insights)
+        self._chunk_texts = self._chunk_texts_of(insights)
+        self._rankings: Dict[int, List[Tuple[str, float]]] = {}
+        self._rankings_lock = threading.Lock()
+
+    @classmethod
+    def of(cls, insights: DocInsights) -> "AnalysisContext":
+        """The shared context for ``insights``; rebuilt if its chunks were replaced since."""
+        key = id(insights)
+        with cls._memo_lock:
+            context = cls._memo.get(key)
+            if context is not None and context._insights() is insights and context._same_chunks(insights):
+                return context
+            if context is None:
+                weakref.finalize(insights, cls._forget, key)
+            context = cls(insights)
+            cls._memo[key] = context
+            return context
+
+    @classmethod
+    def _forget(cls, key: int) -> None:
+        with cls._memo_lock:
+            cls._memo.pop(key, None)
+
+    @property
+    def insights(self) -> DocInsights:
+        insights = self._insights()
+        if insights is None:
+            raise ReferenceError("The DocInsights of this AnalysisContext have been garbage collected")
+        return insights
+
+    @staticmethod
+    def _chunk_texts_of(insights: DocInsights) -> Tuple[str, ...]:
+        return tuple(chunk.text for chunk in insights.semantic_chunks)
+
+    def _same_chunks(self, insights: DocInsights) -> bool:
+        # Holding the texts keeps their ids from being reused, so an identity check is exact
+        chunks = insights.semantic_chunks
+        return len(chunks) == len(self._chunk_texts) and all(
+            chunk.text is text for chunk, text in zip(chunks, self._chunk_texts)
+        )
+
+    @cached_property
+    def text(self) -> str:
+        return "\n".join(chunk.text for chunk in self.insights.semantic_chunks if chunk.text)
+
+    @cached_property
+    def segments(self) -> List[List[str]]:
+        """Content-word runs (stopwords and clause punctuation removed), script-aware."""
+        return segment_terms(self.text)
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Lowercased content words in document order."""
+        return [token for run in self.segments for token in run]
+
+    @cached_property
+    def term_counts(self) -> Counter:
+        return Counter(self.tokens)
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        return split_sentences(self.text)
+
+    def keywords(self, limit: int = 10, extractor: Optional[KeywordExtractor] = None) -> List[str]:
+        """Top TF-IDF words and phrases; the ranking is computed once per extractor."""
+        extractor = extractor or _default_extractor
+        with self._rankings_lock:
+            ranked = self._rankings.get(id(extractor))
+            if ranked is None:
+                ranked = extractor.score(self.segments)
+                self._rankings[id(extractor)] = ranked
+        return extractor.select(ranked, limit)
+
+
+_default_extractor = KeywordExtractor()
 
 
 class AnalyzerStrategy(Protocol):
     """Protocol for strategies that augment an AnalysisReport."""
 
-    def analyze(self, insights: DocInsights) -> AnalysisReport:
+    def analyze(self, insights: DocInsights, context: Optional[AnalysisContext] = None) -> AnalysisReport:
         """Produce a partial analysis report derived from the provided insights."""
 
 
@@ -22,30 +120,18 @@ class BaseAnalyzerStrategy(ABC):
     """Convenience abstract base class implementing AnalyzerStrategy."""
 
     @abstractmethod
-    def analyze(self, insights: DocInsights) -> AnalysisReport:
+    def analyze(self, insights: DocInsights, context: Optional[AnalysisContext] = None) -> AnalysisReport:
         raise NotImplementedError
 
 
-def _flatten_chunks(insights: DocInsights) -> str:
-    return "\n".join(chunk.text for chunk in insights.semantic_chunks if chunk.text)
-
-
-def _extract_keywords(text: str, limit: int = 10) -> List[str]:
-    tokens = [
-        token.strip(".,!?()[]{}\"'").lower()
-        for token in text.split()
-        if token and token.isalpha() and len(token) > 3
-    ]
-    most_common = Counter(tokens).most_common(limit)
-    return [word for word, _ in most_common]
-
-
 class HeuristicFunctionAnalyzer(BaseAnalyzerStrategy):
     """Lightweight analyzer that derives topics and gaps heuristically."""
 
-    def analyze(self, insights: DocInsights) -> AnalysisReport:
-        text = _flatten_chunks(insights)
-        keywords = _extract_keywords(text)
+    def __init__(self, keyword_extractor: Optional[KeywordExtractor] = None) -> None:
+        self._keyword_extractor = keyword_extractor
+
+    def analyze(self, insights: DocInsights, context: Optional[AnalysisContext] = None) -> AnalysisReport:
+        keywords = (context or AnalysisContext.of(insights)).keywords(extractor=self._keyword_extractor)
 
         topic = TopicCluster(
             title="Key Themes",
@@ -69,11 +155,16 @@ class HeuristicFunctionAnalyzer(BaseAnalyzerStrategy):
 class PromptRecommendationAnalyzer(BaseAnalyzerStrategy):
     """Generate recommended prompts based on entities and keywords."""
 
-    def __init__(self, base_prompt: str = "Explore the relationship between {entity} and {keyword}.") -> None:
+    def __init__(
+        self,
+        base_prompt: str = "Explore the relationship between {entity} and {keyword}.",
+        keyword_extractor: Optional[KeywordExtractor] = None,
+    ) -> None:
         self._base_prompt = base_prompt
+        self._keyword_extractor = keyword_extractor
 
-    def analyze(self, insights: DocInsights) -> AnalysisReport:
-        keywords = _extract_keywords(_flatten_chunks(insights), limit=5)
+    def analyze(self, insights: DocInsights, context: Optional[AnalysisContext] = None) -> AnalysisReport:
+        keywords = (context or AnalysisContext.of(insights)).keywords(limit=5, extractor=self._keyword_extractor)
         entities = list(self._iter_entities(insights.entities))
 
         prompts: List[str] = []
@@ -93,20 +184,62 @@ class PromptRecommendationAnalyzer(BaseAnalyzerStrategy):
 
 
 class CompositeAnalysisFacade(AnalysisFacade):
-    """Compose multiple analyzer strategies into a single facade."""
-
-    def __init__(self, strategies: Sequence[AnalyzerStrategy]) -> None:
+    """Compose multiple analyzer strategies into a single facade.
+
+    Strategies share one ``AnalysisContext`` per call. With ``max_workers`` > 1 they run
+    concurrently (worthwhile for strategies that wait on I/O, such as LLM analyzers);
+    reports are always merged in strategy order, so the result does not depend on timing.
+    Given a ``keyword_extractor``, each analyzed story is added to its corpus model
+    afterwards, so keyword IDF keeps learning from the stories we publish.
+    """
+
+    def __init__(
+        self,
+        strategies: Sequence[AnalyzerStrategy],
+        *,
+        max_workers: int = 1,
+        keyword_extractor: Optional[KeywordExtractor] = None,
+    ) -> None:
         if not strategies:
             raise ValueError("At least one AnalyzerStrategy must be provided.")
         self._strategies = list(strategies)
+        self._keyword_extractor = keyword_extractor
+        self._accepts_context = [self._takes_context(strategy) for strategy in self._strategies]
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if max_workers > 1 and len(self._strategies) > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=min(max_workers, len(self._strategies)), thread_name_prefix="analysis"
+            )
 
     def analyze(self, insights: DocInsights) -> AnalysisReport:
+        context = AnalysisContext.of(insights)
+        indexes = range(len(self._strategies))
+        if self._executor is None:
+            partials = [self._run(index, insights, context) for index in indexes]
+        else:
+            partials = list(self._executor.map(lambda index: self._run(index, insights, context), indexes))
+
         merged = AnalysisReport()
-        for strategy in self._strategies:
-            partial = strategy.analyze(insights)
+        for partial in partials:
             merged = self._merge_reports(merged, partial)
+        if self._keyword_extractor is not None:
+            self._keyword_extractor.observe(context.segments)
         return merged
 
+    def _run(self, index: int, insights: DocInsights, context: AnalysisContext) -> AnalysisReport:
+        strategy = self._strategies[index]
+        if self._accepts_context[index]:
+            return strategy.analyze(insights, context)
+        return strategy.analyze(insights)
+
+    @staticmethod
+    def _takes_context(strategy: AnalyzerStrategy) -> bool:
+        # Strategies written before AnalysisContext existed take the insights only
+        try:
+            return "context" in inspect.signature(strategy.analyze).parameters
+        except (TypeError, ValueError):
+            return False
+
     def _merge_reports(self, base: AnalysisReport, addition: AnalysisReport) -> AnalysisReport:
         summary = base.narrative_summary or addition.narrative_summary
 
@@ -139,6 +272,7 @@ class CompositeAnalysisFacade(AnalysisFacade):
 
 
 __all__ = [
+    "AnalysisContext",
     "CompositeAnalysisFacade",
     "HeuristicFunctionAnalyzer",
     "PromptRecommendationAnalyzer",
@@ -0,0 +1,240 @@
+"""Lightweight article extraction on top of the standard-library HTML parser."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from app.services.summarization import TextRankSummarizer
+
+# Subtrees that never contain article text.
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "iframe", "form", "button", "select"}
+# Page chrome; text inside these is boilerplate unless it is also inside <article>/<main>.
+_CHROME_TAGS = {"nav", "header", "footer", "aside"}
+# Class/id tokens are split on "-", "_" and spaces, so "share-bar" is chrome but "shareholders" is not.
+_CHROME_HINTS = re.compile(
+    r"(?<![a-z0-9])"
+    r"(comments?|share|sharing|social|related|promo|advert(?:s|isements?|ising)?|ads?|sidebar|footer|header|menu|nav|navbar|navigation"
+    r"|cookies?|newsletter|subscribe|breadcrumbs?)"
+    r"(?![a-z0-9])",
+    re.IGNORECASE,
+)
+_BLOCK_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "blockquote", "pre", "td", "div", "section", "article"}
+_CONTENT_ROOTS = {"article", "main"}
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_IMAGE_SKIP = re.compile(r"(sprite|pixel|spacer|logo|icon|avatar|badge|\.svg(\?|$)|\.gif(\?|$))", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class _Block:
+    text: str
+    link_chars: int
+    in_content_root: bool
+    heading: bool
+
+
+@dataclass
+class ParsedArticle:
+    """Output of :class:`NativeArticleParser`."""
+
+    title: str
+    text: str
+    summary: str
+    top_image_url: Optional[str] = None
+    images: List[str] = field(default_factory=list)
+
+
+class _ArticleHTMLParser(HTMLParser):
+    """Single-pass collector of text blocks, metadata and image candidates."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.meta: Dict[str, str] = {}
+        self.title_parts: List[str] = []
+        self.first_h1: Optional[str] = None
+        self.blocks: List[_Block] = []
+        self.images: List[str] = []
+        self._stack: List[tuple[str, bool]] = []  # (tag, is_boilerplate)
+        self._skip_depth = 0
+        # Stack depths of open chrome/content-root elements; chrome nested inside an
+        # <article> (share bars, related links) is still boilerplate.
+        self._boilerplate_levels: List[int] = []
+        self._content_levels: List[int] = []
+        self._link_depth = 0
+        self._in_title = False
+        self._buffer: List[str] = []
+        self._link_chars = 0
+        self._heading = False
+
+    # -- tag handling -----------------------------------------------------------------
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        attributes = {name: value or "" for name, value in attrs}
+        if tag == "meta":
+            key = attributes.get("property") or attributes.get("name")
+            if key and "content" in attributes:
+                self.meta.setdefault(key.lower(), attributes["content"])
+            return
+        if tag == "img":
+            if not self._skip_depth and not self._in_boilerplate():
+                src = attributes.get("src") or attributes.get("data-src")
+                if src:
+                    self.images.append(src)
+            return
+        if tag in _VOID_TAGS:
+            if tag == "br":
+                self._buffer.append(" ")
+            return
+
+        if tag in _BLOCK_TAGS:
+            self._flush()
+        hint = f"{attributes.get('class', '')} {attributes.get('id', '')}"
+        boilerplate = tag in _CHROME_TAGS or (tag not in _CONTENT_ROOTS and bool(_CHROME_HINTS.search(hint)))
+        self._stack.append((tag, boilerplate))
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        if boilerplate:
+            self._boilerplate_levels.append(len(self._stack))
+        if tag in _CONTENT_ROOTS:
+            self._content_levels.append(len(self._stack))
+        if tag == "a":
+            self._link_depth += 1
+        if tag == "title":
+            self._in_title = True
+        if tag in {"h1", "h2", "h3"}:
+            self._heading = True
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _VOID_TAGS or not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        # Close any unclosed children along with ``tag`` (HTML in the wild is rarely well formed).
+        while self._stack:
+            if self._stack[-1][0] in _BLOCK_TAGS:
+                self._flush()
+            open_tag, boilerplate = self._stack.pop()
+            if open_tag in _SKIP_TAGS:
+                self._skip_depth -= 1
+            if boilerplate:
+                self._boilerplate_levels.pop()
+            if open_tag in _CONTENT_ROOTS:
+                self._content_levels.pop()
+            if open_tag == "a":
+                self._link_depth -= 1
+            if open_tag == "title":
+                self._in_title = False
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title_parts.append(data)
+            return
+        if self._skip_depth or self._in_boilerplate():
+            return
+        self._buffer.append(data)
+        if self._link_depth:
+            self._link_chars += len(data.strip())
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+    def _in_boilerplate(self) -> bool:
+        if not self._boilerplate_levels:
+            return False
+        return not self._content_levels or self._boilerplate_levels[-1] > self._content_levels[-1]
+
+    def _flush(self) -> None:
+        text = _WHITESPACE.sub(" ", "".join(self._buffer)).strip()
+        if text:
+            if self._heading and self.first_h1 is None:
+                self.first_h1 = text
+            self.blocks.append(
+                _Block(
+                    text=text,
+                    link_chars=self._link_chars,
+                    in_content_root=bool(self._content_levels),
+                    heading=self._heading,
+                )
+            )
+        self._buffer = []
+        self._link_chars = 0
+        self._heading = False
+
+
+class NativeArticleParser:
+    """Boilerplate-stripping article parser with no third-party dependencies.
+
+    Text blocks are kept when they read like prose: long enough, mostly not link text,
+    and inside ``<article>``/``<main>`` when the page has one.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_block_chars: int = 40,
+        max_link_density: float = 0.4,
+        summary_chars: int = 300,
+        max_images: int = 10,
+    ) -> None:
+        self._min_block_chars = min_block_chars
+        self._max_link_density = max_link_density
+        self._summary_chars = summary_chars
+        self._max_images = max_images
+        self._summarizer = TextRankSummarizer()
+
+    def parse(self, url: str, html: str) -> ParsedArticle:
+        parser = _ArticleHTMLParser()
+        parser.feed(html)
+        parser.close()
+
+        title = (
+            parser.meta.get("og:title")
+            or parser.meta.get("twitter:title")
+            or _WHITESPACE.sub(" ", "".join(parser.title_parts)).strip()
+            or parser.first_h1
+            or ""
+        )
+        text = "\n\n".join(self._content_blocks(parser.blocks))
+        summary = self.summarize(text) or (parser.meta.get("og:description") or parser.meta.get("description") or "")
+
+        top_image = parser.meta.get("og:image") or parser.meta.get("twitter:image")
+        images: List[str] = []
+        for src in ([top_image] if top_image else []) + parser.images:
+            absolute = urljoin(url, src.strip())
+            if absolute.startswith(("http://", "https://")) and not _IMAGE_SKIP.search(absolute) and absolute not in images:
+                images.append(absolute)
+        return ParsedArticle(
+            title=title.strip(),
+            text=text,
+            summary=summary.strip(),
+            top_image_url=images[0] if images else None,
+            images=images[: self._max_images],
+        )
+
+    def summarize(self, text: str) -> str:
+        """Extractive summary of ``text`` within ``summary_chars``."""
+        return self._summarizer.summarize(text, max_chars=self._summary_chars) if text else ""
+
+    def _content_blocks(self, blocks: List[_Block]) -> List[str]:
+        has_root = any(block.in_content_root and not block.heading for block in blocks)
+        kept: List[str] = []
+        for block in blocks:
+            if has_root and not block.in_content_root:
+                continue
+            if block.heading:
+                continue
+            if len(block.text) < self._min_block_chars:
+                continue
+            if block.link_chars / len(block.text) > self._max_link_density:
+                continue
+            if kept and kept[-1] == block.text:
+                continue
+            kept.append(block.text)
+        return kept
+
+
+__all__ = ["NativeArticleParser", "ParsedArticle"]
@@ -0,0 +1,335 @@
+"""Zero-copy attachment access: memory-mapped local files and streamed remote objects."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import mmap
+import shutil
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, ContextManager, Iterator, Optional, Union
+
+import httpx
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Remote bodies up to this size stay in memory when spooled; larger ones go to a temp file.
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+class AttachmentSource(ABC):
+    """Readable attachment content that can be streamed more than once.
+
+    ``open`` returns a fresh binary file object for every call, so consumers can read it
+    incrementally (hashing, multipart uploads, PDF parsing) without holding the whole
+    attachment in memory.
+    """
+
+    uri: str
+
+    @property
+    def size(self) -> Optional[int]:
+        return None
+
+    @abstractmethod
+    def open(self) -> ContextManager[BinaryIO]:
+        """Open a new readable stream positioned at the start of the content."""
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        with self.open() as handle:
+            while chunk := handle.read(chunk_size):
+                yield chunk
+
+    def sha256(self) -> str:
+        digest = hashlib.sha256()
+        for chunk in self.iter_chunks():
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def read_bytes(self) -> bytes:
+        """Buffer the whole attachment; prefer ``open``/``iter_chunks`` for large content."""
+        with self.open() as handle:
+            return handle.read()
+
+    def materialize(self) -> "AttachmentSource":
+        """A seekable, locally readable source with the same content (self when already local)."""
+        return self
+
+    def close(self) -> None:
+        """Release local copies made by ``materialize``; the source can still be reopened."""
+
+
+class BytesSource(AttachmentSource):
+    """In-memory content, e.g. from loaders that still return ``bytes``."""
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview], uri: str = "memory://") -> None:
+        self.uri = uri
+        self._data = memoryview(data)
+
+    @property
+    def size(self) -> Optional[int]:
+        return self._data.nbytes
+
+    @contextlib.contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        yield io.BytesIO(self._data)
+
+    def sha256(self) -> str:
+        return hashlib.sha256(self._data).hexdigest()
+
+    def read_bytes(self) -> bytes:
+        return self._data.tobytes()
+
+
+class LocalFileSource(AttachmentSource):
+    """A file on local disk; hashing and ``mapped`` views go through mmap without copying."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.uri = str(self.path)
+
+    @property
+    def size(self) -> Optional[int]:
+        return self.path.stat().st_size
+
+    def open(self) -> ContextManager[BinaryIO]:
+        return self.path.open("rb")
+
+    @contextlib.contextmanager
+    def mapped(self) -> Iterator[memoryview]:
+        """Read-only memoryview over the file's pages (empty files yield an empty view)."""
+        with self.path.open("rb") as handle:
+            if self.size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                view = memoryview(mapping)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def sha256(self) -> str:
+        with self.mapped() as view:
+            return hashlib.sha256(view).hexdigest()
+
+
+class StreamingSource(AttachmentSource):
+    """Remote content fetched through ``opener`` each time it is opened.
+
+    ``materialize`` downloads once into a spooled temporary file (memory up to
+    ``SPOOL_MAX_MEMORY``, disk beyond) and reuses it for every later read.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        opener: Callable[[], ContextManager[BinaryIO]],
+        *,
+        size: Optional[int] = None,
+    ) -> None:
+        self.uri = uri
+        self._opener = opener
+        self._size = size
+        self._spooled: Optional[_SpooledSource] = None
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> Optional[int]:
+        return self._size
+
+    def open(self) -> ContextManager[BinaryIO]:
+        if self._spooled is not None:
+            return self._spooled.open()
+        return self._opener()
+
+    def materialize(self) -> AttachmentSource:
+        with self._lock:
+            if self._spooled is None:
+                spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+                with self._opener() as handle:
+                    shutil.copyfileobj(handle, spool, DEFAULT_CHUNK_SIZE)
+                self._size = spool.tell()
+                self._spooled = _SpooledSource(self.uri, spool)
+            return self._spooled
+
+    def close(self) -> None:
+        with self._lock:
+            spooled, self._spooled = self._spooled, None
+        if spooled is not None:
+            spooled.close()
+
+
+class _SpooledSource(AttachmentSource):
+    def __init__(self, uri: str, spool: Any) -> None:
+        self.uri = uri
+        self._spool = spool
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> Optional[int]:
+        with self._lock:
+            self._spool.seek(0, io.SEEK_END)
+            return self._spool.tell()
+
+    @contextlib.contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        # Readers share the spool but each keeps its own position
+        yield _LockedReader(self._spool, self._lock)
+
+    def close(self) -> None:
+        with self._lock:
+            self._spool.close()
+
+
+class _LockedReader(io.RawIOBase):
+    """Independent read position over a shared spooled file."""
+
+    def __init__(self, spool: Any, lock: threading.Lock) -> None:
+        self._spool = spool
+        self._lock = lock
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        else:
+            with self._lock:
+                self._spool.seek(0, io.SEEK_END)
+                self._position = self._spool.tell() + offset
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        with self._lock:
+            self._spool.seek(self._position)
+            count = self._spool.readinto(buffer)
+        self._position += count
+        return count
+
+
+class _IteratorReader(io.RawIOBase):
+    """File-like adapter over an iterator of byte chunks (e.g. ``httpx.Response.iter_bytes``)."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        count = min(len(buffer), len(self._pending))
+        buffer[:count] = self._pending[:count]
+        self._pending = self._pending[count:]
+        return count
+
+
+def http_source(url: str, *, client: Optional[httpx.Client] = None, timeout: float = 30.0) -> StreamingSource:
+    """Stream ``url`` with a GET per open; the response body is never buffered whole."""
+
+    @contextlib.contextmanager
+    def opener() -> Iterator[BinaryIO]:
+        owned = client is None
+        http = client or httpx.Client(timeout=timeout, follow_redirects=True)
+        try:
+            with http.stream("GET", url) as response:
+                response.raise_for_status()
+                yield io.BufferedReader(_IteratorReader(response.iter_bytes(DEFAULT_CHUNK_SIZE)))
+        finally:
+            if owned:
+                http.close()
+
+    return StreamingSource(url, opener)
+
+
+def s3_source(client: Any, bucket: str, key: str) -> StreamingSource:
+    """Stream an S3 object through botocore's ``StreamingBody`` (already a file-like reader)."""
+
+    @contextlib.contextmanager
+    def opener() -> Iterator[BinaryIO]:
+        body = client.get_object(Bucket=bucket, Key=key)["Body"]
+        try:
+            yield body
+        finally:
+            body.close()
+
+    return StreamingSource(f"s3://{bucket}/{key}", opener)
+
+
+class SharedSourceLoader:
+    """Attachment loader that opens each URI once per ``scope`` and closes it afterwards.
+
+    Every OCR adapter tried for an attachment calls the loader, so inside a scope they
+    share one source (and one spooled download). Nothing outlives the scope: the next
+    job reopens the URI and sees the current object, and spooled temp files are closed.
+    Scopes are per thread; outside one, every call opens a fresh source.
+    """
+
+    def __init__(self, open_source: Callable[[Any], Optional[AttachmentSource]]) -> None:
+        self._open_source = open_source
+        self._local = threading.local()
+
+    def __call__(self, attachment: Any) -> Optional[AttachmentSource]:
+        sources = getattr(self._local, "sources", None)
+        if sources is None:
+            return self._open_source(attachment)
+        if attachment.uri not in sources:
+            sources[attachment.uri] = self._open_source(attachment)
+        return sources[attachment.uri]
+
+    @contextlib.contextmanager
+    def scope(self) -> Iterator[None]:
+        outer = getattr(self._local, "sources", None)
+        self._local.sources = {}
+        try:
+            yield
+        finally:
+            sources, self._local.sources = self._local.sources, outer
+            for source in sources.values():
+                if source is not None:
+                    source.close()
+
+
+def as_source(
+    value: Union[None, bytes, bytearray, memoryview, AttachmentSource],
+    uri: str = "memory://",
+) -> Optional[AttachmentSource]:
+    """Normalize loader results: sources pass through, raw bytes are wrapped, empty is None."""
+    if value is None:
+        return None
+    if isinstance(value, AttachmentSource):
+        return value
+    if not value:
+        return None
+    return BytesSource(value, uri)
+
+
+__all__ = [
+    "AttachmentSource",
+    "BytesSource",
+    "LocalFileSource",
+    "SharedSourceLoader",
+    "StreamingSource",
+    "as_source",
+    "http_source",
+    "s3_source",
+]
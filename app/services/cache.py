@@ -0,0 +1,225 @@
+"""Thread-safe, size-bounded TTL cache shared by the extraction services."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how a cache has been used since it was created."""
+
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class TTLCache(Generic[K, V]):
+    """LRU cache whose entries expire ``ttl_seconds`` after they were stored.
+
+    ``max_entries`` bounds memory use; the least recently used entry is evicted when it
+    is exceeded. A non-positive ``ttl_seconds`` keeps entries until they are evicted.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[K, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self._stats.misses += 1
+                return None
+            stored_at, value = item
+            if self._is_expired(stored_at):
+                del self._entries[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def touch(self, key: K) -> None:
+        """Restart the TTL of ``key`` after its origin confirmed the value is still current."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return
+            self._entries[key] = (self._clock(), item[1])
+            self._entries.move_to_end(key)
+            self._stats.revalidations += 1
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            snapshot = CacheStats(**asdict(self._stats))
+            snapshot.size = len(self._entries)
+            return snapshot
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self._ttl_seconds > 0 and self._clock() - stored_at > self._ttl_seconds
+
+
+class DiskCache:
+    """JSON-on-disk cache bounded by total size, evicting least recently used files first.
+
+    Keys should be hex digests; each entry is stored as ``<directory>/<key[:2]>/<key>.json``
+    and reads refresh the file's mtime, which serves as the LRU clock. Writes are atomic, so
+    several worker processes may share one directory.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max(0, max_bytes)
+        self._logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self._total_bytes = sum(path.stat().st_size for path in self._entries())
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                value = json.load(handle)
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._stats.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            self._logger.warning("Disk cache: discarding unreadable entry %s: %s", path, e)
+            self.invalidate(key)
+            with self._lock:
+                self._stats.misses += 1
+            return None
+        with self._lock:
+            self._stats.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        payload = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        if self._max_bytes and len(payload) > self._max_bytes:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        previous = path.stat().st_size if path.exists() else 0
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            self._logger.warning("Disk cache: failed to write %s: %s", path, e)
+            Path(tmp_name).unlink(missing_ok=True)
+            return
+        with self._lock:
+            self._total_bytes += len(payload) - previous
+            if self._max_bytes and self._total_bytes > self._max_bytes:
+                self._evict()
+
+    def invalidate(self, key: str) -> None:
+        path = self._path(key)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._total_bytes -= size
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            snapshot = CacheStats(**asdict(self._stats))
+        snapshot.size = sum(1 for _ in self._entries())
+        return snapshot
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _path(self, key: str) -> Path:
+        return self._directory / key[:2] / f"{key}.json"
+
+    def _entries(self):
+        return self._directory.glob("*/*.json")
+
+    def _evict(self) -> None:
+        # Called with the lock held; trims to 90% so every write past the limit doesn't rescan.
+        target = int(self._max_bytes * 0.9)
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._total_bytes <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            self._total_bytes -= size
+            self._stats.evictions += 1
+
+
+__all__ = ["CacheStats", "DiskCache", "TTLCache"]
@@ -0,0 +1,122 @@
+"""Paragraph- and sentence-aware chunking of long sources into SemanticChunks."""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional
+
+from app.domain.dto import SemanticChunk
+from app.services.text_segmentation import split_sentences, words
+
+_PARAGRAPH = re.compile(r"\n\s*\n")
+
+
+def count_tokens(text: str) -> int:
+    """Approximate model tokens by counting words (stable across scripts, no tokenizer needed)."""
+    return len(words(text))
+
+
+class SemanticChunker:
+    """Pack paragraphs into windows of at most ``max_tokens``.
+
+    Paragraphs are kept whole where possible; longer ones are split between sentences,
+    and a sentence longer than the window is split between words. ``overlap_sentences``
+    repeats the tail of the previous window at the start of the next one when a
+    paragraph has to be split, so no chunk starts mid-thought.
+    """
+
+    def __init__(self, *, max_tokens: int = 300, overlap_sentences: int = 1) -> None:
+        self._max_tokens = max(20, max_tokens)
+        self._overlap_sentences = max(0, overlap_sentences)
+
+    def split(self, text: str) -> List[str]:
+        windows: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        def flush() -> None:
+            nonlocal current, current_tokens
+            if current:
+                windows.append("\n\n".join(current))
+            current, current_tokens = [], 0
+
+        for paragraph in _PARAGRAPH.split(text or ""):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            tokens = count_tokens(paragraph)
+            if tokens > self._max_tokens:
+                flush()
+                windows.extend(self._split_paragraph(paragraph))
+                continue
+            if current and current_tokens + tokens > self._max_tokens:
+                flush()
+            current.append(paragraph)
+            current_tokens += tokens
+        flush()
+        return windows
+
+    def chunk(
+        self,
+        text: str,
+        *,
+        id_prefix: str,
+        source_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[SemanticChunk]:
+        """Split ``text`` and wrap the windows as chunks ``{id_prefix}:chunk-1..n``."""
+        windows = self.split(text)
+        return [
+            SemanticChunk(
+                id=f"{id_prefix}:chunk-{index}",
+                text=window,
+                source_id=source_id,
+                metadata={**(metadata or {}), "chunk_index": index - 1, "chunk_count": len(windows)},
+            )
+            for index, window in enumerate(windows, start=1)
+        ]
+
+    def _split_paragraph(self, paragraph: str) -> List[str]:
+        sentences: List[str] = []
+        for sentence in split_sentences(paragraph):
+            if count_tokens(sentence) > self._max_tokens:
+                sentences.extend(self._split_words(sentence))
+            else:
+                sentences.append(sentence)
+
+        windows: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+        for sentence in sentences:
+            tokens = count_tokens(sentence)
+            if current and current_tokens + tokens > self._max_tokens:
+                windows.append(" ".join(current))
+                overlap = current[-self._overlap_sentences :] if self._overlap_sentences else []
+                # Never let the overlap alone push the next window past the limit
+                while overlap and count_tokens(" ".join(overlap)) + tokens > self._max_tokens:
+                    overlap = overlap[1:]
+                current = list(overlap)
+                current_tokens = sum(count_tokens(item) for item in current)
+            current.append(sentence)
+            current_tokens += tokens
+        if current:
+            windows.append(" ".join(current))
+        return windows
+
+    def _split_words(self, sentence: str) -> List[str]:
+        pieces: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+        for word in sentence.split():
+            tokens = count_tokens(word)
+            if current and current_tokens + tokens > self._max_tokens:
+                pieces.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(word)
+            current_tokens += tokens
+        if current:
+            pieces.append(" ".join(current))
+        return pieces
+
+
+__all__ = ["SemanticChunker", "count_tokens"]
@@ -0,0 +1,317 @@
+"""Local news category/subcategory/emotion classifier: hashed n-gram features and linear heads."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import random
+import tempfile
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from app.services.keywords import segment_terms
+
+try:  # NumPy is optional; inference falls back to the per-head sparse scoring
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+HEADS = ("category", "subcategory", "emotion")
+MODEL_FORMAT_VERSION = 1
+DEFAULT_HASH_BITS = 18
+
+# Sparse feature vector: hashed feature index -> value
+Features = Dict[int, float]
+
+
+@dataclass
+class LabeledText:
+    """A training/evaluation example; heads without a known label are left out of ``labels``."""
+
+    text: str
+    labels: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class StoryClassification:
+    category: str
+    subcategory: str
+    emotion: str
+    # Probability of the weakest head; the LLM fallback triggers on this
+    confidence: float
+    scores: Dict[str, float] = field(default_factory=dict)
+
+    def as_tuple(self) -> Tuple[str, str, str]:
+        return (self.category, self.subcategory, self.emotion)
+
+
+class HashedFeaturizer:
+    """Word unigrams and bigrams hashed into ``2 ** hash_bits`` buckets (the hashing trick).
+
+    Tokens are the script-aware content words of ``segment_terms``, so bigrams never span
+    stopwords or clause punctuation. Values are sublinear counts, L2-normalized, so long
+    and short articles produce comparable scores. CRC32 keeps indexes stable across
+    processes, unlike ``hash()``.
+    """
+
+    def __init__(self, hash_bits: int = DEFAULT_HASH_BITS, max_chars: int = 3000) -> None:
+        self.hash_bits = hash_bits
+        self.max_chars = max_chars
+        self._mask = (1 << hash_bits) - 1
+
+    def transform(self, text: str) -> Features:
+        counts: Counter = Counter()
+        for run in segment_terms(text[: self.max_chars]):
+            counts.update(run)
+            counts.update(f"{first} {second}" for first, second in zip(run, run[1:]))
+        features: Features = {}
+        for term, count in counts.items():
+            index = zlib.crc32(term.encode("utf-8")) & self._mask
+            features[index] = features.get(index, 0.0) + 1.0 + math.log(count)
+        norm = math.sqrt(sum(value * value for value in features.values()))
+        if norm:
+            for index in features:
+                features[index] /= norm
+        return features
+
+
+class LinearHead:
+    """Multinomial logistic regression over sparse features for one label set.
+
+    Weights are stored sparsely (only features seen in training have a row), so scoring
+    an article touches just the features it contains.
+    """
+
+    def __init__(self, labels: Sequence[str], weights: Optional[Dict[int, List[float]]] = None, bias: Optional[List[float]] = None) -> None:
+        self.labels = list(labels)
+        self.weights: Dict[int, List[float]] = weights if weights is not None else {}
+        self.bias = bias if bias is not None else [0.0] * len(self.labels)
+
+    def probabilities(self, features: Features) -> List[float]:
+        scores = list(self.bias)
+        width = len(scores)
+        weights = self.weights
+        for index, value in features.items():
+            row = weights.get(index)
+            if row is not None:
+                for k in range(width):
+                    scores[k] += row[k] * value
+        return _softmax(scores)
+
+    def predict(self, features: Features) -> Tuple[str, float]:
+        return _best(self.labels, self.probabilities(features))
+
+    def update(self, features: Features, label_index: int, learning_rate: float, l2: float) -> None:
+        """One SGD step on the cross-entropy loss."""
+        probabilities = self.probabilities(features)
+        gradient = [p - (1.0 if k == label_index else 0.0) for k, p in enumerate(probabilities)]
+        width = len(gradient)
+        for index, value in features.items():
+            row = self.weights.get(index)
+            if row is None:
+                row = self.weights[index] = [0.0] * width
+            for k in range(width):
+                row[k] -= learning_rate * (gradient[k] * value + l2 * row[k])
+        for k in range(width):
+            self.bias[k] -= learning_rate * gradient[k]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "labels": self.labels,
+            "bias": self.bias,
+            "weights": {str(index): [round(w, 6) for w in row] for index, row in self.weights.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object]) -> "LinearHead":
+        weights = {int(index): [float(w) for w in row] for index, row in dict(data.get("weights", {})).items()}
+        return cls(list(data["labels"]), weights, [float(b) for b in data.get("bias", [])] or None)
+
+
+class StoryClassifier:
+    """Predict category, subcategory and emotion for an article without a model call.
+
+    Weights are pluggable: ``load`` reads a JSON model written by ``save`` (see
+    ``train_classifier.py`` for training from the stories table). Classification takes well
+    under a millisecond for a prompt-sized article.
+    """
+
+    def __init__(self, heads: Mapping[str, LinearHead], featurizer: Optional[HashedFeaturizer] = None) -> None:
+        missing = [name for name in HEADS if name not in heads]
+        if missing:
+            raise ValueError(f"Classifier is missing heads: {', '.join(missing)}")
+        self.heads = dict(heads)
+        self.featurizer = featurizer or HashedFeaturizer()
+        self._packed_weights: Optional[Tuple[Dict[int, int], "np.ndarray", "np.ndarray", Dict[str, Tuple[int, int]]]] = None
+
+    def classify(self, text: str) -> StoryClassification:
+        features = self.featurizer.transform(text)
+        if np is not None:
+            predictions = self._predict_packed(features)
+        else:
+            predictions = {name: self.heads[name].predict(features) for name in HEADS}
+        return StoryClassification(
+            category=predictions["category"][0],
+            subcategory=predictions["subcategory"][0],
+            emotion=predictions["emotion"][0],
+            confidence=min(probability for _, probability in predictions.values()),
+            scores={name: probability for name, (_, probability) in predictions.items()},
+        )
+
+    def _predict_packed(self, features: Features) -> Dict[str, Tuple[str, float]]:
+        # All heads' rows side by side in one matrix: a single gather and product per article
+        rows, matrix, bias, spans = self._packed()
+        hits = [(rows[index], value) for index, value in features.items() if index in rows]
+        scores = bias
+        if hits:
+            positions, values = zip(*hits)
+            scores = np.asarray(values) @ matrix[list(positions)] + bias
+        return {
+            name: _best(self.heads[name].labels, _softmax(scores[start:end].tolist()))
+            for name, (start, end) in spans.items()
+        }
+
+    def _packed(self) -> Tuple[Dict[int, int], "np.ndarray", "np.ndarray", Dict[str, Tuple[int, int]]]:
+        if self._packed_weights is None:
+            spans: Dict[str, Tuple[int, int]] = {}
+            start = 0
+            for name in HEADS:
+                spans[name] = (start, start + len(self.heads[name].labels))
+                start = spans[name][1]
+            rows: Dict[int, int] = {}
+            for name in HEADS:
+                for index in self.heads[name].weights:
+                    rows.setdefault(index, len(rows))
+            matrix = np.zeros((len(rows), start))
+            for name, (begin, end) in spans.items():
+                for index, row in self.heads[name].weights.items():
+                    matrix[rows[index], begin:end] = row
+            bias = np.concatenate([np.asarray(self.heads[name].bias, dtype=float) for name in HEADS])
+            self._packed_weights = (rows, matrix, bias, spans)
+        return self._packed_weights
+
+    @classmethod
+    def train(
+        cls,
+        examples: Sequence[LabeledText],
+        *,
+        featurizer: Optional[HashedFeaturizer] = None,
+        epochs: int = 10,
+        learning_rate: float = 0.5,
+        l2: float = 1e-6,
+        seed: int = 13,
+    ) -> "StoryClassifier":
+        """Fit one softmax head per label set; examples lacking a head's label skip that head."""
+        featurizer = featurizer or HashedFeaturizer()
+        heads: Dict[str, LinearHead] = {}
+        for name in HEADS:
+            labels = sorted({example.labels[name] for example in examples if example.labels.get(name)})
+            if not labels:
+                raise ValueError(f"No training labels for '{name}'")
+            heads[name] = LinearHead(labels)
+
+        vectors = [(featurizer.transform(example.text), example.labels) for example in examples]
+        order = list(range(len(vectors)))
+        rng = random.Random(seed)
+        for epoch in range(epochs):
+            rng.shuffle(order)
+            rate = learning_rate / math.sqrt(1 + epoch)
+            for position in order:
+                features, labels = vectors[position]
+                for name, head in heads.items():
+                    label = labels.get(name)
+                    if label:
+                        head.update(features, head.labels.index(label), rate, l2)
+        return cls(heads, featurizer)
+
+    def evaluate(self, examples: Iterable[LabeledText], min_confidence: float = 0.0) -> Dict[str, float]:
+        """Per-head accuracy, plus coverage/accuracy of predictions at ``min_confidence``."""
+        correct: Counter = Counter()
+        seen: Counter = Counter()
+        covered = covered_correct = total = 0
+        for example in examples:
+            result = self.classify(example.text)
+            predicted = dict(zip(HEADS, result.as_tuple()))
+            total += 1
+            all_right = True
+            for name in HEADS:
+                expected = example.labels.get(name)
+                if not expected:
+                    continue
+                seen[name] += 1
+                if predicted[name] == expected:
+                    correct[name] += 1
+                else:
+                    all_right = False
+            if result.confidence >= min_confidence:
+                covered += 1
+                covered_correct += all_right
+        report = {f"{name}_accuracy": correct[name] / seen[name] for name in HEADS if seen[name]}
+        report["coverage"] = covered / total if total else 0.0
+        report["covered_accuracy"] = covered_correct / covered if covered else 0.0
+        return report
+
+    def save(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        payload = {
+            "version": MODEL_FORMAT_VERSION,
+            "hash_bits": self.featurizer.hash_bits,
+            "max_chars": self.featurizer.max_chars,
+            "heads": {name: head.to_dict() for name, head in self.heads.items()},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_name, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "StoryClassifier":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != MODEL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported classifier model version: {data.get('version')!r}")
+        featurizer = HashedFeaturizer(hash_bits=int(data["hash_bits"]), max_chars=int(data.get("max_chars", 3000)))
+        heads = {name: LinearHead.from_dict(head) for name, head in data["heads"].items()}
+        return cls(heads, featurizer)
+
+
+def _softmax(scores: List[float]) -> List[float]:
+    top = max(scores)
+    exps = [math.exp(score - top) for score in scores]
+    total = sum(exps)
+    return [value / total for value in exps]
+
+
+def _best(labels: Sequence[str], probabilities: Sequence[float]) -> Tuple[str, float]:
+    best = max(range(len(probabilities)), key=probabilities.__getitem__)
+    return labels[best], probabilities[best]
+
+
+def load_story_classifier(path: Optional[Union[str, Path]], logger: Optional[logging.Logger] = None) -> Optional[StoryClassifier]:
+    """Classifier at ``path``, or None (LLM-only classification) when unset or unreadable."""
+    if not path:
+        return None
+    logger = logger or logging.getLogger(__name__)
+    try:
+        return StoryClassifier.load(path)
+    except FileNotFoundError:
+        logger.info("Story classifier model %s not found; classification uses the LLM", path)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning("Story classifier model %s is unusable; classification uses the LLM: %s", path, e)
+    return None
+
+
+__all__ = [
+    "HEADS",
+    "HashedFeaturizer",
+    "LabeledText",
+    "LinearHead",
+    "StoryClassification",
+    "StoryClassifier",
+    "load_story_classifier",
+]
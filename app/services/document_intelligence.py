@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import itertools
 import logging
+import threading
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Protocol, Sequence
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Iterable, List, Optional, Protocol, Sequence, Union
 
 import httpx
 
@@ -18,9 +23,15 @@ from app.domain.dto import (
     StructuredJobRequest,
 )
 from app.domain.interfaces import DocumentIntelligencePipeline
+from app.services.attachment_source import AttachmentSource, as_source
+from app.services.cache import DiskCache
+from app.services.chunking import SemanticChunker
 
 if TYPE_CHECKING:
-    from app.services.url_extractor import URLContentExtractor
+    from app.services.url_extractor import ArticleExtractionResult, URLContentExtractor
+
+# Attachment loaders may return raw bytes (small payloads) or a streamable source
+AttachmentPayload = Optional[Union[bytes, AttachmentSource]]
 
 
 @dataclass
@@ -62,6 +73,13 @@ class ParserAdapter(Protocol):
         ...
 
 
+class EntityExtractor(Protocol):
+    """Tags entities in chunks that never pass through a parser adapter (URLs, pasted text)."""
+
+    def extract_chunks(self, chunks: Sequence[SemanticChunk]) -> List[Entity]:
+        ...
+
+
 class DefaultDocumentIntelligencePipeline(DocumentIntelligencePipeline):
     """Coordinate OCR adapters and parser adapters to build DocInsights."""
 
@@ -70,39 +88,79 @@ class DefaultDocumentIntelligencePipeline(DocumentIntelligencePipeline):
         ocr_adapters: Sequence[OCRAdapter],
         parser_adapters: Sequence[ParserAdapter],
         url_extractor: Optional["URLContentExtractor"] = None,
+        *,
+        url_fetch_workers: int = 8,
+        url_deadline_seconds: float = 20.0,
+        parse_executor: Optional[Executor] = None,
+        ocr_workers: int = 4,
+        attachment_scope: Optional[Callable[[], ContextManager[Any]]] = None,
+        chunker: Optional[SemanticChunker] = None,
+        entity_extractor: Optional[EntityExtractor] = None,
     ) -> None:
+        """
+        Parameters
+        ----------
+        url_fetch_workers:
+            Number of URLs downloaded concurrently.
+        url_deadline_seconds:
+            Time budget for fetching and parsing each URL, counted from when a fetch worker
+            starts on it; slower URLs are skipped.
+        parse_executor:
+            Optional worker pool (e.g. a ``ProcessPoolExecutor``) for CPU-bound article parsing.
+            Parsing runs on the fetch thread when omitted.
+        ocr_workers:
+            Number of attachments sent through OCR and parsing concurrently.
+        attachment_scope:
+            Context entered around the OCR adapters for one attachment, e.g.
+            ``SharedSourceLoader.scope`` so the adapters share one opened source.
+        chunker:
+            Splits long OCR text into token-sized chunks when no parser adapter applies.
+        entity_extractor:
+            Tags entities in URL and text-input chunks; attachments get theirs from parser adapters.
+        """
+
         self._ocr_adapters = list(ocr_adapters)
         self._parser_adapters = list(parser_adapters)
         self._url_extractor = url_extractor
+        self._url_deadline_seconds = url_deadline_seconds
+        self._url_fetch_workers = max(1, url_fetch_workers)
+        self._fetch_executor = ThreadPoolExecutor(
+            max_workers=self._url_fetch_workers, thread_name_prefix="url-fetch"
+        )
+        self._parse_executor = parse_executor
+        self._ocr_executor = ThreadPoolExecutor(max_workers=max(1, ocr_workers), thread_name_prefix="ocr")
+        self._attachment_scope = attachment_scope or contextlib.nullcontext
+        self._chunker = chunker or SemanticChunker()
+        self._entity_extractor = entity_extractor
+        self._logger = logging.getLogger(__name__)
 
     def run(self, job_request: StructuredJobRequest) -> DocInsights:
         insights = DocInsights()
+        if job_request.focus_keywords:
+            # Used downstream to rank chunks for prompt budgets
+            insights.metadata["focus_keywords"] = list(job_request.focus_keywords)
 
         # Process URLs first (extract article content)
         if job_request.url_list and self._url_extractor:
-            for url in job_request.url_list:
-                url_str = str(url)
-                try:
-                    result = self._url_extractor.extract(url_str)
-                    if result:
-                        chunks = self._url_extractor.to_semantic_chunks(result, url_str)
-                        insights.semantic_chunks.extend(chunks)
-                        # Store article images in metadata for later use
-                        if insights.metadata is None:
-                            insights.metadata = {}
-                        if "article_images" not in insights.metadata:
-                            insights.metadata["article_images"] = []
-                        if result.top_image_url:
-                            insights.metadata["article_images"].append(result.top_image_url)
-                        # Also store all images
-                        if result.images:
-                            insights.metadata["article_images"].extend(result.images[:5])  # Limit to 5
-                except Exception as e:
-                    # Log error but continue processing
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.warning("Failed to process URL %s: %s", url_str, e, exc_info=True)
+            url_strs = [str(url) for url in job_request.url_list]
+            # Results come back in the original URL order regardless of completion order
+            for url_str, result in zip(url_strs, self._extract_urls(url_strs)):
+                if not result:
                     continue
+                chunks = self._url_extractor.to_semantic_chunks(result, url_str)
+                insights.semantic_chunks.extend(chunks)
+                if result.summary:
+                    insights.summaries.append(result.summary)
+                # Store article images in metadata for later use
+                if insights.metadata is None:
+                    insights.metadata = {}
+                if "article_images" not in insights.metadata:
+                    insights.metadata["article_images"] = []
+                if result.top_image_url:
+                    insights.metadata["article_images"].append(result.top_image_url)
+                # Also store all images
+                if result.images:
+                    insights.metadata["article_images"].extend(result.images[:5])  # Limit to 5
 
         if job_request.text_input:
             insights.semantic_chunks.append(
@@ -114,28 +172,94 @@ class DefaultDocumentIntelligencePipeline(DocumentIntelligencePipeline):
                 )
             )
 
-        for attachment in job_request.attachments:
-            extraction = self._run_ocr(attachment)
-            if extraction is None or not extraction.text.strip():
-                continue
+        if self._entity_extractor is not None and insights.semantic_chunks:
+            insights.entities.merge(self._entity_extractor.extract_chunks(insights.semantic_chunks))
 
-            parser = self._select_parser(extraction)
-            if parser:
-                result = parser.parse(extraction)
-            else:
-                result = self._default_parse(extraction)
+        # OCR round-trips dominate; process attachments concurrently and merge in input order
+        futures = [self._ocr_executor.submit(self._process_attachment, attachment) for attachment in job_request.attachments]
+        for future in futures:
+            result = future.result()
+            if result is None:
+                continue
 
             insights.semantic_chunks.extend(result.chunks)
-            insights.entities.merge(result.entities)
+            insights.entities.merge(self._unseen_entities(insights.entities, result.entities))
             if result.summary:
                 insights.summaries.append(result.summary)
 
         return insights
 
+    @staticmethod
+    def _unseen_entities(entity_map: EntityMap, entities: List[Entity]) -> List[Entity]:
+        # The same person or place is often named in the article and in its attachments
+        seen = {(entity.type, entity.name) for entity in itertools.chain.from_iterable(entity_map.entities.values())}
+        return [entity for entity in entities if (entity.type, entity.name) not in seen]
+
+    def _extract_urls(self, urls: Sequence[str]) -> List[Optional["ArticleExtractionResult"]]:
+        """Fetch all URLs concurrently and parse them in the worker pool.
+
+        Each URL gets ``url_deadline_seconds`` from the moment a fetch worker picks it up,
+        so URLs queued behind ``url_fetch_workers`` are not charged for the wait. A URL
+        still queued once every earlier wave of workers has used its full budget is skipped.
+        """
+        started = [threading.Event() for _ in urls]
+        started_at = [0.0] * len(urls)
+
+        def run(index: int, url: str) -> Optional["ArticleExtractionResult"]:
+            started_at[index] = time.monotonic()
+            started[index].set()
+            return self._fetch_and_parse(url)
+
+        waves = -(-len(urls) // self._url_fetch_workers)
+        queue_deadline = time.monotonic() + waves * self._url_deadline_seconds
+        futures = [self._fetch_executor.submit(run, index, url) for index, url in enumerate(urls)]
+        results = []
+        for index, (url, future) in enumerate(zip(urls, futures)):
+            if not started[index].wait(timeout=max(0.0, queue_deadline - time.monotonic())):
+                future.cancel()
+                self._logger.warning("No fetch worker free for %s before the queue deadline, skipping", url)
+                results.append(None)
+                continue
+            remaining = started_at[index] + self._url_deadline_seconds - time.monotonic()
+            if not wait([future], timeout=max(0.0, remaining)).done:
+                self._logger.warning(
+                    "URL extraction exceeded %.1fs deadline, skipping %s", self._url_deadline_seconds, url
+                )
+                results.append(None)
+                continue
+            try:
+                results.append(future.result())
+            except Exception as e:
+                self._logger.warning("Failed to process URL %s: %s", url, e, exc_info=True)
+                results.append(None)
+        return results
+
+    def _fetch_and_parse(self, url: str) -> Optional["ArticleExtractionResult"]:
+        if self._parse_executor is None:
+            return self._url_extractor.extract(url)
+        return self._url_extractor.extract(url, parser=self._parse_in_pool)
+
+    def _parse_in_pool(self, url: str, html: str) -> Optional["ArticleExtractionResult"]:
+        return self._parse_executor.submit(self._url_extractor.parse, url, html).result()
+
+    def _process_attachment(self, attachment: AttachmentDescriptor) -> Optional[ParserResult]:
+        with self._attachment_scope():
+            extraction = self._run_ocr(attachment)
+        if extraction is None or not extraction.text.strip():
+            return None
+
+        parser = self._select_parser(extraction)
+        if parser:
+            return parser.parse(extraction)
+        return self._default_parse(extraction)
+
     def _run_ocr(self, attachment: AttachmentDescriptor) -> Optional[OCRExtraction]:
+        # Adapters are ordered cheapest first; one that declines (returns None) hands over to the next
         for adapter in self._ocr_adapters:
             if adapter.can_process(attachment):
-                return adapter.extract(attachment)
+                extraction = adapter.extract(attachment)
+                if extraction is not None:
+                    return extraction
         return None
 
     def _select_parser(self, extraction: OCRExtraction) -> Optional[ParserAdapter]:
@@ -145,18 +269,90 @@ class DefaultDocumentIntelligencePipeline(DocumentIntelligencePipeline):
         return None
 
     def _default_parse(self, extraction: OCRExtraction) -> ParserResult:
-        chunk = SemanticChunk(
-            id=f"{extraction.attachment.id}:chunk-1",
-            text=extraction.text,
+        chunks = self._chunker.chunk(
+            extraction.text,
+            id_prefix=extraction.attachment.id,
             source_id=extraction.attachment.id,
             metadata=extraction.metadata or {},
         )
         return ParserResult(
-            chunks=[chunk],
+            chunks=chunks,
             entities=[],
         )
 
 
+class PdfTextLayerAdapter:
+    """Read the embedded text layer of born-digital PDFs locally with pypdf.
+
+    Returns None for PDFs whose average text per page is below ``min_chars_per_page``
+    (scans, image-only pages) so the pipeline falls through to a real OCR adapter. Only the
+    first ``max_pages`` pages are read; longer documents are logged and marked ``truncated``.
+    """
+
+    def __init__(
+        self,
+        *,
+        attachment_loader: Callable[[AttachmentDescriptor], AttachmentPayload] | None = None,
+        min_chars_per_page: int = 200,
+        max_pages: int = 300,
+    ) -> None:
+        self._attachment_loader = attachment_loader or (lambda attachment: None)
+        self._min_chars_per_page = min_chars_per_page
+        self._max_pages = max_pages
+        self._logger = logging.getLogger(__name__)
+
+    def can_process(self, attachment: AttachmentDescriptor) -> bool:
+        return attachment.media_type == "application/pdf"
+
+    def extract(self, attachment: AttachmentDescriptor) -> Optional[OCRExtraction]:
+        try:
+            from pypdf import PdfReader
+        except ImportError:  # pragma: no cover - depends on environment
+            self._logger.debug("pypdf not installed; skipping local PDF text extraction")
+            return None
+
+        source = as_source(self._attachment_loader(attachment), attachment.uri)
+        if source is None:
+            return None
+        try:
+            # PdfReader seeks around the file, so remote sources are spooled once first
+            with source.materialize().open() as handle:
+                reader = PdfReader(handle)
+                if reader.is_encrypted and not reader.decrypt(""):
+                    return None
+                page_count = len(reader.pages)
+                texts = [(page.extract_text() or "").strip() for page in reader.pages[: self._max_pages]]
+        except Exception as e:
+            self._logger.warning("Local PDF text extraction failed for %s: %s", attachment.id, e)
+            return None
+
+        chars_per_page = sum(len(text) for text in texts) / max(1, len(texts))
+        if chars_per_page < self._min_chars_per_page:
+            self._logger.info(
+                "PDF %s has %.0f chars/page of embedded text, treating as scanned", attachment.id, chars_per_page
+            )
+            return None
+
+        truncated = page_count > len(texts)
+        if truncated:
+            self._logger.warning(
+                "PDF %s has %d pages; extracted text from the first %d only", attachment.id, page_count, len(texts)
+            )
+        return OCRExtraction(
+            attachment=attachment,
+            text="\n".join(text for text in texts if text),
+            language=None,
+            metadata={
+                "source": "pdf_text_layer",
+                "media_type": attachment.media_type,
+                "pages": page_count,
+                "pages_extracted": len(texts),
+                "truncated": truncated,
+                "chars_per_page": round(chars_per_page, 1),
+            },
+        )
+
+
 class AzureDocumentIntelligenceAdapter:
     """Adapter that uses Azure Document Intelligence REST API for OCR."""
 
@@ -167,8 +363,16 @@ class AzureDocumentIntelligenceAdapter:
         api_key: str,
         model_id: str = "prebuilt-layout",
         api_version: str = "2024-02-29-preview",
-        attachment_loader: Callable[[AttachmentDescriptor], Optional[bytes]] | None = None,
+        attachment_loader: Callable[[AttachmentDescriptor], AttachmentPayload] | None = None,
         timeout: float = 30.0,
+        poll_deadline_seconds: float = 180.0,
+        poll_initial_interval: float = 1.0,
+        poll_max_interval: float = 10.0,
+        poll_backoff: float = 1.5,
+        client: Optional[httpx.Client] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        cache: Optional[DiskCache] = None,
     ) -> None:
         self._endpoint = endpoint.rstrip("/")
         self._api_key = api_key
@@ -176,17 +380,48 @@ class AzureDocumentIntelligenceAdapter:
         self._api_version = api_version
         self._attachment_loader = attachment_loader or (lambda attachment: None)
         self._timeout = timeout
+        self._poll_deadline_seconds = poll_deadline_seconds
+        self._poll_initial_interval = poll_initial_interval
+        self._poll_max_interval = poll_max_interval
+        self._poll_backoff = poll_backoff
+        # One pooled client serves submits and polls for every attachment
+        self._client = client or httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+        )
+        self._sleep = sleep
+        self._clock = clock
+        self._cache = cache
         self._logger = logging.getLogger(__name__)
 
     def can_process(self, attachment: AttachmentDescriptor) -> bool:
         return attachment.media_type in {"application/pdf", "image/png", "image/jpeg"}
 
     def extract(self, attachment: AttachmentDescriptor) -> Optional[OCRExtraction]:
-        content = self._attachment_loader(attachment)
-        if not content:
+        source = as_source(self._attachment_loader(attachment), attachment.uri)
+        if source is None:
             self._logger.debug("Azure DI: no content available for attachment %s", attachment.id)
             return None
 
+        cache_key: Optional[str] = None
+        if self._cache is not None:
+            # Hash and upload from the same local copy instead of downloading twice
+            try:
+                source = source.materialize()
+                cache_key = self._cache_key(source.sha256())
+            except Exception as e:  # S3 ClientError, HTTP 404, disk errors: skip the attachment
+                self._logger.warning("Azure DI: could not read attachment %s: %s", attachment.id, e)
+                return None
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._logger.info("Azure DI: reusing cached OCR result for attachment %s", attachment.id)
+                return OCRExtraction(
+                    attachment=attachment,
+                    text=cached["text"],
+                    language=cached.get("language"),
+                    metadata=cached.get("metadata"),
+                )
+
         analyze_url = (
             f"{self._endpoint}/documentanalysis:analyze"
             f"?modelId={self._model_id}&api-version={self._api_version}"
@@ -196,33 +431,81 @@ class AzureDocumentIntelligenceAdapter:
             "Content-Type": attachment.media_type or "application/octet-stream",
         }
 
-        with httpx.Client(timeout=self._timeout) as client:
-            response = client.post(analyze_url, headers=headers, content=content)
-            response.raise_for_status()
-            operation_url = response.headers.get("operation-location")
+        if source.size is not None:
+            headers["Content-Length"] = str(source.size)
+
+        # Remote sources are opened lazily, so a missing object only surfaces while uploading
+        read_errors: List[Exception] = []
+        try:
+            response = self._client.post(analyze_url, headers=headers, content=self._read(source, read_errors))
+        except Exception:
+            if not read_errors:
+                raise
+            self._logger.warning("Azure DI: could not read attachment %s: %s", attachment.id, read_errors[0])
+            return None
+        response.raise_for_status()
+        operation_url = response.headers.get("operation-location")
 
         if not operation_url:
             self._logger.warning("Azure DI: missing operation-location header for %s", attachment.id)
             return None
 
-        result = self._poll_operation(operation_url)
+        result = self._poll_operation(operation_url, retry_after=self._retry_after(response))
         full_text = self._extract_text(result)
         metadata = {"model_id": self._model_id, "api_version": self._api_version}
         language = result.get("documents", [{}])[0].get("language")
+        if cache_key is not None and result.get("status") == "succeeded":
+            self._cache.put(cache_key, {"text": full_text, "language": language, "metadata": metadata})
         return OCRExtraction(attachment=attachment, text=full_text, language=language, metadata=metadata)
 
-    def _poll_operation(self, operation_url: str) -> dict[str, Any]:
+    @staticmethod
+    def _read(source: AttachmentSource, errors: List[Exception]) -> Iterable[bytes]:
+        """Stream ``source``, recording a read failure so it is not mistaken for an upload error."""
+        try:
+            yield from source.iter_chunks()
+        except Exception as e:
+            errors.append(e)
+            raise
+
+    def _cache_key(self, digest: str) -> str:
+        """SHA-256 content digest, scoped to the model and API version that produced the text."""
+        return hashlib.sha256(f"{self._model_id}:{self._api_version}:{digest}".encode()).hexdigest()
+
+    def _poll_operation(self, operation_url: str, retry_after: Optional[float] = None) -> dict[str, Any]:
+        """Poll until the analysis finishes, honouring Retry-After and backing off up to the deadline."""
         headers = {"Ocp-Apim-Subscription-Key": self._api_key}
-        with httpx.Client(timeout=self._timeout) as client:
-            for _ in range(10):
-                response = client.get(operation_url, headers=headers)
-                response.raise_for_status()
-                payload = response.json()
-                status = payload.get("status")
-                if status in {"succeeded", "failed"}:
-                    return payload
-                time.sleep(1)
-        raise RuntimeError("Azure Document Intelligence operation timed out.")
+        deadline = self._clock() + self._poll_deadline_seconds
+        interval = self._poll_initial_interval
+        delay = retry_after if retry_after is not None else interval
+        while True:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                break
+            self._sleep(min(delay, remaining))
+
+            response = self._client.get(operation_url, headers=headers)
+            response.raise_for_status()
+            payload = response.json()
+            status = payload.get("status")
+            if status in {"succeeded", "failed"}:
+                return payload
+
+            interval = min(interval * self._poll_backoff, self._poll_max_interval)
+            retry_after = self._retry_after(response)
+            delay = retry_after if retry_after is not None else interval
+        raise RuntimeError(
+            f"Azure Document Intelligence operation timed out after {self._poll_deadline_seconds:.0f}s."
+        )
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
 
     def _extract_text(self, payload: dict[str, Any]) -> str:
         try:
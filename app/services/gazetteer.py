@@ -0,0 +1,292 @@
+"""Gazetteer entity extraction with a compiled Aho–Corasick automaton (no model call)."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from app.domain.dto import Entity, SemanticChunk
+from app.services.chunking import SemanticChunker
+from app.services.document_intelligence import OCRExtraction, ParserResult
+
+GAZETTEER_SUFFIX = ".txt"
+
+
+@dataclass(frozen=True)
+class GazetteerEntry:
+    """One surface form (name or alias) and the entity it refers to."""
+
+    surface: str
+    canonical: str
+    entity_type: str
+
+
+@dataclass(frozen=True)
+class GazetteerMatch:
+    start: int
+    end: int
+    entry: GazetteerEntry
+
+
+class AhoCorasickAutomaton:
+    """Multi-pattern matcher: one pass over the text finds every gazetteer name.
+
+    Patterns and text are lowercased, so matching is case-insensitive for Latin script;
+    Devanagari has no case and matches as written. A match only counts on word boundaries,
+    where a neighbouring letter, digit or combining vowel sign (matra) means the name is
+    part of a longer word. Overlapping matches resolve leftmost-longest.
+    """
+
+    def __init__(self, entries: Iterable[GazetteerEntry]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+        self._entries: List[GazetteerEntry] = []
+        seen = set()
+        for entry in entries:
+            pattern = _normalize(entry.surface)
+            if not pattern or (pattern, entry.entity_type) in seen:
+                continue
+            seen.add((pattern, entry.entity_type))
+            self._add(pattern, len(self._entries))
+            self._entries.append(entry)
+        self._lengths = [len(_normalize(entry.surface)) for entry in self._entries]
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _add(self, pattern: str, index: int) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] += (index,)
+
+    def _link(self) -> None:
+        # Breadth-first so every failure target is final before its dependants
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] += self._output[self._fail[child]]
+
+    def find(self, text: str) -> List[GazetteerMatch]:
+        """Non-overlapping matches; offsets index the lowercased text (same length for Latin/Devanagari)."""
+        haystack = _normalize(text)
+        goto, fail, output, lengths = self._goto, self._fail, self._output, self._lengths
+        candidates: List[Tuple[int, int, int]] = []
+        state = 0
+        for position, char in enumerate(haystack):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                end = position + 1
+                start = end - lengths[index]
+                if _is_boundary(haystack, start - 1) and _is_boundary(haystack, end):
+                    candidates.append((start, -end, index))
+
+        matches: List[GazetteerMatch] = []
+        covered = 0
+        for start, negative_end, index in sorted(candidates):
+            if start < covered:
+                continue
+            covered = -negative_end
+            matches.append(GazetteerMatch(start, covered, self._entries[index]))
+        return matches
+
+
+class Gazetteer:
+    """Name lists per entity type, read from ``<type>.txt`` files.
+
+    Each line holds a canonical name optionally followed by ``|``-separated aliases
+    (other spellings, Hindi names); ``#`` starts a comment. The file stem is the entity
+    type, e.g. ``person.txt`` → ``PERSON``.
+    """
+
+    def __init__(self, entries: Sequence[GazetteerEntry]) -> None:
+        self.entries = list(entries)
+
+    @classmethod
+    def from_path(cls, path: Union[str, Path]) -> "Gazetteer":
+        entries: List[GazetteerEntry] = []
+        for file in gazetteer_files(path):
+            entity_type = file.stem.upper()
+            for line in file.read_text(encoding="utf-8").splitlines():
+                names = [name.strip() for name in line.split("#", 1)[0].split("|")]
+                names = [name for name in names if name]
+                if names:
+                    entries.extend(GazetteerEntry(name, names[0], entity_type) for name in names)
+        return cls(entries)
+
+    def compile(self) -> AhoCorasickAutomaton:
+        return AhoCorasickAutomaton(self.entries)
+
+
+def gazetteer_files(path: Union[str, Path]) -> List[Path]:
+    root = Path(path)
+    if root.is_file():
+        return [root]
+    if not root.is_dir():
+        return []
+    return sorted(file for file in root.iterdir() if file.suffix == GAZETTEER_SUFFIX and file.is_file())
+
+
+class GazetteerEntityExtractor:
+    """Find gazetteer entities in text with a cached automaton that follows file changes.
+
+    The automaton is compiled on first use and shared by all threads. At most every
+    ``check_interval_seconds`` the gazetteer files are stat'ed; when one was added, removed
+    or modified, a new automaton is built and swapped in, while in-flight extractions finish
+    on the old one. ``reload`` forces a rebuild.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        check_interval_seconds: float = 30.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._path = Path(path)
+        self._check_interval = check_interval_seconds
+        self._logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._automaton: Optional[AhoCorasickAutomaton] = None
+        self._signature: Tuple[Tuple[str, float, int], ...] = ()
+        self._checked_at = 0.0
+
+    @property
+    def automaton(self) -> AhoCorasickAutomaton:
+        automaton = self._automaton
+        if automaton is None or time.monotonic() - self._checked_at >= self._check_interval:
+            automaton = self._refresh(force=False)
+        return automaton
+
+    def reload(self) -> AhoCorasickAutomaton:
+        return self._refresh(force=True)
+
+    def find(self, text: str) -> List[GazetteerMatch]:
+        return self.automaton.find(text) if text else []
+
+    def extract(self, text: str) -> List[Entity]:
+        return self.extract_chunks([SemanticChunk(id="text", text=text)])
+
+    def extract_chunks(self, chunks: Sequence[SemanticChunk]) -> List[Entity]:
+        """One entity per canonical name, in order of first mention, with mention counts."""
+        automaton = self.automaton
+        found: Dict[Tuple[str, str], Entity] = {}
+        for chunk in chunks:
+            for match in automaton.find(chunk.text or ""):
+                key = (match.entry.entity_type, match.entry.canonical)
+                entity = found.get(key)
+                if entity is None:
+                    entity = Entity(
+                        name=match.entry.canonical,
+                        type=match.entry.entity_type,
+                        confidence=1.0,
+                        metadata={"source": "gazetteer", "mentions": 0, "aliases": [], "chunk_ids": []},
+                    )
+                    found[key] = entity
+                metadata = entity.metadata
+                metadata["mentions"] += 1
+                if match.entry.surface not in metadata["aliases"]:
+                    metadata["aliases"].append(match.entry.surface)
+                if chunk.id not in metadata["chunk_ids"]:
+                    metadata["chunk_ids"].append(chunk.id)
+        return list(found.values())
+
+    def _refresh(self, *, force: bool) -> AhoCorasickAutomaton:
+        with self._lock:
+            self._checked_at = time.monotonic()
+            signature = self._file_signature()
+            if self._automaton is not None and not force and signature == self._signature:
+                return self._automaton
+            started = time.perf_counter()
+            try:
+                automaton = Gazetteer.from_path(self._path).compile()
+            except (OSError, UnicodeDecodeError) as e:
+                if self._automaton is not None:
+                    self._logger.warning("Gazetteer: keeping previous automaton, reload of %s failed: %s", self._path, e)
+                    return self._automaton
+                self._logger.warning("Gazetteer: could not load %s: %s", self._path, e)
+                automaton = AhoCorasickAutomaton(())
+            self._logger.info(
+                "Gazetteer: compiled %d names from %s in %.1f ms",
+                len(automaton),
+                self._path,
+                (time.perf_counter() - started) * 1000,
+            )
+            self._automaton = automaton
+            self._signature = signature
+            return automaton
+
+    def _file_signature(self) -> Tuple[Tuple[str, float, int], ...]:
+        signature = []
+        for file in gazetteer_files(self._path):
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            signature.append((str(file), stat.st_mtime, stat.st_size))
+        return tuple(signature)
+
+
+class GazetteerParserAdapter:
+    """``ParserAdapter`` that chunks OCR text and tags gazetteer entities in the same pass."""
+
+    def __init__(self, extractor: GazetteerEntityExtractor, chunker: Optional[SemanticChunker] = None) -> None:
+        self._extractor = extractor
+        self._chunker = chunker or SemanticChunker()
+
+    def supports(self, extraction: OCRExtraction) -> bool:
+        return bool(extraction.text)
+
+    def parse(self, extraction: OCRExtraction) -> ParserResult:
+        chunks = self._chunker.chunk(
+            extraction.text,
+            id_prefix=extraction.attachment.id,
+            source_id=extraction.attachment.id,
+            metadata=extraction.metadata or {},
+        )
+        return ParserResult(chunks=chunks, entities=self._extractor.extract_chunks(chunks))
+
+
+def _normalize(text: str) -> str:
+    return text.lower()
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    if index < 0 or index >= len(text):
+        return True
+    return unicodedata.category(text[index])[0] not in "LMN"
+
+
+__all__ = [
+    "AhoCorasickAutomaton",
+    "Gazetteer",
+    "GazetteerEntityExtractor",
+    "GazetteerEntry",
+    "GazetteerMatch",
+    "GazetteerParserAdapter",
+    "gazetteer_files",
+]
@@ -0,0 +1,179 @@
+"""Publish rendered AMP HTML: safe minification plus precompressed gzip/brotli S3 objects."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+try:  # Brotli is optional; without it only the identity and gzip objects are stored
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+HTML_CONTENT_TYPE = "text/html; charset=utf-8"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# One scan over the document: comments, raw-text elements (kept whole), tags, whitespace runs.
+# ``noscript`` is raw because AMP's <noscript><style amp-boilerplate> must stay byte-exact.
+_HTML_TOKEN = re.compile(
+    r"(?P<comment><!--.*?-->)"
+    r"|(?P<raw><(?P<raw_name>script|style|pre|textarea|noscript)\b(?P<raw_attrs>(?:[^>\"']|\"[^\"]*\"|'[^']*')*)>"
+    r"(?P<raw_body>.*?)</(?P=raw_name)\s*>)"
+    r"|(?P<tag></?[A-Za-z!](?:[^>\"']|\"[^\"]*\"|'[^']*')*>)"
+    r"|(?P<space>\s+)",
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_PART = re.compile(r"\"[^\"]*\"|'[^']*'|\s+")
+_TAG_END_SPACE = re.compile(r"\s+(/?>)$")
+_AMP_CUSTOM = re.compile(r"\samp-custom\b", re.IGNORECASE)
+
+# CSS: strings and comments are recognised first so nothing inside a string is touched
+_CSS_TOKEN = re.compile(r"\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|/\*.*?\*/|[^\"'/]+|.", re.DOTALL)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCTUATION_SPACE = re.compile(r" ?([{};,]) ?")
+
+
+@dataclass(frozen=True)
+class EncodedVariant:
+    """One stored encoding of a published document."""
+
+    key: str
+    body: bytes
+    content_encoding: Optional[str] = None
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and redundant whitespace; strings are kept verbatim.
+
+    Only whitespace around ``{ } ; ,`` and after ``:`` is removed, never before ``:``
+    (``a :hover`` and ``a:hover`` are different selectors) or around ``+``/``-``
+    (required inside ``calc()``).
+    """
+    parts: List[str] = []
+    pending: List[str] = []
+
+    def flush() -> None:
+        if pending:
+            text = _CSS_SPACE.sub(" ", "".join(pending))
+            text = _CSS_PUNCTUATION_SPACE.sub(r"\1", text).replace(": ", ":").replace(";}", "}")
+            parts.append(text)
+            pending.clear()
+
+    for match in _CSS_TOKEN.finditer(css):
+        token = match.group(0)
+        if token[0] in "\"'" and len(token) > 1 and token[-1] == token[0]:
+            flush()
+            parts.append(token)
+        elif token.startswith("/*") and token.endswith("*/") and len(token) >= 4:
+            pending.append(" ")
+        else:
+            pending.append(token)
+    flush()
+    return "".join(parts).strip()
+
+
+def _minify_tag(tag: str) -> str:
+    tag = _TAG_PART.sub(lambda match: match.group(0) if match.group(0)[0] in "\"'" else " ", tag)
+    return _TAG_END_SPACE.sub(r"\1", tag)
+
+
+def _minify_token(match: "re.Match[str]") -> str:
+    if match.group("comment") is not None:
+        return ""
+    if match.group("raw") is not None:
+        name = match.group("raw_name")
+        attrs = match.group("raw_attrs")
+        body = match.group("raw_body")
+        if name.lower() == "style" and _AMP_CUSTOM.search(attrs):
+            body = minify_css(body)
+        return f"{_minify_tag(f'<{name}{attrs}>')}{body}</{name}>"
+    if match.group("tag") is not None:
+        return _minify_tag(match.group("tag"))
+    return "\n" if "\n" in match.group("space") else " "
+
+
+def minify_amp_html(html: str) -> str:
+    """Remove comments and collapse whitespace without changing how the page renders.
+
+    Text whitespace runs become one space (or one newline), tags lose the whitespace
+    between attributes, and ``<style amp-custom>`` is CSS-minified. ``script``,
+    ``noscript`` (the AMP boilerplate), other ``style``, ``pre`` and ``textarea``
+    contents are left exactly as they are, as are quoted attribute values.
+    """
+    return _HTML_TOKEN.sub(_minify_token, html).strip()
+
+
+def content_hashed_key(key: str, body: bytes) -> str:
+    """``stories/abc.html`` -> ``stories/abc.<sha256[:12]>.html``; the name changes with the bytes."""
+    digest = hashlib.sha256(body).hexdigest()[:12]
+    directory, _, filename = key.rpartition("/")
+    stem, dot, extension = filename.rpartition(".")
+    hashed = f"{stem}.{digest}.{extension}" if dot else f"{filename}.{digest}"
+    return f"{directory}/{hashed}" if directory else hashed
+
+
+def encode_variants(key: str, body: bytes) -> List[EncodedVariant]:
+    """Identity, gzip (``key.gz``) and, when Brotli is installed, brotli (``key.br``) objects."""
+    # mtime=0 keeps the gzip bytes (and so the S3 ETag) stable across re-publishes
+    variants = [EncodedVariant(key, body), EncodedVariant(f"{key}.gz", gzip.compress(body, compresslevel=9, mtime=0), "gzip")]
+    if brotli is not None:
+        variants.append(EncodedVariant(f"{key}.br", brotli.compress(body, mode=brotli.MODE_TEXT, quality=11), "br"))
+    else:
+        logger.debug("brotli not installed; publishing %s without a .br variant", key)
+    return variants
+
+
+def publish_html(
+    s3_client: Any,
+    bucket: str,
+    key: str,
+    html: str,
+    *,
+    minify: bool = True,
+    content_hashed: bool = False,
+    max_age_seconds: int = 300,
+) -> str:
+    """Upload ``html`` and its precompressed variants; return the key of the identity object.
+
+    Every variant carries the HTML content type and its ``Content-Encoding``, so the CDN
+    can serve ``key.br``/``key.gz`` to readers whose ``Accept-Encoding`` allows it. With
+    ``content_hashed`` the key embeds a digest of the bytes, so the objects never change
+    and are cached as immutable; otherwise they are cached for ``max_age_seconds``.
+    """
+    body = (minify_amp_html(html) if minify else html).encode("utf-8")
+    if content_hashed:
+        key = content_hashed_key(key, body)
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        cache_control = f"public, max-age={max_age_seconds}"
+
+    for variant in encode_variants(key, body):
+        extra = {"ContentEncoding": variant.content_encoding} if variant.content_encoding else {}
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=variant.key,
+            Body=variant.body,
+            ContentType=HTML_CONTENT_TYPE,
+            CacheControl=cache_control,
+            **extra,
+        )
+    logger.debug("Published s3://%s/%s (%d bytes, %s)", bucket, key, len(body), cache_control)
+    return key
+
+
+__all__ = [
+    "EncodedVariant",
+    "HTML_CONTENT_TYPE",
+    "IMMUTABLE_CACHE_CONTROL",
+    "content_hashed_key",
+    "encode_variants",
+    "minify_amp_html",
+    "minify_css",
+    "publish_html",
+]
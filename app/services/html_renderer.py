@@ -3,48 +3,147 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import logging
-import re
+import threading
+import time
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 from uuid import UUID
 
 import httpx
 from pydantic import HttpUrl
 
 from app.domain.dto import ImageAsset, Mode, SlideBlock, SlideDeck, StoryRecord, VoiceAsset
+from app.services.cache import CacheStats
+from app.services.html_publishing import publish_html
+from app.services.html_templates import SLIDES_MARKER, CompiledTemplate, CompiledTemplateCache, LoadedTemplate
+from app.services.s3_clients import get_s3_client
+from app.services.sanitization import clean_markdown, cleanup_urls
 from app.services.template_slide_generators import get_slide_generator
 
 
+@dataclass
+class _CachedTemplate:
+    template: LoadedTemplate
+    # (mtime_ns, size) for files, (ETag, Last-Modified) for URLs, the object ETag for S3
+    validator: Any
+    checked_at: float
+
+
 class TemplateLoader:
-    """Load HTML templates from file system, S3, or URL."""
+    """Load HTML templates from file system, S3, or URL, with a cache keyed by resolved source.
+
+    File templates are re-read only when their mtime or size changes (one ``stat`` per
+    load). URL and S3 templates are served from memory for ``max_age_seconds``; after that
+    they are revalidated with ``If-None-Match`` (and ``If-Modified-Since`` for URLs), so an
+    unchanged template costs a 304 instead of a download. If revalidation fails, the cached
+    copy is served and the next load retries. ``invalidate`` drops entries explicitly and
+    ``cache_stats`` reports hits, full loads (misses) and 304 revalidations.
+    """
 
     def __init__(
         self,
         template_base_path: Optional[Path] = None,
         logger: Optional[logging.Logger] = None,
+        *,
+        max_age_seconds: float = 300.0,
+        http_client: Optional[httpx.Client] = None,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
         self._template_base_path = template_base_path or Path(__file__).parent.parent / "news_template"
         self._logger = logger or logging.getLogger(__name__)
+        self._max_age_seconds = max_age_seconds
+        self._http_client = http_client
+        self._clock = clock
+        self._cache: Dict[str, _CachedTemplate] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
 
     def load(self, template_key: str, mode: Mode, source: str = "file") -> str:
         """Load template from file system, S3, or URL."""
+        return self.fetch(template_key, mode, source).text
+
+    def fetch(self, template_key: str, mode: Mode, source: str = "file") -> LoadedTemplate:
+        """Template text with its resolved source and a version that changes with the content."""
         # If source is explicitly "file", always load from local file system
         # (even if template_key looks like a URL - extract name and load locally)
         if source == "file":
-            return self._load_from_file(template_key, mode)
-        
+            return self._fetch_file(self._resolve_file_path(template_key, mode))
+
         # Auto-detect source only if not explicitly "file"
         if template_key.startswith(("http://", "https://")):
-            return self._load_from_url(template_key)
+            return self._fetch_remote(template_key, self._load_from_url)
         elif template_key.startswith("s3://"):
-            return self._load_from_s3(template_key)
+            return self._fetch_remote(template_key, self._load_from_s3)
         else:
-            return self._load_from_file(template_key, mode)
+            return self._fetch_file(self._resolve_file_path(template_key, mode))
+
+    def invalidate(self, template_key: Optional[str] = None, mode: Optional[Mode] = None, source: str = "file") -> None:
+        """Forget one cached template (as addressed by ``load``), or all of them without arguments."""
+        with self._lock:
+            if template_key is None:
+                self._cache.clear()
+                return
+            if source != "file" and template_key.startswith(("http://", "https://", "s3://")):
+                key = template_key
+            else:
+                key = str(self._resolve_file_path(template_key, mode or Mode.NEWS))
+            self._cache.pop(key, None)
+
+    def cache_stats(self) -> CacheStats:
+        with self._lock:
+            return replace(self._stats, size=len(self._cache))
+
+    def _fetch_file(self, template_path: Path) -> LoadedTemplate:
+        key = str(template_path)
+        stat = template_path.stat()
+        validator = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached.validator == validator:
+                self._stats.hits += 1
+                return cached.template
+
+        self._logger.info("Loading template from file: %s", template_path)
+        template = LoadedTemplate(key, template_path.read_text(encoding="utf-8"), f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+        with self._lock:
+            self._stats.misses += 1
+            self._cache[key] = _CachedTemplate(template, validator, self._clock())
+        return template
 
-    def _load_from_file(self, template_key: str, mode: Mode) -> str:
-        """Load template from file system."""
+    def _fetch_remote(self, uri: str, download: Callable[[str, Any], Optional[Tuple[str, Any]]]) -> LoadedTemplate:
+        now = self._clock()
+        with self._lock:
+            cached = self._cache.get(uri)
+            if cached is not None and now - cached.checked_at < self._max_age_seconds:
+                self._stats.hits += 1
+                return cached.template
+
+        try:
+            result = download(uri, cached.validator if cached is not None else None)
+        except Exception as e:
+            if cached is None:
+                raise
+            self._logger.warning("Template revalidation failed for %s, serving cached copy: %s", uri, e)
+            return cached.template
+
+        with self._lock:
+            if result is None:
+                # 304: content unchanged, restart the max-age window
+                self._stats.revalidations += 1
+                cached.checked_at = now
+                return cached.template
+            text, validator = result
+            template = LoadedTemplate(uri, text, _content_version(text, validator))
+            self._stats.misses += 1
+            self._cache[uri] = _CachedTemplate(template, validator, now)
+            return template
+
+    def _resolve_file_path(self, template_key: str, mode: Mode) -> Path:
+        """Locate a template file on the file system."""
         # If template_key is a URL, extract template name
         original_key = template_key
         if template_key.startswith(("http://", "https://")):
@@ -69,37 +168,54 @@ class TemplateLoader:
             template_path = mode_dir / template_key
             if not template_path.exists():
                 raise FileNotFoundError(f"Template not found: {template_path} (mode: {mode.value})")
-
-        self._logger.info("Loading template from file: %s (mode: %s)", template_path, mode.value)
-        return template_path.read_text(encoding="utf-8")
-
-    def _load_from_url(self, url: str) -> str:
-        """Load template from HTTP/HTTPS URL."""
+        return template_path
+
+    def _load_from_url(self, url: str, validator: Any = None) -> Optional[Tuple[str, Any]]:
+        """Load template from HTTP/HTTPS URL; None when the server answers 304 Not Modified."""
+        headers = {}
+        if validator:
+            etag, last_modified = validator
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
         try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(url)
-                response.raise_for_status()
-                self._logger.info("Loaded template from URL: %s", url)
-                return response.text
+            if self._http_client is not None:
+                response = self._http_client.get(url, headers=headers)
+            else:
+                with httpx.Client(timeout=30.0) as client:
+                    response = client.get(url, headers=headers)
+            if response.status_code == 304 and validator:
+                return None
+            response.raise_for_status()
+            self._logger.info("Loaded template from URL: %s", url)
+            return response.text, (response.headers.get("etag"), response.headers.get("last-modified"))
         except Exception as e:
             self._logger.error("Failed to load template from URL %s: %s", url, e)
             raise
 
-    def _load_from_s3(self, s3_uri: str) -> str:
-        """Load template from S3 (requires boto3)."""
+    def _load_from_s3(self, s3_uri: str, validator: Any = None) -> Optional[Tuple[str, Any]]:
+        """Load template from S3 (requires boto3); None when the object ETag still matches."""
         try:
-            import boto3
             from urllib.parse import urlparse
 
             parsed = urlparse(s3_uri)
             bucket = parsed.netloc
             key = parsed.path.lstrip("/")
 
-            s3_client = boto3.client("s3")
-            response = s3_client.get_object(Bucket=bucket, Key=key)
+            s3_client = get_s3_client()
+            request = {"Bucket": bucket, "Key": key}
+            if validator:
+                request["IfNoneMatch"] = validator
+            try:
+                response = s3_client.get_object(**request)
+            except Exception as e:
+                if validator and _is_not_modified(e):
+                    return None
+                raise
             content = response["Body"].read().decode("utf-8")
             self._logger.info("Loaded template from S3: %s", s3_uri)
-            return content
+            return content, response.get("ETag")
         except ImportError:
             self._logger.error("boto3 not installed, cannot load from S3")
             raise
@@ -108,6 +224,21 @@ class TemplateLoader:
             raise
 
 
+def _is_not_modified(error: Exception) -> bool:
+    # botocore raises ClientError for the 304 answer to a conditional GetObject
+    response = getattr(error, "response", None) or {}
+    code = str(response.get("Error", {}).get("Code", ""))
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in ("304", "NotModified") or status == 304
+
+
+def _content_version(text: str, validator: Any) -> str:
+    etag = validator[0] if isinstance(validator, tuple) else validator
+    if etag:
+        return str(etag).strip('"')
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
 class PlaceholderMapper:
     """Map StoryRecord data to HTML template placeholders."""
 
@@ -393,12 +524,14 @@ class HTMLTemplateRenderer:
         cdn_prefix_media: str = "https://media.suvichaar.org/",
         aws_bucket: str = "suvichaarapp",
         logger: Optional[logging.Logger] = None,
+        compiled_templates: Optional[CompiledTemplateCache] = None,
     ) -> None:
         self._loader = template_loader or TemplateLoader(template_base_path=template_base_path)
         self._mapper = placeholder_mapper or PlaceholderMapper(
             cdn_prefix_media=cdn_prefix_media, aws_bucket=aws_bucket
         )
         self._logger = logger or logging.getLogger(__name__)
+        self._templates = compiled_templates or CompiledTemplateCache()
 
     def render(
         self,
@@ -408,50 +541,29 @@ class HTMLTemplateRenderer:
         image_source: Optional[str] = None,
     ) -> str:
         """Render HTML template from StoryRecord."""
-        # 1. Load template
-        template_html = self._loader.load(template_key, record.mode, template_source)
+        # 1. Load the compiled template (parsed once per template version)
+        template = self._compiled_template(template_key, record.mode, template_source)
 
         # 2. Map StoryRecord to placeholders (pass image_source for proper image handling)
         placeholders = self._mapper.map(record, image_source=image_source)
 
-        # 3. Replace basic placeholders
-        filled_html = self._replace_placeholders(template_html, placeholders)
-
-        # 4. Generate slides dynamically (pass template_key and image_source for template-specific generation)
+        # 3. Generate slides dynamically (pass template_key and image_source for template-specific generation)
         slides_html = self._generate_all_slides(record, template_key, placeholders, image_source=image_source)
 
-        # 5. Insert slides at <!--INSERT_SLIDES_HERE-->
-        filled_html = filled_html.replace("<!--INSERT_SLIDES_HERE-->", slides_html)
+        # 4. Fill placeholders and insert slides at <!--INSERT_SLIDES_HERE--> in one pass
+        filled_html = template.render(placeholders, transform=clean_markdown, raw={SLIDES_MARKER: slides_html})
 
-        # 6. Cleanup (remove stray curly braces from URLs)
-        filled_html = self._cleanup_urls(filled_html)
+        # 5. Cleanup (remove stray curly braces from URLs)
+        filled_html = cleanup_urls(filled_html)
 
         return filled_html
 
-    def _replace_placeholders(self, template: str, data: dict[str, str]) -> str:
-        """Replace {{key}} placeholders with values."""
-        for key, value in data.items():
-            # Clean markdown from values before replacing
-            cleaned_value = self._clean_markdown(str(value))
-            template = template.replace(f"{{{{{key}}}}}", cleaned_value)
-            template = template.replace(f"{{{{{key}|safe}}}}", cleaned_value)
-        return template
+    def template_version(self, template_key: str, mode: Mode, template_source: str = "file") -> str:
+        """Content version of the template ``render`` would use now (served from the loader cache)."""
+        return self._loader.fetch(template_key, mode, template_source).version
 
-    def _clean_markdown(self, text: str) -> str:
-        """Remove markdown formatting from text."""
-        if not text:
-            return ""
-        # Remove **bold**
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-        # Remove *italic*
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)
-        # Remove # headers
-        text = re.sub(r'#+\s*', '', text)
-        # Remove `code blocks`
-        text = re.sub(r'`([^`]+)`', r'\1', text)
-        # Remove [links](url)
-        text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-        return text.strip()
+    def _compiled_template(self, template_key: str, mode: Mode, template_source: str) -> CompiledTemplate:
+        return self._templates.get(self._loader.fetch(template_key, mode, template_source))
 
     def _generate_all_slides(
         self, 
@@ -497,7 +609,7 @@ class HTMLTemplateRenderer:
 
         for idx, slide_block in enumerate(slides_to_generate, start=1):
             # Clean markdown from slide text
-            clean_text = self._clean_markdown(slide_block.text or "")
+            clean_text = clean_markdown(slide_block.text)
             
             # Get image for this slide
             # Priority:
@@ -559,31 +671,6 @@ class HTMLTemplateRenderer:
 
         return "\n".join(slides)
 
-    def _cleanup_urls(self, html: str) -> str:
-        """Remove stray curly braces from URLs."""
-        # Remove curly braces around URLs in various contexts
-        html = re.sub(r'\{(\s*https?://[^\s"\'<>}]+)\}', r"\1", html)
-        html = re.sub(r'(\s*https?://[^\s"\'<>}]+)\}', r"\1", html)
-        html = re.sub(r'\{(\s*https?://[^\s"\'<>}]+)', r"\1", html)
-
-        # Clean up in attribute values
-        html = re.sub(
-            r'(href|src|content|url|poster-portrait-src|publisher-logo-src)="\{([^"]+)\}"',
-            r'\1="\2"',
-            html,
-        )
-        html = re.sub(
-            r"(href|src|content|url|poster-portrait-src|publisher-logo-src)='\{([^']+)\}'",
-            r"\1='\2'",
-            html,
-        )
-
-        # Clean up JSON-LD script content
-        html = re.sub(r'"\{([^"]+)\}"', r'"\1"', html)
-        html = re.sub(r':\s*"\{([^"]+)\}"', r': "\1"', html)
-
-        return html
-
     def save_html_to_file(
         self,
         html_content: str,
@@ -627,30 +714,35 @@ class HTMLTemplateRenderer:
         aws_access_key: Optional[str] = None,
         aws_secret_key: Optional[str] = None,
         aws_region: Optional[str] = None,
+        *,
+        minify: bool = True,
+        content_hash: bool = False,
+        max_age_seconds: int = 300,
     ) -> str:
-        """Upload rendered HTML to S3 and return CDN URL."""
+        """Upload rendered HTML to S3 and return CDN URL.
+
+        The page is minified and stored with ``.gz``/``.br`` precompressed variants (see
+        ``publish_html``). ``content_hash`` puts a digest of the page in the key and marks
+        the objects immutable; otherwise they are cached for ``max_age_seconds``.
+        """
         try:
-            import boto3
-
-            s3_client = None
-            if aws_access_key and aws_secret_key:
-                s3_client = boto3.client(
-                    "s3",
-                    aws_access_key_id=aws_access_key,
-                    aws_secret_access_key=aws_secret_key,
-                    region_name=aws_region or "us-east-1",
-                )
-            else:
-                s3_client = boto3.client("s3", region_name=aws_region or "us-east-1")
+            s3_client = get_s3_client(
+                region=aws_region or "us-east-1",
+                access_key=aws_access_key,
+                secret_key=aws_secret_key,
+            )
 
             html_filename = f"{story_id}.html"
             s3_key = f"{prefix.rstrip('/')}/{html_filename}" if prefix else html_filename
 
-            s3_client.put_object(
-                Bucket=bucket,
-                Key=s3_key,
-                Body=html_content.encode("utf-8"),
-                ContentType="text/html; charset=utf-8",
+            s3_key = publish_html(
+                s3_client,
+                bucket,
+                s3_key,
+                html_content,
+                minify=minify,
+                content_hashed=content_hash,
+                max_age_seconds=max_age_seconds,
             )
 
             self._logger.info("Uploaded HTML to s3://%s/%s", bucket, s3_key)
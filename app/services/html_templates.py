@@ -0,0 +1,134 @@
+"""Compiled HTML templates: placeholders resolved in one pass instead of per-key ``str.replace``."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from app.services.cache import CacheStats, TTLCache
+
+SLIDES_MARKER = "<!--INSERT_SLIDES_HERE-->"
+
+# ``{{key}}`` or ``{{key|filter|...}}``; keys and filters never contain braces or pipes
+_PLACEHOLDER = re.compile(r"\{\{([^{}|]+)((?:\|[^{}|]+)*)\}\}")
+
+# Filters applied after the value transform. ``safe`` marks values as pre-escaped HTML;
+# values are not escaped by default either, so it is accepted and does nothing.
+DEFAULT_FILTERS: Dict[str, Callable[[str], str]] = {
+    "safe": lambda value: value,
+}
+
+
+class CompiledTemplate:
+    """A template parsed once into literal text and slots, rendered with a single join.
+
+    ``{{key}}`` and ``{{key|filter}}`` slots take the (transformed) value for ``key``; a
+    slot whose key is not supplied, or that names an unknown filter, renders as its
+    original text, exactly like the per-key replacement it replaces. Raw markers (by
+    default ``<!--INSERT_SLIDES_HERE-->``) are filled verbatim from ``raw``. Substituted
+    values are never scanned again, so a value containing ``{{...}}`` stays as written.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        *,
+        raw_markers: Tuple[str, ...] = (SLIDES_MARKER,),
+        filters: Optional[Mapping[str, Callable[[str], str]]] = None,
+    ) -> None:
+        self.source = source
+        self._filters = dict(DEFAULT_FILTERS if filters is None else filters)
+        # Parallel lists: literal text, then the slot that follows it (kind, name, filters, original)
+        self._literals: List[str] = []
+        self._slots: List[Tuple[str, str, Tuple[str, ...], str]] = []
+        self._compile(source, raw_markers)
+        self.placeholders = frozenset(name for kind, name, _, _ in self._slots if kind == "value")
+
+    def _compile(self, source: str, raw_markers: Tuple[str, ...]) -> None:
+        alternatives = [_PLACEHOLDER.pattern] + [f"({re.escape(marker)})" for marker in raw_markers]
+        pattern = re.compile("|".join(alternatives))
+        position = 0
+        for match in pattern.finditer(source):
+            self._literals.append(source[position : match.start()])
+            if match.group(1) is not None:
+                filters = tuple(name for name in match.group(2).split("|") if name)
+                if all(name in self._filters for name in filters):
+                    self._slots.append(("value", match.group(1), filters, match.group(0)))
+                else:
+                    self._slots.append(("literal", "", (), match.group(0)))
+            else:
+                self._slots.append(("raw", match.group(0), (), match.group(0)))
+            position = match.end()
+        self._literals.append(source[position:])
+
+    def render(
+        self,
+        values: Mapping[str, object],
+        *,
+        transform: Optional[Callable[[str], str]] = None,
+        raw: Optional[Mapping[str, str]] = None,
+    ) -> str:
+        """Fill the slots; ``transform`` runs once per distinct key used by the template."""
+        raw = raw or {}
+        prepared: Dict[str, str] = {}
+        parts: List[str] = []
+        literals = self._literals
+        for index, (kind, name, filters, original) in enumerate(self._slots):
+            parts.append(literals[index])
+            if kind == "value":
+                value = prepared.get(name)
+                if value is None:
+                    if name not in values:
+                        parts.append(original)
+                        continue
+                    value = str(values[name])
+                    if transform is not None:
+                        value = transform(value)
+                    prepared[name] = value
+                for filter_name in filters:
+                    value = self._filters[filter_name](value)
+                parts.append(value)
+            elif kind == "raw":
+                parts.append(raw.get(name, original))
+            else:
+                parts.append(original)
+        parts.append(literals[-1])
+        return "".join(parts)
+
+
+@dataclass(frozen=True)
+class LoadedTemplate:
+    """Template text plus where it came from and a version that changes with its content."""
+
+    source: str
+    text: str
+    version: str
+
+
+class CompiledTemplateCache:
+    """Compiled templates keyed by (source, version), so each template version is parsed once.
+
+    ``max_entries`` bounds how many versions stay compiled; an edited template simply gets
+    a new key and the old version ages out.
+    """
+
+    def __init__(self, *, max_entries: int = 64) -> None:
+        self._cache: TTLCache[Tuple[str, str], CompiledTemplate] = TTLCache(max_entries=max_entries, ttl_seconds=0)
+
+    def get(self, template: LoadedTemplate) -> CompiledTemplate:
+        key = (template.source, template.version)
+        compiled = self._cache.get(key)
+        if compiled is None:
+            compiled = CompiledTemplate(template.text)
+            self._cache.put(key, compiled)
+        return compiled
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
+
+
+__all__ = ["DEFAULT_FILTERS", "SLIDES_MARKER", "CompiledTemplate", "CompiledTemplateCache", "LoadedTemplate"]
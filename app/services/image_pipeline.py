@@ -12,6 +12,7 @@ import httpx
 
 from app.domain.dto import ImageAsset, IntakePayload, SlideDeck
 from app.domain.interfaces import ImageAssetPipeline
+from app.services.s3_clients import get_s3_client
 
 
 @dataclass
@@ -430,7 +431,6 @@ class UserUploadProvider:
     def _load_from_s3(self, s3_uri: str, logger: logging.Logger) -> Optional[bytes]:
         """Load image from S3 URI (s3://bucket/key)."""
         try:
-            import boto3
             from urllib.parse import urlparse
             
             parsed = urlparse(s3_uri)
@@ -438,7 +438,7 @@ class UserUploadProvider:
             key = parsed.path.lstrip("/")
             
             # Try to use default AWS credentials (IAM role, env vars, etc.)
-            s3_client = boto3.client("s3")
+            s3_client = get_s3_client()
             response = s3_client.get_object(Bucket=bucket, Key=key)
             image_bytes = response["Body"].read()
             logger.info("Loaded image from S3: %s (%d bytes)", s3_uri, len(image_bytes))
@@ -554,17 +554,12 @@ class S3ImageStorageService:
         """Lazy-load boto3 S3 client."""
         if self._s3_client is None:
             try:
-                import boto3
-                if self._aws_access_key and self._aws_secret_key:
-                    self._s3_client = boto3.client(
-                        "s3",
-                        aws_access_key_id=self._aws_access_key,
-                        aws_secret_access_key=self._aws_secret_key,
-                        region_name=self._aws_region or "us-east-1",
-                    )
-                else:
-                    # Use default credentials (IAM role, env vars, etc.)
-                    self._s3_client = boto3.client("s3", region_name=self._aws_region or "us-east-1")
+                # Without explicit keys the default credentials (IAM role, env vars, etc.) apply
+                self._s3_client = get_s3_client(
+                    region=self._aws_region or "us-east-1",
+                    access_key=self._aws_access_key,
+                    secret_key=self._aws_secret_key,
+                )
             except ImportError:
                 self._logger.warning("boto3 not installed, S3 uploads will be simulated")
                 return None
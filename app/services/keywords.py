@@ -0,0 +1,290 @@
+"""TF-IDF keyword and key-phrase extraction over a persistent, incrementally updated corpus model."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from app.services.text_segmentation import words
+
+try:  # fcntl is POSIX-only; elsewhere concurrent writers are not serialized
+    import fcntl
+except ImportError:  # pragma: no cover - depends on platform
+    fcntl = None
+
+try:  # NumPy is optional; the pure-Python path ranks identically
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+STOPWORDS = frozenset(
+    # English
+    "a about after again against all also an and any are as at be because been before being between both "
+    "but by can could did do does during each few for from further had has have having he her here hers "
+    "him his how i if in into is it its just may me more most my new no nor not now of off on once only or "
+    "other our out over own said same says she should so some such than that the their them then there these "
+    "they this those through to too under until up very was we were what when where which while who whom why "
+    "will with would year years you your "
+    # Hindi
+    "और का की के को कि कर करने किया कहा गया गई था थी थे तो ने पर भी में से है हैं हो होने होगा यह ये वह वे "
+    "एक इस उस इन उन जो जब तक लिए साथ बाद अब कुछ नहीं बहुत रहा रही रहे गए गये".split()
+)
+
+# Phrases never span clause punctuation (including the Devanagari danda)
+_CLAUSE_BREAK = re.compile(r"[.!?;:,()\[\]{}\"“”‘’|।॥\n]+")
+
+
+def segment_terms(text: str) -> List[List[str]]:
+    """Lowercased content words per clause; a stopword splits a clause like punctuation does.
+
+    Tokenization is the shared Latin/Devanagari word splitter, so Hindi words keep their
+    vowel signs. Numbers and single characters are dropped.
+    """
+    segments: List[List[str]] = []
+    for clause in _CLAUSE_BREAK.split(text.lower()):
+        run: List[str] = []
+        for token in words(clause):
+            if token in STOPWORDS or len(token) < 2 or token.isdecimal() or "_" in token:
+                if run:
+                    segments.append(run)
+                run = []
+            else:
+                run.append(token)
+        if run:
+            segments.append(run)
+    return segments
+
+
+class DocumentFrequencyTable:
+    """Document frequencies of terms across all stories seen so far, optionally persisted as JSON.
+
+    ``add_document`` is thread-safe. With a ``path`` the documents added since the last
+    save are merged into the file every ``autosave_every`` documents and on ``save``; the
+    merge runs under an exclusive file lock, so several worker processes can share one
+    ``path`` without losing each other's documents. When the vocabulary exceeds
+    ``max_terms`` the rarest terms are dropped; they would score as unseen anyway.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        *,
+        autosave_every: int = 20,
+        max_terms: int = 200_000,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._path = Path(path) if path else None
+        self._autosave_every = max(1, autosave_every)
+        self._max_terms = max_terms
+        self._logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._df: Counter = Counter()
+        self._documents = 0
+        # Added since the last save; merged into whatever other processes wrote meanwhile
+        self._pending: Counter = Counter()
+        self._pending_documents = 0
+        if self._path is not None and self._path.exists():
+            self._df, self._documents = self._read()
+
+    @property
+    def documents(self) -> int:
+        return self._documents
+
+    def __len__(self) -> int:
+        return len(self._df)
+
+    def frequency(self, term: str) -> int:
+        return self._df.get(term, 0)
+
+    def frequencies(self, terms: Sequence[str]) -> List[int]:
+        df = self._df
+        return [df.get(term, 0) for term in terms]
+
+    def add_document(self, terms: Iterable[str]) -> None:
+        unique = set(terms)
+        if not unique:
+            return
+        with self._lock:
+            self._df.update(unique)
+            self._documents += 1
+            self._pending.update(unique)
+            self._pending_documents += 1
+            if len(self._df) > self._max_terms:
+                self._df = self._pruned(self._df)
+            save = self._path is not None and self._pending_documents >= self._autosave_every
+        if save:
+            self.save()
+
+    def save(self) -> None:
+        """Merge the documents added since the last save into the file and adopt the result."""
+        if self._path is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            pending_documents, self._pending_documents = self._pending_documents, 0
+        if not pending_documents:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._file_lock():
+                df, documents = self._read() if self._path.exists() else (Counter(), 0)
+                df.update(pending)
+                documents += pending_documents
+                if len(df) > self._max_terms:
+                    df = self._pruned(df)
+                payload = json.dumps({"documents": documents, "df": df}, ensure_ascii=False).encode("utf-8")
+                fd, tmp_name = tempfile.mkstemp(dir=self._path.parent, suffix=".tmp")
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(payload)
+                os.replace(tmp_name, self._path)
+        except OSError as e:
+            self._logger.warning("Keyword DF table: failed to write %s: %s", self._path, e)
+            with self._lock:
+                self._pending.update(pending)
+                self._pending_documents += pending_documents
+            return
+        with self._lock:
+            # Documents added while the file was written stay pending for the next save
+            self._df = df + self._pending
+            self._documents = documents + self._pending_documents
+
+    @contextlib.contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:  # pragma: no cover - non-POSIX platforms
+            yield
+            return
+        with open(self._path.with_name(self._path.name + ".lock"), "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read(self) -> Tuple[Counter, int]:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            df = Counter({str(term): int(count) for term, count in data.get("df", {}).items()})
+            return df, int(data.get("documents", 0))
+        except (OSError, ValueError, TypeError) as e:
+            self._logger.warning("Keyword DF table: ignoring unreadable %s: %s", self._path, e)
+            return Counter(), 0
+
+    def _pruned(self, df: Counter) -> Counter:
+        keep = int(self._max_terms * 0.9)
+        return Counter(dict(df.most_common(keep)))
+
+
+class KeywordExtractor:
+    """Rank single words and multi-word phrases of a text by TF-IDF.
+
+    Candidates are content-word runs (see ``segment_terms``) and their n-grams up to
+    ``max_ngram`` words. A phrase competes when it occurs ``min_phrase_count`` times and
+    in at least ``phrase_cohesion`` of the occurrences of its longer sub-phrase.
+    Term frequency is sublinear (1 + log count); IDF comes from the shared
+    ``DocumentFrequencyTable`` (smoothed, so unseen terms get the highest weight).
+    Phrases get ``phrase_boost`` per extra word, and terms inside a higher-ranked phrase
+    are skipped so the list is not repetitive.
+    """
+
+    def __init__(
+        self,
+        df_table: Optional[DocumentFrequencyTable] = None,
+        *,
+        max_ngram: int = 3,
+        min_phrase_count: int = 2,
+        phrase_cohesion: float = 0.5,
+        phrase_boost: float = 0.5,
+    ) -> None:
+        self._df_table = df_table if df_table is not None else DocumentFrequencyTable()
+        self._max_ngram = max(1, max_ngram)
+        self._min_phrase_count = min_phrase_count
+        self._phrase_cohesion = phrase_cohesion
+        self._phrase_boost = phrase_boost
+
+    @property
+    def df_table(self) -> DocumentFrequencyTable:
+        return self._df_table
+
+    def candidates(self, segments: Sequence[Sequence[str]]) -> Counter:
+        counts: Counter = Counter()
+        for run in segments:
+            counts.update(run)
+            for n in range(2, min(self._max_ngram, len(run)) + 1):
+                counts.update(" ".join(run[start : start + n]) for start in range(len(run) - n + 1))
+        return counts
+
+    def score(self, segments: Sequence[Sequence[str]]) -> List[Tuple[str, float]]:
+        """All candidates with their scores, best first."""
+        counts = self.candidates(segments)
+        terms = [term for term, count in counts.items() if " " not in term or self._is_phrase(term, count, counts)]
+        if not terms:
+            return []
+        tf = [counts[term] for term in terms]
+        df = self._df_table.frequencies(terms)
+        lengths = [term.count(" ") for term in terms]
+        documents = self._df_table.documents
+        if np is not None:
+            scores = self._score_numpy(tf, df, lengths, documents)
+        else:
+            scores = self._score_python(tf, df, lengths, documents)
+        return sorted(zip(terms, scores), key=lambda item: (-item[1], item[0]))
+
+    def extract(self, text: str, limit: int = 10) -> List[str]:
+        return self.top(segment_terms(text), limit)
+
+    def top(self, segments: Sequence[Sequence[str]], limit: int = 10) -> List[str]:
+        return self.select(self.score(segments), limit)
+
+    def select(self, ranked: Sequence[Tuple[str, float]], limit: int) -> List[str]:
+        """Best ``limit`` terms; a phrase replaces the shorter terms it contains."""
+        chosen: List[str] = []
+        for term, _ in ranked:
+            if len(chosen) >= limit:
+                break
+            if any(_contains(existing, term) for existing in chosen):
+                continue
+            chosen = [existing for existing in chosen if not _contains(term, existing)]
+            chosen.append(term)
+        return chosen
+
+    def observe(self, segments: Sequence[Sequence[str]]) -> None:
+        """Count one more document (story) in the corpus model."""
+        self._df_table.add_document(self.candidates(segments))
+
+    def _is_phrase(self, term: str, count: int, counts: Counter) -> bool:
+        if count < self._min_phrase_count:
+            return False
+        # Cohesion: the phrase must account for most uses of its longer sub-phrase, otherwise
+        # it is a frequent term plus whatever happened to stand next to it
+        parts = term.split(" ")
+        left, right = " ".join(parts[:-1]), " ".join(parts[1:])
+        return count >= self._phrase_cohesion * max(counts[left], counts[right])
+
+    def _score_numpy(self, tf: List[int], df: List[int], lengths: List[int], documents: int) -> List[float]:
+        tf_arr = np.asarray(tf, dtype=float)
+        df_arr = np.asarray(df, dtype=float)
+        idf = np.log((1.0 + documents) / (1.0 + df_arr)) + 1.0
+        boost = 1.0 + self._phrase_boost * np.asarray(lengths, dtype=float)
+        return ((1.0 + np.log(tf_arr)) * idf * boost).tolist()
+
+    def _score_python(self, tf: List[int], df: List[int], lengths: List[int], documents: int) -> List[float]:
+        return [
+            (1.0 + math.log(count)) * (math.log((1.0 + documents) / (1.0 + freq)) + 1.0) * (1.0 + self._phrase_boost * extra)
+            for count, freq, extra in zip(tf, df, lengths)
+        ]
+
+
+def _contains(phrase: str, term: str) -> bool:
+    return f" {term} " in f" {phrase} "
+
+
+__all__ = ["DocumentFrequencyTable", "KeywordExtractor", "STOPWORDS", "segment_terms"]
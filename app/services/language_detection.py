@@ -2,14 +2,21 @@
 
 from __future__ import annotations
 
+import gc
+import hashlib
+import logging
+import os
+import threading
 from dataclasses import dataclass
-from typing import Any, Callable, Optional, Protocol, Tuple
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
 
 import httpx
 from pydantic import ValidationError
 
-from app.domain.dto import IntakePayload, LanguageMetadata
+from app.domain.dto import DocInsights, IntakePayload, LanguageMetadata
 from app.domain.interfaces import LanguageDetectionService
+from app.services.cache import TTLCache
+from app.services.language_profiles import identify, strip_urls
 
 
 DetectResult = Tuple[str, float]
@@ -22,6 +29,49 @@ class LanguageDetectionStrategy(Protocol):
         """Return a tuple of (language_code, confidence)."""
 
 
+_shared_models: Dict[str, Any] = {}
+_shared_models_lock = threading.Lock()
+
+
+def _fasttext_loader() -> Callable[[str], Any]:
+    try:
+        import fasttext  # type: ignore
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise RuntimeError("fasttext is required for FastTextLanguageDetectionStrategy. Install it via pip.") from exc
+    return fasttext.load_model
+
+
+def load_shared_fasttext_model(model_path: str) -> Any:
+    """Load ``model_path`` at most once per process and hand out the same model object.
+
+    A model loaded before the server forks its workers (see ``preload_fasttext_model``)
+    is inherited by every worker: its pages stay shared copy-on-write instead of each
+    worker reading its own ~130 MB copy of lid.176.bin.
+    """
+    key = os.path.abspath(model_path)
+    model = _shared_models.get(key)
+    if model is not None:
+        return model
+    with _shared_models_lock:
+        model = _shared_models.get(key)
+        if model is None:
+            model = _fasttext_loader()(model_path)
+            _shared_models[key] = model
+        return model
+
+
+def preload_fasttext_model(model_path: str, *, freeze_gc: bool = True) -> Any:
+    """Load the shared model in the parent process, e.g. under ``gunicorn --preload``.
+
+    ``freeze_gc`` moves everything allocated so far into the permanent generation, so
+    the workers' garbage collector does not write to (and thereby copy) inherited pages.
+    """
+    model = load_shared_fasttext_model(model_path)
+    if freeze_gc:
+        gc.freeze()
+    return model
+
+
 class FastTextLanguageDetectionStrategy(LanguageDetectionStrategy):
     """Language detection backed by a FastText model."""
 
@@ -37,36 +87,124 @@ class FastTextLanguageDetectionStrategy(LanguageDetectionStrategy):
         model_path:
             Filesystem path to the FastText `.bin` model.
         loader:
-            Optional callable used to load the model. Defaults to `fasttext.load_model`.
-            Injected for easier testing/mocking.
+            Optional callable used to load the model. Defaults to the process-wide
+            shared model (``load_shared_fasttext_model``). Injected for easier testing/mocking.
         label_prefix:
             Prefix used by FastText labels (defaults to ``__label__``).
         """
 
-        self._model = self._load_model(model_path, loader)
+        self._model = loader(model_path) if loader is not None else load_shared_fasttext_model(model_path)
         self._label_prefix = label_prefix
 
     def detect(self, text: str) -> DetectResult:
-        labels, confidences = self._model.predict(text, k=1)
+        labels, confidences = self._model.predict(self._single_line(text), k=1)
         if not labels:
             return "unknown", 0.0
-        label = labels[0]
+        return self._result(labels[0], confidences[0] if len(confidences) else 0.0)
+
+    def detect_many(self, texts: Sequence[str]) -> List[DetectResult]:
+        """Detect a batch with one ``predict`` call (FastText's native multi-line path)."""
+        if not texts:
+            return []
+        labels, confidences = self._model.predict([self._single_line(text) for text in texts], k=1)
+        results: List[DetectResult] = []
+        for text_labels, text_confidences in zip(labels, confidences):
+            if not len(text_labels):
+                results.append(("unknown", 0.0))
+            else:
+                results.append(self._result(text_labels[0], text_confidences[0] if len(text_confidences) else 0.0))
+        return results
+
+    def _result(self, label: Any, confidence: Any) -> DetectResult:
         if isinstance(label, bytes):
             label = label.decode("utf-8")
         language_code = label.removeprefix(self._label_prefix)
-        confidence = float(confidences[0]) if confidences else 0.0
-        return language_code, max(0.0, min(1.0, confidence))
+        return language_code, max(0.0, min(1.0, float(confidence)))
+
+    @staticmethod
+    def _single_line(text: str) -> str:
+        # predict() rejects newlines: it scores one line at a time
+        return " ".join(text.split())
+
+
+class ScriptProfileLanguageStrategy(LanguageDetectionStrategy):
+    """In-process detection from the Unicode script histogram and character n-gram profiles.
+
+    Decides English vs Hindi (Devanagari or romanized) and single-script languages without
+    a model or network call; confidence is low for short, mixed or unfamiliar text.
+    """
+
+    def __init__(self, *, min_script_share: float = 0.8) -> None:
+        self._min_script_share = min_script_share
+
+    def detect(self, text: str) -> DetectResult:
+        guess = identify(text)
+        if guess is None:
+            return "unknown", 0.0
+        return guess.language, guess.confidence
+
+    def detect_by_script(self, text: str) -> Optional[DetectResult]:
+        """The guess for text written (almost) entirely in one non-Latin script, else None.
 
-    def _load_model(self, model_path: str, loader: Callable[[str], Any] | None) -> Any:
-        if loader is None:
+        Short text in such a script is still unmistakable even when the n-gram confidence
+        is low; short Latin text is not (``"Budget 2024"`` is no more German than English),
+        so it gets no answer here.
+        """
+        guess = identify(text)
+        if guess is None or guess.script == "latin" or guess.language == "unknown":
+            return None
+        if guess.script_share < self._min_script_share:
+            return None
+        return guess.language, guess.confidence
+
+
+class CascadingLanguageDetectionStrategy(LanguageDetectionStrategy):
+    """Try strategies cheapest first and stop at the first confident answer.
+
+    ``stages`` are ``(name, strategy)`` pairs. A stage that raises is recorded and skipped.
+    Weak guesses are not used: when no stage reaches ``min_confidence`` the answer comes
+    from ``fallback`` (e.g. ``ScriptProfileLanguageStrategy.detect_by_script`` for
+    unambiguous non-Latin scripts), or is ``("", 0.0)`` so the caller's default applies.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Tuple[str, LanguageDetectionStrategy]],
+        *,
+        min_confidence: float = 0.7,
+        fallback: Optional[Callable[[str], Optional[DetectResult]]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._stages = list(stages)
+        self._min_confidence = min_confidence
+        self._fallback = fallback
+        self._logger = logger or logging.getLogger(__name__)
+
+    def detect(self, text: str) -> DetectResult:
+        language_code, confidence, _ = self.detect_with_path(text)
+        return language_code, confidence
+
+    def detect_with_path(self, text: str) -> Tuple[str, float, List[str]]:
+        """Detect and also return the decision path, one ``stage:language:confidence`` per stage run."""
+        path: List[str] = []
+        for name, strategy in self._stages:
             try:
-                import fasttext  # type: ignore
-            except ImportError as exc:  # pragma: no cover - depends on environment
-                raise RuntimeError(
-                    "fasttext is required for FastTextLanguageDetectionStrategy. Install it via pip."
-                ) from exc
-            loader = fasttext.load_model
-        return loader(model_path)
+                language_code, confidence = strategy.detect(text)
+            except Exception as exc:
+                self._logger.warning("Language detection stage %s failed: %s", name, exc)
+                path.append(f"{name}:error")
+                continue
+            path.append(f"{name}:{language_code}:{confidence:.2f}")
+            if language_code in ("", "unknown"):
+                continue
+            if confidence >= self._min_confidence:
+                return language_code, confidence, path
+        settled = self._fallback(text) if self._fallback is not None else None
+        if settled is None:
+            path.append("fallback:default")
+            return "", 0.0, path
+        path.append(f"fallback:{settled[0]}:{settled[1]:.2f}")
+        return settled[0], settled[1], path
 
 
 @dataclass
@@ -79,21 +217,73 @@ class AggregatedText:
 
 
 class DefaultLanguageDetectionService(LanguageDetectionService):
-    """Combine user input fields and run detection via the configured strategy."""
+    """Combine user input fields and run detection via the configured strategy.
+
+    ``detect_content`` runs a second pass over a sample of the extracted sources, so
+    URL- or attachment-only submissions get the language of the article rather than
+    of the request. Content results are cached by sample hash.
+    """
 
-    def __init__(self, strategy: LanguageDetectionStrategy, default_language: str = "en") -> None:
+    def __init__(
+        self,
+        strategy: LanguageDetectionStrategy,
+        default_language: str = "en",
+        *,
+        content_cache: Optional[TTLCache] = None,
+        content_sample_chars: int = 1500,
+    ) -> None:
         self._strategy = strategy
         self._default_language = default_language
+        self._content_cache = content_cache if content_cache is not None else TTLCache(max_entries=512, ttl_seconds=3600)
+        self._content_sample_chars = content_sample_chars
 
     def detect(self, payload: IntakePayload) -> LanguageMetadata:
         aggregated = self._aggregate_text(payload)
         if aggregated.is_empty:
             return LanguageMetadata(language_code=self._default_language, confidence=0.0)
-
-        language_code, confidence = self._strategy.detect(aggregated.text)
+        if not strip_urls(aggregated.text).strip():
+            # Only URLs: their letters say nothing about the story language, leave it to detect_content
+            return LanguageMetadata(
+                language_code=self._default_language,
+                confidence=0.0,
+                source_text_preview=self._preview(aggregated.text),
+                detection_path=["request:deferred"],
+            )
+        return self._metadata(aggregated.text, *self._run_strategy(aggregated.text))
+
+    def detect_content(self, insights: DocInsights, requested: LanguageMetadata) -> LanguageMetadata:
+        """Re-detect from the extracted sources; keeps ``requested`` when it is at least as confident."""
+        sample = self._content_sample(insights)
+        if not sample:
+            return requested
+        key = hashlib.sha256(sample.encode("utf-8")).hexdigest()
+        cached = self._content_cache.get(key)
+        if cached is not None:
+            language_code, confidence, path = cached
+            path = path + ["content:cached"]
+        else:
+            language_code, confidence, path = self._run_strategy(sample)
+            path = [f"content:{step}" for step in path]
+            self._content_cache.put(key, (language_code, confidence, path))
+        if not language_code or confidence <= requested.confidence:
+            return requested.model_copy(update={"detection_path": requested.detection_path + path})
+        return self._metadata(sample, language_code, confidence, requested.detection_path + path)
+
+    def _run_strategy(self, text: str) -> Tuple[str, float, List[str]]:
+        if isinstance(self._strategy, CascadingLanguageDetectionStrategy):
+            return self._strategy.detect_with_path(text)
+        language_code, confidence = self._strategy.detect(text)
+        return language_code, confidence, []
+
+    def _metadata(self, text: str, language_code: str, confidence: float, path: List[str]) -> LanguageMetadata:
         language_code = language_code or self._default_language
         try:
-            return LanguageMetadata(language_code=language_code, confidence=confidence, source_text_preview=self._preview(aggregated.text))
+            return LanguageMetadata(
+                language_code=language_code,
+                confidence=confidence,
+                source_text_preview=self._preview(text),
+                detection_path=path,
+            )
         except ValidationError as exc:
             raise ValueError(f"Invalid language detection result: {exc}") from exc
 
@@ -109,6 +299,19 @@ class DefaultLanguageDetectionService(LanguageDetectionService):
             segments.append(" ".join(str(url) for url in payload.urls))
         return AggregatedText(" \n ".join(segments))
 
+    def _content_sample(self, insights: DocInsights) -> str:
+        """Head, middle and tail of the source text, ``content_sample_chars`` in total."""
+        text = "\n".join(chunk.text for chunk in insights.semantic_chunks if chunk.text)
+        if not text.strip():
+            text = "\n".join(insights.summaries)
+        text = text.strip()
+        budget = self._content_sample_chars
+        if len(text) <= budget:
+            return text
+        window = budget // 3
+        middle = (len(text) - window) // 2
+        return " ".join((text[:window], text[middle : middle + window], text[-window:]))
+
     def _preview(self, text: str, max_length: int = 200) -> str:
         return text[:max_length]
 
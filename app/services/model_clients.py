@@ -19,6 +19,9 @@ from app.domain.dto import (
     SlideDeck,
 )
 from app.domain.interfaces import ModelClient
+from app.services.classification import StoryClassifier
+from app.services.ranking import ranking_query, select_chunks
+from app.services.sanitization import clean_markdown_line, clean_markdown_paragraphs
 
 # Character limits per slide (matching Streamlit app)
 SLIDE_CHAR_LIMITS = {
@@ -30,6 +33,12 @@ SLIDE_CHAR_LIMITS = {
     "default": 200,
 }
 
+# Characters of source material placed into a single prompt
+SOURCE_TEXT_BUDGET = 3000
+
+# Category, subcategory, emotion used when the article is too short or classification fails
+DEFAULT_CLASSIFICATION = ("News", "General", "Neutral")
+
 
 class LanguageModel(Protocol):
     """Protocol describing minimal LLM behavior required by model clients."""
@@ -109,12 +118,9 @@ class CuriousModelClient(ModelClient):
         )
 
     def _extract_source_text(self, insights: DocInsights) -> str:
-        """Extract text from semantic chunks."""
-        chunks = []
-        for chunk in insights.semantic_chunks:
-            if chunk.text and chunk.text.strip():
-                chunks.append(chunk.text.strip())
-        return "\n\n".join(chunks) or "No content provided."
+        """Extract the most relevant chunk text that fits the prompt budget."""
+        selected = select_chunks(insights.semantic_chunks, ranking_query(insights), SOURCE_TEXT_BUDGET)
+        return "\n\n".join(chunk.text.strip() for chunk in selected) or "No content provided."
 
     def _generate_structured_json(
         self,
@@ -202,7 +208,7 @@ Respond strictly in this JSON format (keys in English; values in Target language
             pass
         
         # Build user prompt
-        user_prompt = f"""SOURCE INPUT:\n{source_text[:3000]}\n\nReturn only the JSON object described above. No markdown, no code fences, just valid JSON. Include EXACTLY {middle_count} slides."""
+        user_prompt = f"""SOURCE INPUT:\n{source_text[:SOURCE_TEXT_BUDGET]}\n\nReturn only the JSON object described above. No markdown, no code fences, just valid JSON. Include EXACTLY {middle_count} slides."""
 
         # Generate JSON
         try:
@@ -234,10 +240,10 @@ Respond strictly in this JSON format (keys in English; values in Target language
             result.setdefault(f"s{i}alt1", "")  # Ensure alt texts exist
         
         # Clean markdown from paragraph fields only (not alt texts)
-        result["storytitle"] = self._clean_markdown(result.get("storytitle", ""))
+        result["storytitle"] = clean_markdown_paragraphs(result.get("storytitle", ""))
         for i in range(1, middle_count + 1):
             key = f"s{i}paragraph1"
-            result[key] = self._clean_markdown(result.get(key, ""))
+            result[key] = clean_markdown_paragraphs(result.get(key, ""))
         
         # Fallbacks for paragraphs
         if not result["storytitle"].strip():
@@ -298,26 +304,6 @@ Respond strictly in this JSON format (keys in English; values in Target language
         # Fallback: return empty structure
         return {}
 
-    def _clean_markdown(self, text: str) -> str:
-        """Remove markdown formatting from text."""
-        if not text:
-            return ""
-        # Remove **bold**
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-        # Remove *italic*
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)
-        # Remove # headers
-        text = re.sub(r'#+\s*', '', text)
-        # Remove `code blocks`
-        text = re.sub(r'`([^`]+)`', r'\1', text)
-        # Remove [links](url)
-        text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-        # Remove --- separators
-        text = re.sub(r'^---+$', '', text, flags=re.MULTILINE)
-        # Clean up extra whitespace
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-        return text.strip()
-
     def _build_slide_deck_from_json(self, result_json: dict, middle_count: int) -> SlideDeck:
         """Build SlideDeck from structured JSON.
         
@@ -398,9 +384,22 @@ class NewsModelClient(ModelClient):
 
     mode: Mode = Mode.NEWS
 
-    def __init__(self, language_model: LanguageModel, template_key: str = "news_default") -> None:
+    def __init__(
+        self,
+        language_model: LanguageModel,
+        template_key: str = "news_default",
+        *,
+        classifier: Optional[StoryClassifier] = None,
+        min_classifier_confidence: float = 0.7,
+    ) -> None:
+        """
+        ``classifier`` answers category/subcategory/emotion locally; the LLM is asked only
+        when its weakest head scores below ``min_classifier_confidence``.
+        """
         self._language_model = language_model
         self._template_key = template_key
+        self._classifier = classifier
+        self._min_classifier_confidence = min_classifier_confidence
 
     def generate(
         self,
@@ -422,13 +421,21 @@ class NewsModelClient(ModelClient):
         content_language = "Hindi" if language.startswith("hi") else "English"
         
         # Detect category, subcategory, emotion if not provided
+        source = "request"
         if not category or not subcategory or not emotion:
-            detected_category, detected_subcategory, detected_emotion = self._detect_category_subcategory_emotion(
+            (detected_category, detected_subcategory, detected_emotion), source = self._classify(
                 article_text, content_language
             )
             category = category or detected_category
             subcategory = subcategory or detected_subcategory
             emotion = emotion or detected_emotion
+        # Persisted with the story; train_classifier.py learns from these labels
+        insights.metadata["classification"] = {
+            "category": category,
+            "subcategory": subcategory,
+            "emotion": emotion,
+            "source": source,
+        }
         
         # Calculate middle slides count
         middle_count = max(1, slide_count - 2) if slide_count else 5
@@ -447,7 +454,7 @@ class NewsModelClient(ModelClient):
         default_limit = slide_char_limits.get("default", 200)
         
         # Add storytitle as first slide
-        narrations.append(self._clean_markdown(storytitle))
+        narrations.append(clean_markdown_line(storytitle))
         
         # Generate narrations for middle slides
         for idx, slide_data in enumerate(slides_structure[:middle_count], start=1):
@@ -456,7 +463,7 @@ class NewsModelClient(ModelClient):
             narration = self._generate_slide_narration(
                 slide_data, slide_index, content_language, target_limit
             )
-            narrations.append(self._clean_markdown(narration))
+            narrations.append(clean_markdown_line(narration))
         
         # Build slide deck
         slide_deck = _build_slide_deck(narrations, self._template_key, language)
@@ -470,18 +477,24 @@ class NewsModelClient(ModelClient):
         )
 
     def _extract_article_text(self, insights: DocInsights) -> str:
-        """Extract full article text from semantic chunks."""
-        text_parts = []
-        for chunk in insights.semantic_chunks:
-            if chunk.text:
-                text_parts.append(chunk.text.strip())
-        return "\n\n".join(text_parts) or "No article content available."
+        """Extract the most relevant article chunks that fit the prompt budget."""
+        selected = select_chunks(insights.semantic_chunks, ranking_query(insights), SOURCE_TEXT_BUDGET)
+        return "\n\n".join(chunk.text.strip() for chunk in selected) or "No article content available."
 
     def _detect_category_subcategory_emotion(self, article_text: str, content_language: str) -> tuple[str, str, str]:
         """Detect category, subcategory, and emotion from article text (like Streamlit app)."""
+        return self._classify(article_text, content_language)[0]
+
+    def _classify(self, article_text: str, content_language: str) -> tuple[tuple[str, str, str], str]:
+        """Labels plus where they came from: ``local`` classifier, ``llm``, or ``default``."""
         if not article_text or len(article_text.strip()) < 50:
-            return ("News", "General", "Neutral")
-        
+            return DEFAULT_CLASSIFICATION, "default"
+
+        if self._classifier is not None:
+            local = self._classifier.classify(article_text)
+            if local.confidence >= self._min_classifier_confidence:
+                return local.as_tuple(), "local"
+
         if content_language == "Hindi":
             prompt = f"""
 आप एक समाचार विश्लेषण विशेषज्ञ हैं।
@@ -493,7 +506,7 @@ class NewsModelClient(ModelClient):
 3. emotion (भावना)
 
 लेख:
-\"\"\"{article_text[:3000]}\"\"\"
+\"\"\"{article_text[:SOURCE_TEXT_BUDGET]}\"\"\"
 
 जवाब केवल JSON में दें:
 {{
@@ -513,7 +526,7 @@ Analyze the following news article and return:
 3. emotion
 
 Article:
-\"\"\"{article_text[:3000]}\"\"\"
+\"\"\"{article_text[:SOURCE_TEXT_BUDGET]}\"\"\"
 
 Return ONLY as JSON:
 {{
@@ -531,11 +544,11 @@ Return ONLY as JSON:
             
             result = json.loads(content)
             if all(k in result for k in ["category", "subcategory", "emotion"]):
-                return (result["category"], result["subcategory"], result["emotion"])
+                return (result["category"], result["subcategory"], result["emotion"]), "llm"
         except Exception:
             pass
         
-        return ("News", "General", "Neutral")
+        return DEFAULT_CLASSIFICATION, "default"
 
     def _generate_slide_structure(
         self,
@@ -606,7 +619,7 @@ Subcategory: {subcategory or "General"}
 Emotion: {emotion or "Neutral"}
 
 Article:
-\"\"\"{article_text[:3000]}\"\"\"
+\"\"\"{article_text[:SOURCE_TEXT_BUDGET]}\"\"\"
 
 Guidance:
 {guidance_text}
@@ -675,7 +688,7 @@ Guidance:
             system_prompt = "You are a news presenter generating opening lines. Always respond with plain text only, no markdown."
             response = self._language_model.complete(system_prompt, slide1_prompt)
             storytitle = textwrap.shorten(
-                self._clean_markdown(response.strip()),
+                clean_markdown_line(response.strip()),
                 width=slide1_limit,
                 placeholder="…"
             )
@@ -730,7 +743,7 @@ Character sketch:
             system_prompt = "You write concise narrations for web story slides. Always respond with plain text only, no markdown formatting."
             response = self._language_model.complete(system_prompt, narration_prompt.strip())
             narration = textwrap.shorten(
-                self._clean_markdown(response.strip()),
+                clean_markdown_line(response.strip()),
                 width=target_limit,
                 placeholder="…"
             )
@@ -738,27 +751,6 @@ Character sketch:
         except Exception:
             return summary_brief[:target_limit] if summary_brief else "Unable to generate narration for this slide."
 
-    def _clean_markdown(self, text: str) -> str:
-        """Remove markdown formatting from text."""
-        if not text:
-            return ""
-        
-        # Remove **bold**
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-        # Remove *italic*
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)
-        # Remove # headers
-        text = re.sub(r'#+\s*', '', text)
-        # Remove `code blocks`
-        text = re.sub(r'`([^`]+)`', r'\1', text)
-        # Remove [links](url)
-        text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        
-        return text
-
 
 __all__ = ["CuriousModelClient", "NewsModelClient", "LanguageModel"]
 
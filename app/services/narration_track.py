@@ -0,0 +1,273 @@
+"""Assemble per-slide MP3 narration into a single story-level track."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence
+from uuid import uuid4
+
+from app.domain.dto import NarrationSegment, NarrationTrack, SlideBlock, VoiceAsset
+
+if TYPE_CHECKING:
+    from app.services.voice_synthesis import VoiceStorageService
+
+# MPEG audio version ids (header bits 19-20) -> table column.
+_MPEG1 = 3
+_MPEG2 = 2
+_MPEG25 = 0
+
+_BITRATES_KBPS = {
+    _MPEG1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    _MPEG2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    _MPEG25: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {
+    _MPEG1: (44100, 48000, 32000),
+    _MPEG2: (22050, 24000, 16000),
+    _MPEG25: (11025, 12000, 8000),
+}
+_LAYER_III = 1
+_MONO = 3
+
+
+@dataclass(frozen=True)
+class Mp3FrameHeader:
+    """Decoded MPEG-1/2/2.5 Layer III frame header."""
+
+    version: int
+    bitrate_index: int
+    sample_rate: int
+    padding: int
+    channel_mode: int
+    raw: bytes
+
+    @property
+    def samples_per_frame(self) -> int:
+        return 1152 if self.version == _MPEG1 else 576
+
+    @property
+    def frame_length(self) -> int:
+        bitrate = _BITRATES_KBPS[self.version][self.bitrate_index] * 1000
+        coefficient = 144 if self.version == _MPEG1 else 72
+        return coefficient * bitrate // self.sample_rate + self.padding
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.samples_per_frame / self.sample_rate
+
+    @property
+    def stream_signature(self) -> tuple[int, int, int]:
+        """Parameters that must match for frames to be concatenated safely."""
+        return (self.version, self.sample_rate, self.channel_mode)
+
+    @property
+    def side_info_length(self) -> int:
+        if self.version == _MPEG1:
+            return 17 if self.channel_mode == _MONO else 32
+        return 9 if self.channel_mode == _MONO else 17
+
+
+@dataclass(frozen=True)
+class Mp3Frame:
+    """A single frame sliced out of an MP3 byte stream."""
+
+    header: Mp3FrameHeader
+    data: bytes
+
+
+def parse_frame_header(buffer: bytes, offset: int = 0) -> Optional[Mp3FrameHeader]:
+    """Decode the four-byte header at ``offset`` or return None if it is not a Layer III frame."""
+    if offset + 4 > len(buffer):
+        return None
+    b0, b1, b2, b3 = buffer[offset : offset + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer != _LAYER_III:
+        return None
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    return Mp3FrameHeader(
+        version=version,
+        bitrate_index=bitrate_index,
+        sample_rate=_SAMPLE_RATES[version][sample_rate_index],
+        padding=(b2 >> 1) & 0x01,
+        channel_mode=(b3 >> 6) & 0x03,
+        raw=bytes((b0, b1, b2, b3)),
+    )
+
+
+def _skip_id3v2(buffer: bytes) -> int:
+    if len(buffer) < 10 or buffer[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in buffer[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if buffer[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _is_vbr_info_frame(frame: Mp3Frame) -> bool:
+    offset = 4 + frame.header.side_info_length
+    tag = frame.data[offset : offset + 4]
+    return tag in (b"Xing", b"Info") or frame.data[36:40] == b"VBRI"
+
+
+def iter_frames(audio: bytes) -> Iterator[Mp3Frame]:
+    """Yield audio frames, skipping ID3 tags, VBR info frames and unsynchronised bytes."""
+    end = len(audio)
+    if end >= 128 and audio[-128:-125] == b"TAG":
+        end -= 128
+    offset = _skip_id3v2(audio)
+    first = True
+    while offset + 4 <= end:
+        header = parse_frame_header(audio, offset)
+        if header is None:
+            offset += 1
+            continue
+        length = header.frame_length
+        if offset + length > end:
+            break
+        frame = Mp3Frame(header=header, data=audio[offset : offset + length])
+        offset += length
+        if first:
+            first = False
+            if _is_vbr_info_frame(frame):
+                continue
+        yield frame
+
+
+def silent_frames(template: Mp3FrameHeader, duration_seconds: float) -> List[Mp3Frame]:
+    """Build zero-payload frames matching ``template`` that decode to silence."""
+    count = round(duration_seconds / template.duration_seconds) if duration_seconds > 0 else 0
+    if count <= 0:
+        return []
+    # Clear the padding bit and set protection_bit=1 (no CRC) so the frame is header + zero side info.
+    raw = bytes((template.raw[0], template.raw[1] | 0x01, template.raw[2] & 0xFD, template.raw[3]))
+    header = Mp3FrameHeader(
+        version=template.version,
+        bitrate_index=template.bitrate_index,
+        sample_rate=template.sample_rate,
+        padding=0,
+        channel_mode=template.channel_mode,
+        raw=raw,
+    )
+    frame = Mp3Frame(header=header, data=raw + bytes(header.frame_length - 4))
+    return [frame] * count
+
+
+def frames_duration(frames: Iterable[Mp3Frame]) -> float:
+    return sum(frame.header.duration_seconds for frame in frames)
+
+
+def join_frames(parts: Sequence[Sequence[Mp3Frame]]) -> bytes:
+    """Concatenate frame sequences without re-encoding."""
+    return b"".join(frame.data for part in parts for frame in part)
+
+
+@dataclass
+class NarrationInput:
+    """Per-slide audio handed to the assembler after synthesis."""
+
+    slide_index: int
+    slide: SlideBlock
+    audio_bytes: bytes
+    asset: VoiceAsset
+
+
+class NarrationTrackAssembler:
+    """Concatenate per-slide MP3 frames into one story track with an offset table."""
+
+    def __init__(
+        self,
+        storage: VoiceStorageService,
+        *,
+        silence_padding_ms: int = 400,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._storage = storage
+        self._silence_padding_ms = max(0, silence_padding_ms)
+        self._logger = logger or logging.getLogger(__name__)
+
+    def assemble(self, inputs: Sequence[NarrationInput], *, provider: str) -> Optional[NarrationTrack]:
+        """Join the inputs in order, upload the combined MP3 and return its offset table."""
+        from app.services.voice_synthesis import VoiceGenerationResult
+
+        parts: List[List[Mp3Frame]] = []
+        segments: List[NarrationSegment] = []
+        signature: Optional[tuple[int, int, int]] = None
+        template: Optional[Mp3FrameHeader] = None
+        cursor = 0.0
+
+        for item in inputs:
+            frames = list(iter_frames(item.audio_bytes))
+            if not frames:
+                self._logger.warning("Narration track: slide %d has no MP3 frames, skipping", item.slide_index)
+                continue
+            if signature is None:
+                signature = frames[0].header.stream_signature
+                template = frames[0].header
+            elif any(frame.header.stream_signature != signature for frame in frames):
+                self._logger.warning(
+                    "Narration track: slide %d audio format differs from the first slide, skipping",
+                    item.slide_index,
+                )
+                continue
+
+            if parts and self._silence_padding_ms:
+                padding = silent_frames(template, self._silence_padding_ms / 1000)
+                parts.append(padding)
+                cursor += frames_duration(padding)
+
+            duration = frames_duration(frames)
+            segments.append(
+                NarrationSegment(
+                    slide_index=item.slide_index,
+                    placeholder_id=item.slide.placeholder_id,
+                    start_seconds=round(cursor, 3),
+                    duration_seconds=round(duration, 3),
+                    audio_url=item.asset.audio_url,
+                )
+            )
+            parts.append(frames)
+            cursor += duration
+
+        if not segments:
+            return None
+
+        audio = VoiceGenerationResult(
+            audio_bytes=join_frames(parts),
+            format="mp3",
+            metadata={"provider": provider},
+        )
+        asset = self._storage.store(audio=audio, filename=f"{uuid4()}-narration.mp3")
+        self._logger.info(
+            "Assembled narration track from %d slides (%.1fs, %d bytes)",
+            len(segments),
+            cursor,
+            len(audio.audio_bytes),
+        )
+        return NarrationTrack(
+            provider=asset.provider,
+            audio_url=asset.audio_url,
+            duration_seconds=round(cursor, 3),
+            silence_padding_ms=self._silence_padding_ms,
+            segments=segments,
+        )
+
+
+__all__ = [
+    "Mp3Frame",
+    "Mp3FrameHeader",
+    "NarrationInput",
+    "NarrationTrackAssembler",
+    "frames_duration",
+    "iter_frames",
+    "join_frames",
+    "parse_frame_header",
+    "silent_frames",
+]
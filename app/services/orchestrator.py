@@ -33,6 +33,7 @@ from app.domain.interfaces import (
 )
 from app.services.prompt_templates import PromptSelectionController
 from app.services.html_renderer import HTMLTemplateRenderer
+from app.services.rendered_html import RenderedStory, RenderedStoryCache, render_story
 from app.api.schemas import StoryCreateRequest
 
 
@@ -51,6 +52,7 @@ class StoryOrchestrator:
     voice_service: VoiceSynthesisService
     repository: StoryRepository
     html_renderer: Optional[HTMLTemplateRenderer] = None
+    rendered_html: Optional[RenderedStoryCache] = None
     id_factory: Callable[[], UUID] = uuid4
     default_voice_provider: str = "azure_basic"
     story_base_url: Optional[str] = None
@@ -87,6 +89,14 @@ class StoryOrchestrator:
         except Exception as e:
             logger.error("Document intelligence pipeline failed: %s", e, exc_info=True)
             raise ValueError(f"Document processing failed: {e}") from e
+
+        # Second pass over the extracted sources, so URL-only stories are written in the article's language
+        if hasattr(self.language_service, "detect_content"):
+            try:
+                language = self.language_service.detect_content(doc_insights, language)
+                logger.debug("Content language: %s (%s)", language.language_code, language.detection_path)
+            except Exception as e:
+                logger.warning("Content language detection failed, keeping %s: %s", language.language_code, e)
         
         try:
             analysis = self.analysis_facade.analyze(doc_insights)
@@ -175,13 +185,17 @@ class StoryOrchestrator:
             logger.warning("Image pipeline failed (non-critical): %s", e)
             image_assets = []  # Continue without images
         
+        narration_track = None
         try:
             voice_provider = payload.voice_engine or self.default_voice_provider
-            voice_assets = (
-                self.voice_service.synthesize(narrative.slide_deck, language, voice_provider)
-                if voice_provider
-                else []
-            )
+            synthesize_with_track = getattr(self.voice_service, "synthesize_with_track", None)
+            if not voice_provider:
+                voice_assets = []
+            elif synthesize_with_track is not None:
+                # Also assembles the full-story narration track from the in-memory slide audio
+                voice_assets, narration_track = synthesize_with_track(narrative.slide_deck, language, voice_provider)
+            else:
+                voice_assets = self.voice_service.synthesize(narrative.slide_deck, language, voice_provider)
             logger.debug("Voice assets synthesized: %d", len(voice_assets))
         except Exception as e:
             logger.warning("Voice synthesis failed (non-critical): %s", e)
@@ -202,6 +216,7 @@ class StoryOrchestrator:
             slide_deck=narrative.slide_deck,
             image_assets=image_assets,
             voice_assets=voice_assets,
+            narration_track=narration_track,
             prompt_news=rendered_prompt.user if payload.mode == Mode.NEWS else None,
             prompt_curious=rendered_prompt.user if payload.mode == Mode.CURIOUS else None,
             canurl=canurl,
@@ -212,6 +227,8 @@ class StoryOrchestrator:
         # Save to database only if enabled
         if self.save_to_database:
             self.repository.save(record)
+            if self.rendered_html:
+                self.rendered_html.invalidate(str(record.id))
 
         # Generate and save HTML if renderer is available
         html_file_path = None
@@ -243,6 +260,14 @@ class StoryOrchestrator:
     def get_story(self, story_id: str) -> StoryRecord:
         return self.repository.get(story_id)
 
+    def get_story_html(self, story_id: str) -> RenderedStory:
+        """Rendered HTML of a stored story, reused from ``rendered_html`` while it is current."""
+        if not self.html_renderer:
+            raise RuntimeError("HTML renderer not available")
+        if self.rendered_html:
+            return self.rendered_html.get(story_id, lambda: self.get_story(story_id))
+        return render_story(self.html_renderer, self.get_story(story_id))
+
     def _build_intake_payload(self, request: StoryCreateRequest) -> IntakePayload:
         return self.user_input_service.build_payload(
             user_input=request.user_input,  # NEW: Unified input support
@@ -0,0 +1,128 @@
+"""BM25 relevance ranking of semantic chunks for prompt-budgeted context selection."""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from app.domain.dto import DocInsights, SemanticChunk
+from app.services.text_segmentation import words
+
+try:  # NumPy is optional; the pure-Python path gives identical scores
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by for from has have he her his i in is it its of on or our she "
+    "that the their them they this to was we were which who will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in words(text.lower()) if token not in _STOPWORDS and len(token) > 1]
+
+
+class BM25Ranker:
+    """Okapi BM25 over a small in-memory corpus of chunks."""
+
+    def __init__(self, *, k1: float = 1.5, b: float = 0.75) -> None:
+        self._k1 = k1
+        self._b = b
+
+    def score(self, query: str, documents: Sequence[str]) -> List[float]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not documents:
+            return [0.0] * len(documents)
+        counts = [Counter(tokenize(document)) for document in documents]
+        lengths = [sum(counter.values()) for counter in counts]
+        if np is not None:
+            return self._score_numpy(terms, counts, lengths)
+        return self._score_python(terms, counts, lengths)
+
+    def rank(self, query: str, chunks: Sequence[SemanticChunk]) -> List[tuple[SemanticChunk, float]]:
+        scores = self.score(query, [chunk.text for chunk in chunks])
+        return sorted(zip(chunks, scores), key=lambda item: item[1], reverse=True)
+
+    def _idf(self, document_frequency: float, document_count: int) -> float:
+        return math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _score_numpy(self, terms: List[str], counts: List[Counter], lengths: List[int]) -> List[float]:
+        tf = np.array([[counter.get(term, 0) for term in terms] for counter in counts], dtype=float)
+        doc_len = np.array(lengths, dtype=float)[:, None]
+        avg_len = max(float(doc_len.mean()), 1.0)
+        df = (tf > 0).sum(axis=0)
+        n = len(counts)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        denom = tf + self._k1 * (1 - self._b + self._b * doc_len / avg_len)
+        return ((tf * (self._k1 + 1) / denom) * idf).sum(axis=1).tolist()
+
+    def _score_python(self, terms: List[str], counts: List[Counter], lengths: List[int]) -> List[float]:
+        n = len(counts)
+        avg_len = max(sum(lengths) / n, 1.0)
+        idf = {term: self._idf(sum(1 for counter in counts if term in counter), n) for term in terms}
+        scores = []
+        for counter, length in zip(counts, lengths):
+            norm = self._k1 * (1 - self._b + self._b * length / avg_len)
+            scores.append(
+                sum(idf[term] * tf * (self._k1 + 1) / (tf + norm) for term in terms if (tf := counter.get(term, 0)))
+            )
+        return scores
+
+
+def ranking_query(insights: DocInsights, extra: Iterable[str] = ()) -> str:
+    """Query text built from the job's focus keywords and the source titles."""
+    parts: List[str] = list(extra)
+    parts.extend((insights.metadata or {}).get("focus_keywords") or [])
+    titles: Dict[str, None] = {}
+    for chunk in insights.semantic_chunks:
+        title = (chunk.metadata or {}).get("title")
+        if title:
+            titles.setdefault(str(title))
+    parts.extend(titles)
+    return " ".join(parts)
+
+
+def select_chunks(
+    chunks: Sequence[SemanticChunk],
+    query: str,
+    budget_chars: int,
+    *,
+    ranker: Optional[BM25Ranker] = None,
+    separator: str = "\n\n",
+) -> List[SemanticChunk]:
+    """Pick the chunks that best answer ``query`` within ``budget_chars``, in source order.
+
+    The opening chunk of every source is taken first so multi-source stories keep each
+    source's lede; remaining budget goes to the highest-scoring chunks. When everything
+    fits, all chunks are returned unchanged.
+    """
+    chunks = [chunk for chunk in chunks if chunk.text and chunk.text.strip()]
+    if sum(len(chunk.text) + len(separator) for chunk in chunks) <= budget_chars:
+        return chunks
+
+    scores = (ranker or BM25Ranker()).score(query, [chunk.text for chunk in chunks])
+    leads: Dict[Optional[str], int] = {}
+    for index, chunk in enumerate(chunks):
+        leads.setdefault(chunk.source_id, index)
+    lead_indexes = set(leads.values())
+    order = list(leads.values()) + sorted(
+        (index for index in range(len(chunks)) if index not in lead_indexes),
+        key=lambda index: (-scores[index], index),
+    )
+
+    selected: List[int] = []
+    used = 0
+    for index in order:
+        cost = len(chunks[index].text) + len(separator)
+        if used + cost <= budget_chars:
+            selected.append(index)
+            used += cost
+    if not selected:
+        # Budget smaller than any chunk: hand back the best one for the caller to truncate
+        selected = [max(range(len(chunks)), key=lambda index: scores[index])]
+    return [chunks[index] for index in sorted(selected)]
+
+
+__all__ = ["BM25Ranker", "ranking_query", "select_chunks", "tokenize"]
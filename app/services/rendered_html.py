@@ -0,0 +1,123 @@
+"""Rendered story HTML cached per story, with strong ETags for conditional GETs."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from app.domain.dto import Mode, StoryRecord
+from app.services.cache import CacheStats, TTLCache
+from app.services.html_renderer import HTMLTemplateRenderer
+
+
+@dataclass(frozen=True)
+class RenderedStory:
+    """Rendered HTML plus everything it was rendered from."""
+
+    story_id: str
+    mode: Mode
+    template_key: str
+    template_source: str
+    record_version: str
+    template_version: str
+    html: str
+    etag: str
+
+    @property
+    def key(self) -> Tuple[str, str, str, str]:
+        return (self.story_id, self.record_version, self.template_key, self.template_version)
+
+
+def record_version(record: StoryRecord) -> str:
+    """Digest of the stored record; any change to the story changes it."""
+    return hashlib.sha1(record.model_dump_json().encode("utf-8")).hexdigest()[:16]
+
+
+def strong_etag(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as RFC 9110 prescribes for If-None-Match: ``W/"x"`` matches ``"x"``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def render_story(renderer: HTMLTemplateRenderer, record: StoryRecord, template_source: str = "file") -> RenderedStory:
+    # Read the template version before rendering: if the template changes mid-render the
+    # entry is stored under the old version and the next lookup renders again.
+    template_version = renderer.template_version(record.template_key, record.mode, template_source)
+    html = renderer.render(record=record, template_key=record.template_key, template_source=template_source)
+    return RenderedStory(
+        story_id=str(record.id),
+        mode=record.mode,
+        template_key=record.template_key,
+        template_source=template_source,
+        record_version=record_version(record),
+        template_version=template_version,
+        html=html,
+        etag=strong_etag(record.template_key, html),
+    )
+
+
+class RenderedStoryCache:
+    """Rendered HTML per story, so hot stories skip both the record load and the render.
+
+    An entry is reused while its template version is unchanged (a ``stat`` for file
+    templates, the loader's max-age window for URL/S3 templates). Saving a story must call
+    ``invalidate`` for it; ``ttl_seconds`` bounds how long a save made by another process
+    can go unnoticed.
+    """
+
+    def __init__(
+        self,
+        renderer: HTMLTemplateRenderer,
+        *,
+        max_entries: int = 256,
+        ttl_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._renderer = renderer
+        self._cache: TTLCache[str, RenderedStory] = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds, clock=clock
+        )
+        self._logger = logger or logging.getLogger(__name__)
+
+    def get(
+        self, story_id: str, load_record: Callable[[], StoryRecord], template_source: str = "file"
+    ) -> RenderedStory:
+        """Cached rendering of ``story_id``; ``load_record`` is only called on a miss."""
+        entry = self._cache.get(story_id)
+        if entry is not None and entry.template_source == template_source:
+            current = self._renderer.template_version(entry.template_key, entry.mode, template_source)
+            if current == entry.template_version:
+                return entry
+            self._logger.debug("Template %s changed; re-rendering story %s", entry.template_key, story_id)
+        entry = render_story(self._renderer, load_record(), template_source)
+        self._cache.put(story_id, entry)
+        return entry
+
+    def invalidate(self, story_id: Optional[str] = None) -> None:
+        """Drop one story's rendering, or every rendering when ``story_id`` is None."""
+        if story_id is None:
+            self._cache.clear()
+        else:
+            self._cache.invalidate(str(story_id))
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
+
+
+__all__ = ["RenderedStory", "RenderedStoryCache", "etag_matches", "record_version", "render_story", "strong_etag"]
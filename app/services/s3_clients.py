@@ -0,0 +1,102 @@
+"""Process-wide registry of reusable boto3 S3 clients."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_MAX_POOL_CONNECTIONS = 32
+
+_ClientKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class S3ClientRegistry:
+    """Build each S3 client once per (region, credentials) and share it across threads.
+
+    Creating a client loads botocore's service model and resolves credentials, which costs
+    far more than the request it is usually built for. boto3 clients are thread-safe once
+    constructed, but ``boto3.client`` on the default session is not, so construction goes
+    through a private session under a lock. ``max_pool_connections`` sizes urllib3's pool
+    so concurrent uploads/downloads are not serialized on botocore's default of 10.
+    """
+
+    def __init__(self, *, max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS) -> None:
+        self._max_pool_connections = max_pool_connections
+        self._clients: Dict[_ClientKey, Any] = {}
+        self._session: Any = None
+        self._lock = threading.Lock()
+
+    def client(
+        self,
+        *,
+        region: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+    ) -> Any:
+        """Shared client for the given region and credentials.
+
+        Without explicit keys the default credential chain (env vars, IAM role) is used.
+        Raises ``ImportError`` when boto3 is not installed, like ``import boto3`` would.
+        """
+        if not (access_key and secret_key):
+            access_key = secret_key = None
+        key = (region, access_key, secret_key)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._create(region, access_key, secret_key)
+                self._clients[key] = client
+            return client
+
+    def configure(self, *, max_pool_connections: int) -> None:
+        """Change the pool size; clients built with the old size are dropped."""
+        with self._lock:
+            if max_pool_connections != self._max_pool_connections:
+                self._max_pool_connections = max_pool_connections
+                self._clients.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._session = None
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _create(self, region: Optional[str], access_key: Optional[str], secret_key: Optional[str]) -> Any:
+        import boto3
+        from botocore.config import Config
+
+        if self._session is None:
+            self._session = boto3.session.Session()
+        kwargs: Dict[str, Any] = {
+            "region_name": region,
+            "config": Config(max_pool_connections=self._max_pool_connections),
+        }
+        if access_key and secret_key:
+            kwargs["aws_access_key_id"] = access_key
+            kwargs["aws_secret_access_key"] = secret_key
+        return self._session.client("s3", **kwargs)
+
+
+_registry = S3ClientRegistry()
+
+
+def s3_client_registry() -> S3ClientRegistry:
+    return _registry
+
+
+def get_s3_client(
+    *,
+    region: Optional[str] = None,
+    access_key: Optional[str] = None,
+    secret_key: Optional[str] = None,
+) -> Any:
+    """Shared S3 client from the process-wide registry."""
+    return _registry.client(region=region, access_key=access_key, secret_key=secret_key)
+
+
+__all__ = ["DEFAULT_MAX_POOL_CONNECTIONS", "S3ClientRegistry", "get_s3_client", "s3_client_registry"]
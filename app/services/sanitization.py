@@ -0,0 +1,96 @@
+"""Shared text sanitization: markdown stripping for model output and stray-brace cleanup for rendered HTML.
+
+Every rewrite rule is compiled once and paired with a cheap probe for the text it needs
+(a substring, or a pattern with a literal prefix that the regex engine can skip to), so
+a rule that cannot match never scans the document. Rules still run in their original
+order, each on the previous rule's output, which keeps results byte-identical to the
+per-call ``re.sub`` chains these functions replace.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Optional, Sequence, Tuple
+
+# (probe, pattern, replacement): the rule runs only when ``probe(text)`` is truthy
+Rule = Tuple[Callable[[str], object], "re.Pattern[str]", str]
+
+
+def _contains(literal: str) -> Callable[[str], bool]:
+    return lambda text: literal in text
+
+
+_MARKDOWN_RULES: Sequence[Rule] = (
+    (_contains("**"), re.compile(r"\*\*([^*]+)\*\*"), r"\1"),  # **bold**
+    (_contains("*"), re.compile(r"\*([^*]+)\*"), r"\1"),  # *italic*
+    (_contains("#"), re.compile(r"#+\s*"), ""),  # # headers
+    (_contains("`"), re.compile(r"`([^`]+)`"), r"\1"),  # `code`
+    (_contains("]("), re.compile(r"\[([^\]]+)\]\([^\)]+\)"), r"\1"),  # [links](url)
+)
+
+_PARAGRAPH_RULES: Sequence[Rule] = (
+    (_contains("---"), re.compile(r"^---+$", re.MULTILINE), ""),  # --- separators
+    (lambda text: text.count("\n") >= 3, re.compile(r"\n\s*\n\s*\n+"), "\n\n"),  # runs of blank lines
+)
+
+_URL_RUN = r"https?://[^\s\"'<>}]+"
+_BRACE_BEFORE_URL = re.compile(r"\{\s*https?://")
+_BRACE_AFTER_URL = re.compile(_URL_RUN + r"\}")
+_URL_ATTRIBUTES = "href|src|content|url|poster-portrait-src|publisher-logo-src"
+
+_URL_RULES: Sequence[Rule] = (
+    # Curly braces around URLs in any context
+    (_BRACE_BEFORE_URL.search, re.compile(r"\{(\s*" + _URL_RUN + r")\}"), r"\1"),
+    (_BRACE_AFTER_URL.search, re.compile(r"(\s*" + _URL_RUN + r")\}"), r"\1"),
+    (_BRACE_BEFORE_URL.search, re.compile(r"\{(\s*" + _URL_RUN + r")"), r"\1"),
+    # Braced attribute values
+    (_contains('="{'), re.compile(r'(' + _URL_ATTRIBUTES + r')="\{([^"]+)\}"'), r'\1="\2"'),
+    (_contains("='{"), re.compile(r"(" + _URL_ATTRIBUTES + r")='\{([^']+)\}'"), r"\1='\2'"),
+    # Braced JSON-LD string values
+    (_contains('"{'), re.compile(r'"\{([^"]+)\}"'), r'"\1"'),
+    (_contains('"{'), re.compile(r':\s*"\{([^"]+)\}"'), r': "\1"'),
+)
+
+
+def _apply(rules: Sequence[Rule], text: str) -> str:
+    for probe, pattern, replacement in rules:
+        if probe(text):
+            text = pattern.sub(replacement, text)
+    return text
+
+
+def strip_markdown(text: Optional[str]) -> str:
+    """Remove **bold**, *italic*, # header, `code` and [link](url) markup, keeping the text."""
+    if not text:
+        return ""
+    return _apply(_MARKDOWN_RULES, text)
+
+
+def clean_markdown(text: Optional[str]) -> str:
+    """Markdown-free text for an HTML placeholder or slide, trimmed."""
+    return strip_markdown(text).strip()
+
+
+def clean_markdown_paragraphs(text: Optional[str]) -> str:
+    """Markdown-free multi-paragraph text: ``---`` rules dropped, blank-line runs collapsed."""
+    return _apply(_PARAGRAPH_RULES, strip_markdown(text)).strip()
+
+
+def clean_markdown_line(text: Optional[str]) -> str:
+    """Markdown-free single-line text (narration): every whitespace run becomes one space."""
+    # str.split() and re's \s agree on what whitespace is, so this equals re.sub(r"\s+", " ").strip()
+    return " ".join(strip_markdown(text).split())
+
+
+def cleanup_urls(html: str) -> str:
+    """Remove stray curly braces around URLs, braced attribute values and JSON-LD strings."""
+    return _apply(_URL_RULES, html)
+
+
+__all__ = [
+    "clean_markdown",
+    "clean_markdown_line",
+    "clean_markdown_paragraphs",
+    "cleanup_urls",
+    "strip_markdown",
+]
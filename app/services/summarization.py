@@ -0,0 +1,158 @@
+"""Extractive summarization: TextRank over TF-IDF sentence vectors blended with centroid similarity."""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.services.ranking import tokenize
+from app.services.text_segmentation import split_sentences
+
+try:  # NumPy is optional; without it summaries fall back to the lead sentences
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+try:  # SciPy is optional; it keeps the sentence-term matrix sparse, otherwise NumPy builds it dense
+    from scipy import sparse
+except ImportError:  # pragma: no cover - depends on environment
+    sparse = None
+
+
+@dataclass(frozen=True)
+class RankedSentence:
+    index: int
+    text: str
+    score: float
+
+
+class TextRankSummarizer:
+    """Rank sentences by PageRank centrality on their cosine-similarity graph.
+
+    The final score blends TextRank with similarity to the document centroid and a small
+    lead bias (news puts the key facts first). Tokens come from the shared Latin/Devanagari
+    word splitter, so Hindi text ranks as well as English. Scoring needs NumPy (lead
+    sentences are returned without it); SciPy, when installed, keeps long documents sparse.
+    """
+
+    def __init__(
+        self,
+        *,
+        damping: float = 0.85,
+        max_iterations: int = 100,
+        tolerance: float = 1e-6,
+        centroid_weight: float = 0.3,
+        position_weight: float = 0.1,
+    ) -> None:
+        self._damping = damping
+        self._max_iterations = max_iterations
+        self._tolerance = tolerance
+        self._centroid_weight = centroid_weight
+        self._position_weight = position_weight
+
+    def rank_sentences(self, text: str) -> List[RankedSentence]:
+        """All sentences of ``text``, best first."""
+        sentences = split_sentences(text)
+        if np is None or len(sentences) < 3:
+            scores = [1.0 / (1 + index) for index in range(len(sentences))]
+        else:
+            scores = self._score(sentences)
+        ranked = [
+            RankedSentence(index=index, text=sentence, score=score)
+            for index, (sentence, score) in enumerate(zip(sentences, scores))
+        ]
+        return sorted(ranked, key=lambda item: (-item.score, item.index))
+
+    def summarize(self, text: str, *, max_chars: int = 300, max_sentences: Optional[int] = None) -> str:
+        """Top-ranked sentences that fit ``max_chars``, joined in their original order."""
+        chosen: List[RankedSentence] = []
+        used = 0
+        for sentence in self.rank_sentences(text):
+            if max_sentences is not None and len(chosen) >= max_sentences:
+                break
+            cost = len(sentence.text) + (1 if chosen else 0)
+            if used + cost > max_chars:
+                if chosen:
+                    # Stop rather than pad the budget with low-ranked filler sentences
+                    break
+                continue
+            chosen.append(sentence)
+            used += cost
+        if not chosen:
+            return text[:max_chars].strip()
+        return " ".join(sentence.text for sentence in sorted(chosen, key=lambda item: item.index))
+
+    def _score(self, sentences: List[str]) -> List[float]:
+        matrix = self._tfidf(sentences)
+        if sparse is not None and sparse.issparse(matrix):
+            similarity = (matrix @ matrix.T).toarray()
+            centroid = np.asarray(matrix.mean(axis=0)).ravel()
+            centroid_scores = np.asarray(matrix @ centroid).ravel()
+        else:
+            similarity = matrix @ matrix.T
+            centroid = matrix.mean(axis=0)
+            centroid_scores = matrix @ centroid
+        np.fill_diagonal(similarity, 0.0)
+
+        textrank = self._pagerank(similarity)
+        norm = np.linalg.norm(centroid)
+        centroid_scores = centroid_scores / norm if norm else centroid_scores
+        positions = 1.0 / (1.0 + np.arange(len(sentences)))
+        blended = (
+            (1 - self._centroid_weight - self._position_weight) * _normalize(textrank)
+            + self._centroid_weight * _normalize(centroid_scores)
+            + self._position_weight * positions
+        )
+        return blended.tolist()
+
+    def _tfidf(self, sentences: List[str]):
+        vocabulary: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        values: List[float] = []
+        for row, sentence in enumerate(sentences):
+            for term, count in Counter(tokenize(sentence)).items():
+                rows.append(row)
+                cols.append(vocabulary.setdefault(term, len(vocabulary)))
+                values.append(1.0 + math.log(count))
+        shape = (len(sentences), max(1, len(vocabulary)))
+        rows_arr = np.asarray(rows, dtype=np.int64)
+        cols_arr = np.asarray(cols, dtype=np.int64)
+        tf = np.asarray(values, dtype=float)
+        df = np.bincount(cols_arr, minlength=shape[1])
+        weights = tf * (np.log((1 + shape[0]) / (1 + df[cols_arr])) + 1.0)  # smoothed idf
+
+        if sparse is not None:
+            matrix = sparse.csr_matrix((weights, (rows_arr, cols_arr)), shape=shape)
+            norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+            norms[norms == 0] = 1.0
+            return sparse.diags(1.0 / norms) @ matrix
+        matrix = np.zeros(shape)
+        np.add.at(matrix, (rows_arr, cols_arr), weights)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _pagerank(self, similarity):
+        n = similarity.shape[0]
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        # Sentences with no similar neighbours distribute their rank uniformly
+        transition = np.where(out_weight > 0, similarity / np.where(out_weight > 0, out_weight, 1.0), 1.0 / n)
+        scores = np.full(n, 1.0 / n)
+        teleport = (1 - self._damping) / n
+        for _ in range(self._max_iterations):
+            updated = teleport + self._damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < self._tolerance:
+                return updated
+            scores = updated
+        return scores
+
+
+def _normalize(values):
+    spread = values.max() - values.min()
+    return (values - values.min()) / spread if spread > 0 else np.zeros_like(values)
+
+
+__all__ = ["RankedSentence", "TextRankSummarizer"]
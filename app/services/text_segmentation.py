@@ -0,0 +1,84 @@
+"""Script-aware sentence and clause segmentation helpers."""
+
+from __future__ import annotations
+
+import re
+from typing import List
+
+# Sentence terminators for Latin script plus the Devanagari danda (।) and double danda (॥).
+_SENTENCE_END = re.compile(r"(?:(?<=[.!?।॥])|(?<=[.!?।॥][\"'”’)\]]))\s+")
+_CLAUSE_END = re.compile(r"(?<=[,;:—–])\s+")
+_WHITESPACE = re.compile(r"\s+")
+# ``\w`` alone splits Devanagari words at vowel signs and viramas (combining marks), so
+# the block is included explicitly, minus the danda punctuation (U+0964/U+0965).
+_WORD = re.compile(r"[\w\u0900-\u0963\u0966-\u097F]+")
+
+
+def words(text: str) -> List[str]:
+    """Word tokens for Latin and Devanagari text, keeping combining marks inside the word."""
+    return _WORD.findall(text)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on Latin and Devanagari terminators."""
+    if not text:
+        return []
+    sentences: List[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        normalized = _WHITESPACE.sub(" ", paragraph).strip()
+        if not normalized:
+            continue
+        sentences.extend(part.strip() for part in _SENTENCE_END.split(normalized) if part.strip())
+    return sentences
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Break an overlong sentence at clause boundaries, then at word boundaries."""
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces: List[str] = []
+    for clause in _CLAUSE_END.split(sentence):
+        if len(clause) <= max_chars:
+            pieces.append(clause)
+            continue
+        current = ""
+        for word in clause.split(" "):
+            candidate = f"{current} {word}".strip()
+            if current and len(candidate) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            pieces.append(current)
+    return _pack(pieces, max_chars)
+
+
+def _pack(pieces: List[str], max_chars: int) -> List[str]:
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current} {piece}".strip()
+        if current and len(candidate) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def segment_for_speech(text: str, max_chars: int = 200) -> List[str]:
+    """Group sentences into chunks of at most ``max_chars`` for independent synthesis.
+
+    Short sentences are packed together to limit request count; sentences longer than
+    ``max_chars`` are split at clauses (``, ; : —``) and, as a last resort, between words.
+    """
+    pieces: List[str] = []
+    for sentence in split_sentences(text):
+        pieces.extend(_split_long(sentence, max_chars))
+    return _pack(pieces, max_chars)
+
+
+__all__ = ["segment_for_speech", "split_sentences", "words"]
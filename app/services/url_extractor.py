@@ -2,10 +2,25 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
 
 from app.domain.dto import SemanticChunk
+from app.services.article_parser import NativeArticleParser
+from app.services.cache import CacheStats, TTLCache
+from app.services.chunking import SemanticChunker
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
 
 
 class ArticleExtractionResult:
@@ -26,23 +41,241 @@ class ArticleExtractionResult:
         self.images = images or []
 
 
+_TRACKING_PARAM_PREFIXES = ("utm_",)
+_TRACKING_PARAMS = {"fbclid", "gclid"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key: lower-case scheme/host, no fragment, default port or tracking params."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in _TRACKING_PARAMS and not key.startswith(_TRACKING_PARAM_PREFIXES)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+@dataclass(frozen=True)
+class CachedArticle:
+    """A parsed article plus the validators needed to revalidate it with the origin."""
+
+    result: ArticleExtractionResult
+    content_hash: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+ArticleParser = Callable[[str, str], Optional[ArticleExtractionResult]]
+
+
 class URLContentExtractor:
     """Extract article content and images from URLs."""
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        timeout: float = 15.0,
+        user_agent: str = DEFAULT_USER_AGENT,
+        cache: Optional[TTLCache[str, CachedArticle]] = None,
+        parser_mode: str = "native",
+        min_article_chars: int = 200,
+        chunker: Optional[SemanticChunker] = None,
+        download_deadline_seconds: Optional[float] = None,
+        client: Optional[httpx.Client] = None,
+    ):
+        """
+        Parameters
+        ----------
+        download_deadline_seconds:
+            Wall-clock budget for one download. ``timeout`` only bounds each network wait, so
+            a host that trickles bytes could otherwise hold a fetch worker indefinitely.
+        parser_mode:
+            ``"native"`` parses with :class:`NativeArticleParser` and falls back to newspaper3k
+            when it recovers fewer than ``min_article_chars`` characters; ``"newspaper"`` always
+            uses newspaper3k.
+        """
+        if parser_mode not in {"native", "newspaper"}:
+            raise ValueError(f"Unknown parser_mode: {parser_mode}")
         self._logger = logger or logging.getLogger(__name__)
+        self._timeout = timeout
+        self._download_deadline_seconds = download_deadline_seconds
+        self._user_agent = user_agent
+        self._cache = cache
+        self._parser_mode = parser_mode
+        self._min_article_chars = min_article_chars
+        self._native_parser = NativeArticleParser()
+        self._chunker = chunker or SemanticChunker()
+        self._client: Optional[httpx.Client] = client
+        self._client_lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # The cache, client and lock are process-local; worker processes only need the parsing configuration.
+        state = self.__dict__.copy()
+        state.update(_cache=None, _client=None, _client_lock=None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._client_lock = threading.Lock()
+
+    def extract(self, url: str, parser: Optional[ArticleParser] = None) -> Optional[ArticleExtractionResult]:
+        """Download and parse an article, reusing the cached parse when the origin reports no change.
+
+        ``parser`` replaces ``self.parse``, e.g. to run parsing in a worker pool.
+        """
+        parser = parser or self.parse
+        if self._cache is None:
+            html = self.fetch(url)
+            return parser(url, html) if html is not None else None
+
+        key = normalize_url(url)
+        cached = self._cache.get(key)
+        response = self._download(url, cached.conditional_headers() if cached else None)
+        if response is None:
+            if cached is not None:
+                self._logger.info("Serving cached article for %s after download failure", url)
+                return cached.result
+            return None
+
+        if cached is not None and response.status_code == 304:
+            self._logger.info("Article not modified, reusing cached extraction: %s", url)
+            self._cache.touch(key)
+            return cached.result
+
+        html = response.text
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if cached is not None and cached.content_hash == content_hash:
+            # Origin has no validators (or ignored them) but the body is unchanged
+            self._cache.touch(key)
+            return cached.result
 
-    def extract(self, url: str) -> Optional[ArticleExtractionResult]:
-        """Extract article content from URL using newspaper3k and textblob."""
+        result = parser(url, html)
+        if result is not None:
+            self._cache.put(
+                key,
+                CachedArticle(
+                    result=result,
+                    content_hash=content_hash,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                ),
+            )
+        return result
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Download the raw article HTML (network-bound half of ``extract``)."""
+        response = self._download(url)
+        return response.text if response is not None else None
+
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self._cache.stats() if self._cache is not None else None
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _http_client(self) -> httpx.Client:
+        # One pooled client per extractor keeps TLS connections alive across articles
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        timeout=self._timeout,
+                        follow_redirects=True,
+                        headers={"User-Agent": self._user_agent},
+                        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+                    )
+        return self._client
+
+    def _download(self, url: str, headers: Optional[dict[str, str]] = None) -> Optional[httpx.Response]:
+        try:
+            self._logger.info("Starting article extraction from URL: %s", url)
+            if self._download_deadline_seconds is None:
+                response = self._http_client().get(url, headers=headers)
+            else:
+                response = self._download_within_deadline(url, headers, self._download_deadline_seconds)
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+        except Exception as e:
+            self._logger.error("Failed to download article from URL %s: %s", url, e)
+            return None
+
+    def _download_within_deadline(
+        self, url: str, headers: Optional[dict[str, str]], deadline_seconds: float
+    ) -> httpx.Response:
+        deadline = time.monotonic() + deadline_seconds
+        timeout = min(self._timeout, deadline_seconds)
+        with self._http_client().stream("GET", url, headers=headers, timeout=timeout) as response:
+            body = bytearray()
+            for chunk in response.iter_bytes():
+                body += chunk
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"download exceeded {deadline_seconds:.1f}s")
+        # The body is already decoded; drop the headers describing the encoded transfer
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in {"content-encoding", "content-length", "transfer-encoding"}
+        ]
+        return httpx.Response(response.status_code, headers=headers, content=bytes(body), request=response.request)
+
+    def parse(self, url: str, html: str) -> Optional[ArticleExtractionResult]:
+        """Parse downloaded HTML (CPU-bound half of ``extract``)."""
+        if self._parser_mode == "native":
+            result = self.parse_native(url, html)
+            if result is not None:
+                return result
+            self._logger.info("Native parser found too little text, falling back to newspaper3k: %s", url)
+        return self.parse_with_newspaper(url, html)
+
+    def parse_native(self, url: str, html: str) -> Optional[ArticleExtractionResult]:
+        """Parse with the built-in parser; None when the page yields less than ``min_article_chars``."""
+        try:
+            parsed = self._native_parser.parse(url, html)
+        except Exception as e:
+            self._logger.warning("Native article parse failed for %s: %s", url, e)
+            return None
+        if len(parsed.text) < self._min_article_chars:
+            return None
+        self._logger.info(
+            "Extracted article from URL: title=%s, text_length=%d, summary_length=%d, images=%d",
+            parsed.title[:50],
+            len(parsed.text),
+            len(parsed.summary),
+            len(parsed.images),
+        )
+        return ArticleExtractionResult(
+            title=parsed.title or "Untitled Article",
+            text=parsed.text,
+            summary=parsed.summary,
+            top_image_url=parsed.top_image_url,
+            images=parsed.images,
+        )
+
+    def parse_with_newspaper(self, url: str, html: str) -> Optional[ArticleExtractionResult]:
+        """Parse downloaded HTML with newspaper3k."""
         try:
             from newspaper import Article
-            from textblob import TextBlob
 
-            self._logger.info("Starting article extraction from URL: %s", url)
             article = Article(url)
-            
-            self._logger.debug("Downloading article...")
-            article.download()
+            # Hand the pre-fetched HTML to newspaper3k instead of letting it download again
+            article.download(input_html=html)
             
             self._logger.debug("Parsing article...")
             article.parse()
@@ -51,41 +284,8 @@ class URLContentExtractor:
             title = article.title or "Untitled Article"
             text = article.text or "No article content available."
             
-            # Use textblob for better text processing and summary
-            try:
-                self._logger.debug("Processing text with TextBlob...")
-                blob = TextBlob(text)
-                
-                # Get better summary using textblob's sentence extraction
-                # Take first 3 sentences as summary if available
-                sentences = blob.sentences
-                if len(sentences) > 0:
-                    # Use first 2-3 sentences for summary (up to 300 chars)
-                    summary_parts = []
-                    for sent in sentences[:3]:
-                        if len(" ".join(summary_parts) + " " + str(sent)) <= 300:
-                            summary_parts.append(str(sent))
-                        else:
-                            break
-                    summary = " ".join(summary_parts) if summary_parts else text[:300]
-                else:
-                    summary = text[:300]
-                
-                # Extract keywords using noun phrases
-                try:
-                    keywords = [str(np) for np in blob.noun_phrases[:10]]
-                    self._logger.debug("Extracted keywords: %s", keywords[:5])
-                except Exception:
-                    keywords = []
-                
-            except Exception as textblob_error:
-                self._logger.debug("TextBlob processing failed (non-critical): %s", textblob_error)
-                # Fallback to newspaper3k NLP or simple truncation
-                try:
-                    article.nlp()  # Try newspaper3k NLP
-                    summary = article.summary or text[:300]
-                except Exception:
-                    summary = text[:300]
+            # Extractive summary (shared with the native parser) instead of the first few sentences
+            summary = self._native_parser.summarize(text)
 
             # Extract images
             top_image = article.top_image
@@ -117,25 +317,18 @@ class URLContentExtractor:
             return None
 
     def to_semantic_chunks(self, result: ArticleExtractionResult, url: str) -> list[SemanticChunk]:
-        """Convert extraction result to semantic chunks."""
-        chunks = []
-
-        # Main content chunk
-        if result.text:
-            chunks.append(
-                SemanticChunk(
-                    id=f"url:{url}",
-                    text=result.text,
-                    source_id=url,
-                    metadata={
-                        "title": result.title,
-                        "summary": result.summary,
-                        "source": "url_extraction",
-                        "top_image_url": result.top_image_url,
-                        "image_count": len(result.images),
-                    },
-                )
-            )
-
-        return chunks
-
+        """Convert extraction result to paragraph-aware semantic chunks."""
+        if not result.text:
+            return []
+        return self._chunker.chunk(
+            result.text,
+            id_prefix=f"url:{url}",
+            source_id=url,
+            metadata={
+                "title": result.title,
+                "summary": result.summary,
+                "source": "url_extraction",
+                "top_image_url": result.top_image_url,
+                "image_count": len(result.images),
+            },
+        )
@@ -3,15 +3,22 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Iterable, Optional, Protocol, Sequence
+from typing import Callable, Iterable, Optional, Protocol, Sequence
 from uuid import uuid4
 
 import httpx
 from pydantic import HttpUrl
 
-from app.domain.dto import LanguageMetadata, SlideDeck, VoiceAsset
+from app.domain.dto import LanguageMetadata, NarrationTrack, SlideDeck, VoiceAsset
 from app.domain.interfaces import VoiceSynthesisService
+from app.services.narration_track import Mp3Frame, NarrationInput, NarrationTrackAssembler, iter_frames, join_frames
+from app.services.s3_clients import get_s3_client
+from app.services.text_segmentation import segment_for_speech
 
 
 class VoiceProvider(Protocol):
@@ -46,29 +53,66 @@ class VoiceStorageService(Protocol):
 class DefaultVoiceSynthesisService(VoiceSynthesisService):
     """Coordinate voice providers and storage to produce voice assets."""
 
-    def __init__(self, providers: Sequence[VoiceProvider], storage: VoiceStorageService) -> None:
+    def __init__(
+        self,
+        providers: Sequence[VoiceProvider],
+        storage: VoiceStorageService,
+        track_assembler: Optional[NarrationTrackAssembler] = None,
+    ) -> None:
         self._providers = list(providers)
         self._storage = storage
+        self._track_assembler = track_assembler
 
     def synthesize(self, deck: SlideDeck, language: LanguageMetadata, provider: str) -> list[VoiceAsset]:
+        return [item.asset for item in self._synthesize_slides(deck, language, provider)]
+
+    def synthesize_with_track(
+        self, deck: SlideDeck, language: LanguageMetadata, provider: str
+    ) -> tuple[list[VoiceAsset], Optional[NarrationTrack]]:
+        """Synthesize per-slide audio and, when configured, the combined narration track.
+
+        The per-slide bytes are still in memory at this point, so the track is assembled
+        without downloading the uploaded assets again.
+        """
+        results = self._synthesize_slides(deck, language, provider)
+        assets = [item.asset for item in results]
+        if self._track_assembler is None or not results:
+            return assets, None
+        try:
+            track = self._track_assembler.assemble(results, provider=provider)
+        except Exception as exc:
+            logging.getLogger(__name__).warning("Narration track assembly failed: %s", exc)
+            track = None
+        return assets, track
+
+    def _synthesize_slides(
+        self, deck: SlideDeck, language: LanguageMetadata, provider: str
+    ) -> list[NarrationInput]:
         voice_provider = self._resolve_provider(provider)
         if voice_provider is None:
             return []
 
         # Generate separate audio for each slide (not combined)
-        assets: list[VoiceAsset] = []
-        for slide in deck.slides:
+        results: list[NarrationInput] = []
+        for index, slide in enumerate(deck.slides):
             if not slide.text or not slide.text.strip():
                 continue  # Skip empty slides
             
             # Use slide text directly (no "Slide 1:", "Slide 2:" prefix)
             slide_text = slide.text.strip()
-            audio = voice_provider.synthesize(slide_text, language=language.language_code)
+            try:
+                audio = voice_provider.synthesize(slide_text, language=language.language_code)
+            except Exception as exc:
+                # One bad slide costs only its own audio, not the assets already stored for the others
+                logging.getLogger(__name__).warning("Voice synthesis failed for slide %d, skipping it: %s", index, exc)
+                continue
             filename = f"{uuid4()}.{audio.format}"
             asset = self._storage.store(audio=audio, filename=filename)
-            assets.append(asset)
+            results.append(
+                NarrationInput(slide_index=index, slide=slide, audio_bytes=audio.audio_bytes, asset=asset)
+            )
         
-        return assets
+        return results
 
     def _resolve_provider(self, provider_id: str) -> Optional[VoiceProvider]:
         for voice_provider in self._providers:
@@ -85,9 +129,23 @@ class ElevenLabsClient:
 
     name = "elevenlabs_pro"
 
-    def __init__(self, api_key: str, voice_id: str) -> None:
+    def __init__(
+        self, api_key: str, voice_id: str, timeout: float = 30.0, fallback_on_error: bool = True
+    ) -> None:
+        """
+        Parameters
+        ----------
+        timeout:
+            HTTP timeout for a single synthesis request.
+        fallback_on_error:
+            Return placeholder bytes instead of raising when the request fails. Disable it when
+            the client sits behind a ``HedgedVoiceProvider`` so failures can trigger failover.
+        """
+
         self._api_key = api_key
         self._voice_id = voice_id
+        self._timeout = timeout
+        self._fallback_on_error = fallback_on_error
 
     def supports(self, provider_id: str) -> bool:
         return provider_id == self.name
@@ -103,7 +161,7 @@ class ElevenLabsClient:
             "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
         }
         try:
-            with httpx.Client(timeout=30.0) as client:
+            with httpx.Client(timeout=self._timeout) as client:
                 response = client.post(
                     f"https://api.elevenlabs.io/v1/text-to-speech/{self._voice_id}",
                     headers=headers,
@@ -112,6 +170,8 @@ class ElevenLabsClient:
                 response.raise_for_status()
                 audio_bytes = response.content
         except Exception as exc:  # pragma: no cover - network fallback
+            if not self._fallback_on_error:
+                raise
             logging.getLogger(__name__).warning("ElevenLabs synthesis failed: %s", exc)
             audio_bytes = f"ELEVENLABS:{language}:{text}".encode("utf-8")
         return VoiceGenerationResult(
@@ -124,10 +184,14 @@ class AzureTTSClient:
 
     name = "azure_basic"
 
-    def __init__(self, api_key: str, region: str, voice: str) -> None:
+    def __init__(
+        self, api_key: str, region: str, voice: str, timeout: float = 30.0, fallback_on_error: bool = True
+    ) -> None:
         self._api_key = api_key
         self._region = region
         self._voice = voice
+        self._timeout = timeout
+        self._fallback_on_error = fallback_on_error
 
     def supports(self, provider_id: str) -> bool:
         return provider_id == self.name
@@ -145,11 +209,13 @@ class AzureTTSClient:
         )
         url = f"https://{self._region}.tts.speech.microsoft.com/cognitiveservices/v1"
         try:
-            with httpx.Client(timeout=30.0) as client:
+            with httpx.Client(timeout=self._timeout) as client:
                 response = client.post(url, headers=headers, content=ssml.encode("utf-8"))
                 response.raise_for_status()
                 audio_bytes = response.content
         except Exception as exc:  # pragma: no cover - network fallback
+            if not self._fallback_on_error:
+                raise
             logging.getLogger(__name__).warning("Azure TTS synthesis failed: %s", exc)
             audio_bytes = f"AZURE:{language}:{text}".encode("utf-8")
         return VoiceGenerationResult(
@@ -157,6 +223,257 @@ class AzureTTSClient:
         )
 
 
+# --- Failover ----------------------------------------------------------------
+
+
+class VoiceSynthesisError(RuntimeError):
+    """Raised when no provider in a failover chain produced audio."""
+
+
+class ProviderCircuitBreaker:
+    """Track consecutive failures per provider and skip degraded providers for a cooldown.
+
+    After the cooldown the circuit is half-open: ``acquire`` lets exactly one trial call
+    through, and every other caller still sees the provider as unavailable until that
+    trial succeeds (closing the circuit) or fails (re-arming the cooldown).
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = max(1, failure_threshold)
+        self._cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+        self._trials: set[str] = set()
+        self._lock = threading.Lock()
+
+    def is_available(self, provider: str) -> bool:
+        """Closed circuits are available; open ones only once the cooldown is over and no trial is running."""
+        with self._lock:
+            return self._is_available(provider)
+
+    def acquire(self, provider: str) -> bool:
+        """Claim a call to ``provider``; on a half-open circuit only the first caller gets the trial."""
+        with self._lock:
+            if not self._is_available(provider):
+                return False
+            if provider in self._opened_at:
+                self._trials.add(provider)
+            return True
+
+    def record_success(self, provider: str) -> None:
+        with self._lock:
+            self._failures.pop(provider, None)
+            self._opened_at.pop(provider, None)
+            self._trials.discard(provider)
+
+    def record_failure(self, provider: str) -> None:
+        with self._lock:
+            failures = self._failures.get(provider, 0) + 1
+            self._failures[provider] = failures
+            self._trials.discard(provider)
+            if failures >= self._failure_threshold:
+                # Re-arms the cooldown when a half-open trial call fails as well
+                self._opened_at[provider] = self._clock()
+
+    def _is_available(self, provider: str) -> bool:
+        opened_at = self._opened_at.get(provider)
+        if opened_at is None:
+            return True
+        return provider not in self._trials and self._clock() - opened_at >= self._cooldown_seconds
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies used to derive the hedge delay."""
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        window: int = 50,
+        min_samples: int = 5,
+        initial_delay: float = 3.0,
+        min_delay: float = 0.25,
+        max_delay: float = 10.0,
+    ) -> None:
+        self._percentile = min(max(percentile, 0.0), 1.0)
+        self._window = window
+        self._min_samples = min_samples
+        self._initial_delay = initial_delay
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(provider, deque(maxlen=self._window)).append(seconds)
+
+    def hedge_delay(self, provider: str) -> float:
+        """Return the configured percentile of recent latencies, clamped to the delay bounds."""
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if len(samples) < self._min_samples:
+            return self._initial_delay
+        index = min(len(samples) - 1, int(self._percentile * len(samples)))
+        return min(self._max_delay, max(self._min_delay, samples[index]))
+
+
+class HedgedVoiceProvider:
+    """Provider chain that hedges slow calls and fails over to the next healthy provider.
+
+    The primary provider is called first. If it has not answered within its hedge delay
+    (a latency percentile), or fails outright, the next provider whose circuit is closed is
+    started as well, and the first successful result wins.
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[VoiceProvider],
+        *,
+        breaker: Optional[ProviderCircuitBreaker] = None,
+        latency: Optional[LatencyTracker] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        if not providers:
+            raise ValueError("At least one VoiceProvider must be provided.")
+        self._providers = list(providers)
+        self.name = self._providers[0].name
+        self._breaker = breaker or ProviderCircuitBreaker()
+        self._latency = latency or LatencyTracker()
+        self._executor = executor or ThreadPoolExecutor(max_workers=8, thread_name_prefix="voice-hedge")
+        self._logger = logger or logging.getLogger(__name__)
+
+    def supports(self, provider_id: str) -> bool:
+        return self._providers[0].supports(provider_id)
+
+    def synthesize(self, text: str, *, language: str) -> VoiceGenerationResult:
+        candidates = [provider for provider in self._providers if self._breaker.is_available(provider.name)]
+        if not candidates:
+            raise VoiceSynthesisError(f"All voice providers are cooling down: {[p.name for p in self._providers]}")
+
+        pending: dict[Future, VoiceProvider] = {}
+        errors: list[str] = []
+        next_index = 0
+        started = 0
+        while True:
+            provider = None
+            while provider is None and next_index < len(candidates):
+                candidate = candidates[next_index]
+                next_index += 1
+                # Another caller may have taken a half-open provider's single trial call meanwhile
+                if self._breaker.acquire(candidate.name):
+                    provider = candidate
+            if provider is not None:
+                if started:
+                    self._logger.info("Voice failover: starting %s", provider.name)
+                started += 1
+                pending[self._submit(provider, text, language)] = provider
+                # Wait for the most recently started provider's hedge delay before starting another
+                timeout = self._latency.hedge_delay(provider.name) if next_index < len(candidates) else None
+            else:
+                timeout = None
+            if not pending:
+                break
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as exc:
+                    errors.append(f"{provider.name}: {exc}")
+
+        if not errors:
+            raise VoiceSynthesisError(f"All voice providers are cooling down: {[p.name for p in self._providers]}")
+        raise VoiceSynthesisError("All voice providers failed: " + "; ".join(errors))
+
+    def _submit(self, provider: VoiceProvider, text: str, language: str) -> Future:
+        started = time.monotonic()
+
+        def call() -> VoiceGenerationResult:
+            try:
+                result = provider.synthesize(text, language=language)
+            except Exception:
+                self._breaker.record_failure(provider.name)
+                raise
+            # Losing hedges still complete in the background and feed the statistics
+            self._breaker.record_success(provider.name)
+            self._latency.record(provider.name, time.monotonic() - started)
+            return result
+
+        return self._executor.submit(call)
+
+
+class ChunkedVoiceProvider:
+    """Split long narrations into sentence chunks, synthesize them in parallel and join the MP3 frames.
+
+    Texts up to ``threshold_chars`` go straight to the wrapped provider. Longer texts are
+    segmented so per-slide latency is bounded by the slowest chunk rather than the whole
+    paragraph. If any chunk does not come back as MP3, or the chunks disagree on provider,
+    voice or MP3 stream parameters (a hedged provider can answer chunks from different
+    backends), the full text is synthesized in one call instead.
+    """
+
+    def __init__(
+        self,
+        provider: VoiceProvider,
+        *,
+        threshold_chars: int = 400,
+        chunk_chars: int = 200,
+        executor: Optional[ThreadPoolExecutor] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._provider = provider
+        self.name = provider.name
+        self._threshold_chars = threshold_chars
+        self._chunk_chars = chunk_chars
+        self._executor = executor or ThreadPoolExecutor(max_workers=4, thread_name_prefix="voice-chunk")
+        self._logger = logger or logging.getLogger(__name__)
+
+    def supports(self, provider_id: str) -> bool:
+        return self._provider.supports(provider_id)
+
+    def synthesize(self, text: str, *, language: str) -> VoiceGenerationResult:
+        chunks = segment_for_speech(text, self._chunk_chars) if len(text) > self._threshold_chars else []
+        if len(chunks) < 2:
+            return self._provider.synthesize(text, language=language)
+
+        futures = [self._executor.submit(self._provider.synthesize, chunk, language=language) for chunk in chunks]
+        results = [future.result() for future in futures]
+        parts = [list(iter_frames(result.audio_bytes)) for result in results]
+        if not all(parts):
+            self._logger.warning("Chunked synthesis returned non-MP3 audio, synthesizing %d chars in one call", len(text))
+            return self._provider.synthesize(text, language=language)
+        sources = {self._source(result, frames) for result, frames in zip(results, parts)}
+        if len(sources) > 1:
+            self._logger.warning(
+                "Chunks came from different voices/streams %s, synthesizing %d chars in one call", sorted(map(str, sources)), len(text)
+            )
+            return self._provider.synthesize(text, language=language)
+
+        first = results[0]
+        metadata = dict(first.metadata or {})
+        metadata["chunks"] = len(chunks)
+        return VoiceGenerationResult(
+            audio_bytes=join_frames(parts),
+            format=first.format,
+            voice_id=first.voice_id,
+            metadata=metadata,
+        )
+
+    @staticmethod
+    def _source(result: VoiceGenerationResult, frames: Sequence[Mp3Frame]) -> tuple:
+        """What must match across chunks: provider, voice and every frame's stream parameters."""
+        signatures = frozenset(frame.header.stream_signature for frame in frames)
+        return ((result.metadata or {}).get("provider"), result.voice_id, signatures)
+
+
 # --- Storage Implementation ---------------------------------------------------
 
 
@@ -186,17 +503,12 @@ class S3VoiceStorageService:
         """Lazy-load boto3 S3 client."""
         if self._s3_client is None:
             try:
-                import boto3
-                if self._aws_access_key and self._aws_secret_key:
-                    self._s3_client = boto3.client(
-                        "s3",
-                        aws_access_key_id=self._aws_access_key,
-                        aws_secret_access_key=self._aws_secret_key,
-                        region_name=self._aws_region or "us-east-1",
-                    )
-                else:
-                    # Use default credentials (IAM role, env vars, etc.)
-                    self._s3_client = boto3.client("s3", region_name=self._aws_region or "us-east-1")
+                # Without explicit keys the default credentials (IAM role, env vars, etc.) apply
+                self._s3_client = get_s3_client(
+                    region=self._aws_region or "us-east-1",
+                    access_key=self._aws_access_key,
+                    secret_key=self._aws_secret_key,
+                )
             except ImportError:
                 self._logger.warning("boto3 not installed, S3 uploads will be simulated")
                 return None
@@ -234,7 +546,12 @@ __all__ = [
     "DefaultVoiceSynthesisService",
     "ElevenLabsClient",
     "AzureTTSClient",
+    "ChunkedVoiceProvider",
+    "HedgedVoiceProvider",
+    "LatencyTracker",
+    "ProviderCircuitBreaker",
     "S3VoiceStorageService",
+    "VoiceSynthesisError",
     "VoiceProvider",
     "VoiceStorageService",
     "VoiceGenerationResult",
@@ -0,0 +1,108 @@
+"""Compare per-worker memory and cold start with and without FastText preloading.
+
+Usage::
+
+    python benchmarks/bench_fasttext_preload.py --model lid.176.bin [--workers N]
+
+Each mode forks ``N`` workers the way gunicorn does. ``per-worker`` loads the model
+inside every worker (the old constructor behaviour); ``preload`` loads it once in the
+parent before forking (``preload_fasttext_model``). Every worker then runs one batched
+``detect_many`` and reports its model-ready time and its private/proportional memory
+from ``/proc/self/smaps_rollup``. Linux only; needs the ``fasttext`` package.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services import language_detection  # noqa: E402
+from app.services.language_detection import FastTextLanguageDetectionStrategy  # noqa: E402
+
+SAMPLES = [
+    "The government announced a new scheme for farmers on Monday.",
+    "प्रधानमंत्री ने आज नई दिल्ली में किसानों के लिए नई योजना की घोषणा की।",
+    "Mumbai mein baarish ki wajah se local trains band hai",
+    "El presidente anunció nuevas medidas económicas para el país.",
+] * 64
+
+
+def memory_kb() -> Dict[str, int]:
+    fields: Dict[str, int] = {}
+    with open("/proc/self/smaps_rollup", encoding="ascii") as rollup:
+        for line in rollup:
+            parts = line.split()
+            if len(parts) >= 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields
+
+
+def worker(model_path: str, started: float, write_fd: int) -> None:
+    strategy = FastTextLanguageDetectionStrategy(model_path)
+    ready = time.perf_counter() - started
+    strategy.detect_many(SAMPLES)
+    memory = memory_kb()
+    report = {
+        "ready_ms": ready * 1000,
+        "private_mb": (memory.get("Private_Clean", 0) + memory.get("Private_Dirty", 0)) / 1024,
+        "pss_mb": memory.get("Pss", 0) / 1024,
+    }
+    os.write(write_fd, (json.dumps(report) + "\n").encode())
+    os._exit(0)
+
+
+def run(name: str, model_path: str, workers: int, preload: bool) -> None:
+    language_detection._shared_models.clear()
+    if preload:
+        language_detection.preload_fasttext_model(model_path)
+    read_fd, write_fd = os.pipe()
+    children: List[int] = []
+    for _ in range(workers):
+        started = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            try:
+                worker(model_path, started, write_fd)
+            finally:
+                os._exit(1)  # never fall back into the parent's code
+        children.append(pid)
+    os.close(write_fd)
+    for pid in children:
+        os.waitpid(pid, 0)
+    with os.fdopen(read_fd) as pipe:
+        reports = [json.loads(line) for line in pipe if line.strip()]
+    if not reports:
+        raise SystemExit(f"{name}: no worker finished (see errors above)")
+
+    def median(key: str) -> float:
+        return statistics.median(report[key] for report in reports)
+
+    print(
+        f"{name:<11} ready {median('ready_ms'):>8.1f} ms  private {median('private_mb'):>7.1f} MB  "
+        f"PSS {median('pss_mb'):>7.1f} MB  (median of {len(reports)} workers)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", required=True, help="Path to a FastText language-id model (lid.176.bin)")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    if not Path("/proc/self/smaps_rollup").exists():
+        parser.exit(1, "needs Linux /proc/self/smaps_rollup\n")
+
+    run("per-worker", args.model, args.workers, preload=False)
+    run("preload", args.model, args.workers, preload=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Compare compiled-template rendering with the per-key ``str.replace`` renderer.
+
+Usage::
+
+    python benchmarks/bench_html_render.py [--iterations N] [--slides 10]
+
+Renders a synthetic ``slides``-slide story into ``test-news-1.html`` (news) and
+``curious-template-1.html`` (curious). ``legacy`` is the previous render path: read the
+template from disk, then two ``str.replace`` calls and a markdown clean for every
+placeholder key, then the slides marker. ``compiled`` is ``HTMLTemplateRenderer.render``
+with its compiled-template cache warm. Both outputs are checked to be identical. The
+``substitution`` line times only the placeholder step (template load + fill).
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import UUID
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.domain.dto import (  # noqa: E402
+    DocInsights,
+    ImageAsset,
+    Mode,
+    SemanticChunk,
+    SlideBlock,
+    SlideDeck,
+    StoryRecord,
+    VoiceAsset,
+)
+from app.services.html_renderer import HTMLTemplateRenderer  # noqa: E402
+from app.services.sanitization import clean_markdown, cleanup_urls  # noqa: E402
+
+TEMPLATES = [(Mode.NEWS, "test-news-1"), (Mode.CURIOUS, "curious-template-1")]
+
+
+def make_record(mode: Mode, template_key: str, slides: int) -> StoryRecord:
+    texts = [f"**Slide {index}**: flood waters rose in *Guwahati* as [officials](https://example.org) said" for index in range(slides)]
+    return StoryRecord(
+        id=UUID(int=42),
+        mode=mode,
+        category="News",
+        input_language="en",
+        slide_count=slides,
+        template_key=template_key,
+        doc_insights=DocInsights(
+            semantic_chunks=[SemanticChunk(id="c1", text="Brahmaputra crosses the danger mark in Assam.")],
+            summaries=["Brahmaputra crosses the danger mark."],
+        ),
+        slide_deck=SlideDeck(
+            template_key=template_key,
+            language_code="en",
+            slides=[SlideBlock(placeholder_id=f"section_{i + 1}", text=text) for i, text in enumerate(texts)],
+        ),
+        image_assets=[
+            ImageAsset(source="ai", original_object_key=f"media/{i}.png", resized_variants=[f"https://cdn.example.org/{i}.png"])
+            for i in range(slides)
+        ],
+        voice_assets=[
+            VoiceAsset(provider="azure_basic", audio_url=f"https://cdn.example.org/{i}.mp3", duration_seconds=4.0)
+            for i in range(slides)
+        ],
+        canurl="https://stories.example.org/s/42",
+        canurl1="https://stories.example.org/s/42/amp",
+    )
+
+
+class LegacyRenderer(HTMLTemplateRenderer):
+    """The render path before templates were compiled."""
+
+    def render(self, record, template_key, template_source="file", image_source=None):
+        placeholders = self._mapper.map(record, image_source=image_source)
+        template_html = self.substitute(record, template_key, template_source, placeholders)
+        slides_html = self._generate_all_slides(record, template_key, placeholders, image_source=image_source)
+        template_html = template_html.replace("<!--INSERT_SLIDES_HERE-->", slides_html)
+        return cleanup_urls(template_html)
+
+    def substitute(self, record, template_key, template_source, placeholders):
+        # Uncached, as TemplateLoader.load used to be
+        template_html = self._loader._resolve_file_path(template_key, record.mode).read_text(encoding="utf-8")
+        for key, value in placeholders.items():
+            cleaned_value = clean_markdown(str(value))
+            template_html = template_html.replace(f"{{{{{key}}}}}", cleaned_value)
+            template_html = template_html.replace(f"{{{{{key}|safe}}}}", cleaned_value)
+        return template_html
+
+
+def timed(call, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--slides", type=int, default=10)
+    args = parser.parse_args()
+
+    legacy, compiled = LegacyRenderer(), HTMLTemplateRenderer()
+    for renderer in (legacy, compiled):
+        renderer._logger.disabled = True
+        renderer._loader._logger.disabled = True
+
+    for mode, template_key in TEMPLATES:
+        record = make_record(mode, template_key, args.slides)
+        expected = legacy.render(record, template_key)
+        if compiled.render(record, template_key) != expected:
+            raise SystemExit(f"{template_key}: compiled output differs from the legacy renderer")
+        placeholders = compiled._mapper.map(record)
+        rows = [
+            (
+                "full render",
+                timed(lambda: legacy.render(record, template_key), args.iterations),
+                timed(lambda: compiled.render(record, template_key), args.iterations),
+            ),
+            (
+                "substitution",
+                timed(lambda: legacy.substitute(record, template_key, "file", placeholders), args.iterations),
+                timed(
+                    lambda: compiled._compiled_template(template_key, record.mode, "file").render(
+                        placeholders, transform=clean_markdown
+                    ),
+                    args.iterations,
+                ),
+            ),
+        ]
+        print(f"{template_key} ({len(expected) / 1024:.1f} KiB, {args.slides} slides, median of {args.iterations}):")
+        for label, before, after in rows:
+            print(f"  {label:<13} legacy {before:7.3f} ms  compiled {after:7.3f} ms  ({before / after:.1f}x)")
+
+if __name__ == "__main__":
+    main()
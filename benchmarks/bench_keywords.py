@@ -0,0 +1,105 @@
+"""Benchmark TF-IDF keyword extraction against the previous raw-count keywords.
+
+Usage::
+
+    python benchmarks/bench_keywords.py [--tokens N] [--corpus-docs D] [--repeat R]
+
+A background corpus of ``D`` synthetic stories trains the document-frequency table; the
+measured input is one ``N``-token story (English and Hindi halves) with planted topic
+phrases. Reported: extraction time per input and how many planted phrases/words reach
+the top 10 (the previous extractor could not return phrases or most Hindi words).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.keywords import DocumentFrequencyTable, KeywordExtractor, segment_terms  # noqa: E402
+
+COMMON = (
+    "government officials people state police city district minister report week water market "
+    "company school health court election party village farmers price project"
+).split()
+HINDI_COMMON = "सरकार अधिकारी लोग राज्य पुलिस शहर जिला मंत्री रिपोर्ट पानी बाजार कंपनी स्कूल चुनाव".split()
+FUNCTION = "the of and to in on for with said was is that by at from".split()
+HINDI_FUNCTION = "के में की से को और ने है पर भी".split()
+PLANTED = ["brahmaputra embankment", "relief camps", "ब्रह्मपुत्र तटबंध", "राहत शिविर"]
+
+
+def sentence(rng: random.Random, content: List[str], function: List[str], planted: List[str]) -> str:
+    tokens = [rng.choice(content if rng.random() < 0.6 else function) for _ in range(rng.randint(8, 16))]
+    if planted and rng.random() < 0.15:
+        tokens.insert(rng.randrange(len(tokens)), rng.choice(planted))
+    return " ".join(tokens) + "."
+
+
+def story(rng: random.Random, tokens: int, planted: bool) -> str:
+    parts: List[str] = []
+    count = 0
+    while count < tokens:
+        hindi = count >= tokens // 2
+        line = sentence(
+            rng,
+            HINDI_COMMON if hindi else COMMON,
+            HINDI_FUNCTION if hindi else FUNCTION,
+            [phrase for phrase in PLANTED if (phrase[0] > "z") == hindi] if planted else [],
+        )
+        parts.append(line)
+        count += len(line.split())
+    return " ".join(parts)
+
+
+def legacy_keywords(text: str, limit: int = 10) -> List[str]:
+    """The extractor analysis.py used before: raw counts of alphabetic tokens over 3 chars."""
+    tokens = [
+        token.strip(".,!?()[]{}\"'").lower() for token in text.split() if token and token.isalpha() and len(token) > 3
+    ]
+    return [word for word, _ in Counter(tokens).most_common(limit)]
+
+
+def planted_hits(keywords: List[str]) -> int:
+    found = " | ".join(keywords)
+    return sum(1 for phrase in PLANTED if phrase in found or any(part in keywords for part in phrase.split()))
+
+
+def run(name: str, extract: Callable[[str], List[str]], text: str, repeat: int) -> None:
+    timings = []
+    keywords: List[str] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        keywords = extract(text)
+        timings.append(time.perf_counter() - started)
+    print(f"{name:<8} {min(timings) * 1000:>8.1f} ms  planted in top 10: {planted_hits(keywords)}/{len(PLANTED)}")
+    print(f"         {', '.join(keywords)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=100_000)
+    parser.add_argument("--corpus-docs", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    extractor = KeywordExtractor(DocumentFrequencyTable())
+    started = time.perf_counter()
+    for _ in range(args.corpus_docs):
+        extractor.observe(segment_terms(story(rng, 400, planted=False)))
+    print(f"trained DF table on {args.corpus_docs} stories in {time.perf_counter() - started:.2f}s")
+
+    text = story(rng, args.tokens, planted=True)
+    print(f"input: {len(text.split())} tokens, best of {args.repeat}")
+    run("legacy", legacy_keywords, text, args.repeat)
+    run("tf-idf", lambda value: extractor.extract(value, limit=10), text, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Measure what a fresh boto3 S3 client per call costs versus the shared registry.
+
+Usage::
+
+    python benchmarks/bench_s3_clients.py [--calls N] [--threads T]
+
+Requests never leave the process: a ``before-send`` hook answers ``head_object``, so the
+numbers isolate client construction (service-model loading, credential resolution,
+endpoint setup) from network latency. Dummy credentials are used; no AWS account needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.s3_clients import S3ClientRegistry  # noqa: E402
+
+REGION = "ap-south-1"
+ACCESS_KEY = "AKIABENCHMARK"
+SECRET_KEY = "benchmark-secret"
+
+
+class _EmptyBody:
+    def stream(self, **_: Any):
+        return iter(())
+
+
+def _canned_response(request: Any, **_: Any) -> Any:
+    from botocore.awsrequest import AWSResponse
+
+    return AWSResponse(request.url, 200, {"Content-Length": "1"}, _EmptyBody())
+
+
+def offline(client: Any) -> Any:
+    """Answer every request in-process so only client-side work is measured."""
+    client.meta.events.register("before-send.s3", _canned_response)
+    return client
+
+
+def head_object(client: Any) -> None:
+    client.head_object(Bucket="bucket", Key="key")
+
+
+def per_call_client() -> Any:
+    import boto3
+
+    return offline(
+        boto3.session.Session().client(
+            "s3", region_name=REGION, aws_access_key_id=ACCESS_KEY, aws_secret_access_key=SECRET_KEY
+        )
+    )
+
+
+def run(name: str, get_client: Callable[[], Any], calls: int, threads: int) -> float:
+    def one(_: int) -> float:
+        started = time.perf_counter()
+        head_object(get_client())
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(one, range(calls)))
+    elapsed = time.perf_counter() - started
+    median_ms = statistics.median(latencies) * 1000
+    print(f"{name:<12} {median_ms:>8.2f} ms/call (median)  {calls / elapsed:>8.1f} calls/s")
+    return median_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    try:
+        import boto3  # noqa: F401
+    except ImportError:
+        parser.exit(1, "boto3 is required for this benchmark (pip install boto3)\n")
+
+    registry = S3ClientRegistry()
+    shared = lambda: registry.client(region=REGION, access_key=ACCESS_KEY, secret_key=SECRET_KEY)  # noqa: E731
+    offline(shared())  # the first call pays construction once, as at application start-up
+
+    print(f"{args.calls} calls on {args.threads} threads")
+    fresh_ms = run("per-call", per_call_client, args.calls, args.threads)
+    shared_ms = run("registry", shared, args.calls, args.threads)
+    print(f"saved {fresh_ms - shared_ms:.2f} ms per call ({fresh_ms / max(shared_ms, 1e-6):.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
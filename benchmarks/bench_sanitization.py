@@ -0,0 +1,123 @@
+"""Compare the shared sanitization rules with the per-call ``re.sub`` chains they replaced.
+
+Usage::
+
+    python benchmarks/bench_sanitization.py [--iterations N] [--slides 10]
+
+For a synthetic ``slides``-slide story in each template (see ``bench_html_render.py``):
+
+* ``url cleanup``   -- ``cleanup_urls`` on the rendered document (legacy: nine ``re.sub`` passes)
+* ``markdown``      -- cleaning every placeholder value and slide text the render uses
+* ``narration``     -- the news client's single-line clean of ``slides`` narrations
+* ``full render``   -- ``HTMLTemplateRenderer.render`` with legacy vs shared sanitizers
+
+Outputs of both paths are checked to be identical before timing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_html_render import TEMPLATES, make_record, timed  # noqa: E402
+
+from app.services import html_renderer  # noqa: E402
+from app.services.html_renderer import HTMLTemplateRenderer  # noqa: E402
+from app.services.sanitization import clean_markdown, clean_markdown_line, cleanup_urls  # noqa: E402
+
+
+def legacy_clean_markdown(text: str) -> str:
+    if not text:
+        return ""
+    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
+    text = re.sub(r'\*([^*]+)\*', r'\1', text)
+    text = re.sub(r'#+\s*', '', text)
+    text = re.sub(r'`([^`]+)`', r'\1', text)
+    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
+    return text.strip()
+
+
+def legacy_clean_markdown_line(text: str) -> str:
+    return re.sub(r'\s+', ' ', legacy_clean_markdown(text)).strip()
+
+
+def legacy_cleanup_urls(html: str) -> str:
+    html = re.sub(r'\{(\s*https?://[^\s"\'<>}]+)\}', r"\1", html)
+    html = re.sub(r'(\s*https?://[^\s"\'<>}]+)\}', r"\1", html)
+    html = re.sub(r'\{(\s*https?://[^\s"\'<>}]+)', r"\1", html)
+    html = re.sub(r'(href|src|content|url|poster-portrait-src|publisher-logo-src)="\{([^"]+)\}"', r'\1="\2"', html)
+    html = re.sub(r"(href|src|content|url|poster-portrait-src|publisher-logo-src)='\{([^']+)\}'", r"\1='\2'", html)
+    html = re.sub(r'"\{([^"]+)\}"', r'"\1"', html)
+    html = re.sub(r':\s*"\{([^"]+)\}"', r': "\1"', html)
+    return html
+
+
+def render_with(renderer: HTMLTemplateRenderer, markdown, urls, record, template_key: str) -> str:
+    saved = html_renderer.clean_markdown, html_renderer.cleanup_urls
+    html_renderer.clean_markdown, html_renderer.cleanup_urls = markdown, urls
+    try:
+        return renderer.render(record, template_key)
+    finally:
+        html_renderer.clean_markdown, html_renderer.cleanup_urls = saved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--slides", type=int, default=10)
+    args = parser.parse_args()
+
+    renderer = HTMLTemplateRenderer()
+    renderer._logger.disabled = True
+    renderer._loader._logger.disabled = True
+
+    for mode, template_key in TEMPLATES:
+        record = make_record(mode, template_key, args.slides)
+        html = renderer.render(record, template_key)
+        before = render_with(renderer, legacy_clean_markdown, legacy_cleanup_urls, record, template_key)
+        if html != before or cleanup_urls(html) != legacy_cleanup_urls(html):
+            raise SystemExit(f"{template_key}: shared sanitizers change the rendered output")
+        texts = [str(value) for value in renderer._mapper.map(record).values()]
+        texts += [slide.text for slide in record.slide_deck.slides]
+        narrations = [f"  {slide.text}\n\n  (narrated)  " for slide in record.slide_deck.slides]
+        if [clean_markdown(t) for t in texts] != [legacy_clean_markdown(t) for t in texts]:
+            raise SystemExit(f"{template_key}: markdown cleaning differs")
+        if [clean_markdown_line(t) for t in narrations] != [legacy_clean_markdown_line(t) for t in narrations]:
+            raise SystemExit(f"{template_key}: narration cleaning differs")
+
+        rows = [
+            (
+                "url cleanup",
+                timed(lambda: legacy_cleanup_urls(html), args.iterations),
+                timed(lambda: cleanup_urls(html), args.iterations),
+            ),
+            (
+                "markdown",
+                timed(lambda: [legacy_clean_markdown(t) for t in texts], args.iterations),
+                timed(lambda: [clean_markdown(t) for t in texts], args.iterations),
+            ),
+            (
+                "narration",
+                timed(lambda: [legacy_clean_markdown_line(t) for t in narrations], args.iterations),
+                timed(lambda: [clean_markdown_line(t) for t in narrations], args.iterations),
+            ),
+            (
+                "full render",
+                timed(
+                    lambda: render_with(renderer, legacy_clean_markdown, legacy_cleanup_urls, record, template_key),
+                    args.iterations,
+                ),
+                timed(lambda: renderer.render(record, template_key), args.iterations),
+            ),
+        ]
+        print(f"{template_key} ({len(html) / 1024:.1f} KiB, {args.slides} slides, {len(texts)} texts, median of {args.iterations}):")
+        for label, legacy, shared in rows:
+            print(f"  {label:<12} legacy {legacy:7.3f} ms  shared {shared:7.3f} ms  ({legacy / shared:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
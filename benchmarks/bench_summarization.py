@@ -0,0 +1,128 @@
+"""Benchmark the TextRank summarizer against the previous first-three-sentences summary.
+
+Usage::
+
+    python benchmarks/bench_summarization.py [--corpus DIR] [--sentences N] [--repeat R]
+
+``DIR`` holds ``*.txt`` articles; an optional ``<stem>.ref`` next to an article is a
+reference summary and enables ROUGE-1 F1. Without ``--corpus`` synthetic long articles
+are generated: one coherent story scattered among sentences on unrelated subjects.
+Quality is then the share of summary sentences that are on topic.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.summarization import TextRankSummarizer  # noqa: E402
+from app.services.text_segmentation import split_sentences, words  # noqa: E402
+
+TOPIC = "flood river relief camps villages rain district water rescue boats embankment".split()
+# Filler covers many unrelated subjects, so it is never central the way the story's topic is
+FILLER = (
+    "cricket festival music film market traffic weather fashion election concert recipe museum "
+    "airline startup smartphone tennis opera poetry satellite vaccine bakery marathon chess "
+    "podcast carnival lottery zoo theatre library sculpture orchestra telescope volcano"
+).split()
+COMMON = "officials said the on in local people many after new during state week".split()
+
+
+def lead_summary(text: str, max_chars: int = 300) -> str:
+    """The summary the extractor produced before: first sentences up to three, within the budget."""
+    parts: List[str] = []
+    for sentence in split_sentences(text)[:3]:
+        if len(" ".join(parts + [sentence])) > max_chars:
+            break
+        parts.append(sentence)
+    return " ".join(parts) if parts else text[:max_chars]
+
+
+def synthetic_corpus(articles: int, sentences: int, seed: int = 11) -> List[Tuple[str, Optional[str]]]:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(articles):
+        lines = []
+        for index in range(sentences):
+            # Leads are filler (bylines, teasers) to penalise pure position-based summaries
+            vocabulary = FILLER if index < 3 or rng.random() < 0.5 else TOPIC
+            tokens = [rng.choice(vocabulary) for _ in range(6)] + rng.sample(COMMON, 4)
+            rng.shuffle(tokens)
+            lines.append(" ".join(tokens).capitalize() + ".")
+        corpus.append((" ".join(lines), None))
+    return corpus
+
+
+def load_corpus(directory: Path) -> List[Tuple[str, Optional[str]]]:
+    corpus = []
+    for article in sorted(directory.glob("*.txt")):
+        reference = article.with_suffix(".ref")
+        corpus.append(
+            (article.read_text(encoding="utf-8"), reference.read_text(encoding="utf-8") if reference.exists() else None)
+        )
+    return corpus
+
+
+def rouge1(candidate: str, reference: str) -> float:
+    got = Counter(token.lower() for token in words(candidate))
+    want = Counter(token.lower() for token in words(reference))
+    overlap = sum((got & want).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(got.values())
+    recall = overlap / sum(want.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def on_topic_share(summary: str) -> float:
+    sentences = split_sentences(summary)
+    if not sentences:
+        return 0.0
+    topical = sum(1 for sentence in sentences if sum(token.lower() in TOPIC for token in words(sentence)) >= 3)
+    return topical / len(sentences)
+
+
+def run(name: str, summarize: Callable[[str], str], corpus, repeat: int) -> None:
+    timings = []
+    summaries: List[str] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        summaries = [summarize(text) for text, _ in corpus]
+        timings.append(time.perf_counter() - started)
+    per_article_ms = min(timings) / len(corpus) * 1000
+    references = [(summary, reference) for summary, (_, reference) in zip(summaries, corpus) if reference]
+    if references:
+        quality = f"ROUGE-1 F1={statistics.mean(rouge1(summary, reference) for summary, reference in references):.3f}"
+    else:
+        quality = f"on-topic={statistics.mean(on_topic_share(summary) for summary in summaries):.2f}"
+    print(f"{name:<10} {per_article_ms:>8.2f} ms/article  {quality}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, help="Directory of *.txt articles (+ optional *.ref summaries)")
+    parser.add_argument("--articles", type=int, default=20)
+    parser.add_argument("--sentences", type=int, default=150, help="Sentences per synthetic article")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.articles, args.sentences)
+    if not corpus:
+        parser.error("corpus is empty")
+    summarizer = TextRankSummarizer()
+
+    print(f"{len(corpus)} articles, best of {args.repeat} runs")
+    run("lead-3", lead_summary, corpus, args.repeat)
+    run("textrank", lambda text: summarizer.summarize(text, max_chars=300), corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
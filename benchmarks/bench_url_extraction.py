@@ -0,0 +1,132 @@
+"""Compare the native article parser with newspaper3k on a local HTML corpus.
+
+Usage::
+
+    python benchmarks/bench_url_extraction.py [--corpus DIR] [--pages N] [--repeat R]
+
+``DIR`` holds ``*.html`` pages; an optional ``<stem>.txt`` next to a page is its reference
+article text and enables the quality columns (token precision/recall/F1). Without
+``--corpus`` a synthetic corpus of news-like pages with navigation, share bars, related
+links and footers is generated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.url_extractor import URLContentExtractor  # noqa: E402
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_WORDS = (
+    "council budget school teachers district officials vote city state minister policy "
+    "report economy market growth water health hospital court ruling election campaign "
+    "river flood rain farmers crop price fuel transport metro project launch research"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 20))]
+    return " ".join(words).capitalize() + "."
+
+
+def synthetic_corpus(pages: int, seed: int = 7) -> List[Tuple[str, str, str]]:
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(pages):
+        paragraphs = [" ".join(_sentence(rng) for _ in range(rng.randint(2, 5))) for _ in range(rng.randint(4, 12))]
+        nav = " ".join(f'<a href="/section/{i}">{rng.choice(_WORDS).title()}</a>' for i in range(12))
+        related = "".join(f'<li><a href="/story/{i}">{_sentence(rng)}</a></li>' for i in range(5))
+        body = "".join(f"<p>{paragraph}</p>" for paragraph in paragraphs)
+        html = f"""<!doctype html><html><head><title>Story {index} | Example News</title>
+<meta property="og:title" content="Story {index}"><meta property="og:image" content="/images/{index}.jpg">
+<script>window.dataLayer = [{{"page": {index}}}];</script><style>body{{margin:0}}</style></head>
+<body><header><nav>{nav}</nav></header>
+<div class="share-tools">Share on Facebook, Twitter, WhatsApp and email this story to a friend.</div>
+<main><article><h1>Story {index}</h1><img src="/images/{index}-inline.jpg">{body}
+<div class="related-stories"><h3>Related</h3><ul>{related}</ul></div></article></main>
+<aside class="sidebar">{_sentence(rng)} {_sentence(rng)}</aside>
+<footer>Copyright Example News. All rights reserved. Terms of use and privacy policy apply.</footer>
+</body></html>"""
+        corpus.append((f"https://news.example.com/story/{index}", html, "\n\n".join(paragraphs)))
+    return corpus
+
+
+def load_corpus(directory: Path) -> List[Tuple[str, str, Optional[str]]]:
+    corpus = []
+    for page in sorted(directory.glob("*.html")):
+        reference = page.with_suffix(".txt")
+        corpus.append(
+            (
+                f"https://corpus.local/{page.name}",
+                page.read_text(encoding="utf-8", errors="replace"),
+                reference.read_text(encoding="utf-8") if reference.exists() else None,
+            )
+        )
+    return corpus
+
+
+def token_scores(extracted: str, reference: str) -> Tuple[float, float, float]:
+    got = Counter(token.lower() for token in _TOKEN.findall(extracted))
+    want = Counter(token.lower() for token in _TOKEN.findall(reference))
+    overlap = sum((got & want).values())
+    precision = overlap / max(1, sum(got.values()))
+    recall = overlap / max(1, sum(want.values()))
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def run(name: str, parse: Callable[[str, str], object], corpus, repeat: int) -> None:
+    timings = []
+    results = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [parse(url, html) for url, html, _ in corpus]
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    scored = [
+        token_scores(result.text if result else "", reference)
+        for result, (_, _, reference) in zip(results, corpus)
+        if reference is not None
+    ]
+    line = f"{name:<10} {len(corpus) / best:>10.1f} pages/s  {best / len(corpus) * 1000:>8.2f} ms/page"
+    if scored:
+        precision, recall, f1 = (statistics.mean(column) for column in zip(*scored))
+        line += f"  P={precision:.3f} R={recall:.3f} F1={f1:.3f}"
+    empty = sum(1 for result in results if not result)
+    print(line + (f"  ({empty} pages without result)" if empty else ""))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, help="Directory of *.html pages (+ optional *.txt references)")
+    parser.add_argument("--pages", type=int, default=200, help="Synthetic pages when --corpus is omitted")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.pages)
+    if not corpus:
+        parser.error("corpus is empty")
+    extractor = URLContentExtractor(min_article_chars=0)
+
+    print(f"{len(corpus)} pages, best of {args.repeat} runs")
+    run("native", extractor.parse_native, corpus, args.repeat)
+    try:
+        import newspaper  # noqa: F401
+    except ImportError:
+        print("newspaper  skipped (newspaper3k not installed)")
+    else:
+        run("newspaper", extractor.parse_with_newspaper, corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
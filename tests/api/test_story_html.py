@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.main import app, get_orchestrator
+from app.services.rendered_html import RenderedStory
+
+
+def test_story_html_returns_etag_and_304_for_matching_if_none_match():
+    rendered = RenderedStory("s1", "news", "t", "file", "r1", "v1", "<html></html>", '"e1"')
+    calls = []
+
+    def get_story_html(story_id):
+        calls.append(story_id)
+        return rendered
+
+    orchestrator = SimpleNamespace(html_renderer=object(), get_story_html=get_story_html)
+    app.dependency_overrides[get_orchestrator] = lambda: orchestrator
+    try:
+        client = TestClient(app)
+        response = client.get("/stories/s1/html")
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"e1"'
+        assert response.json() == {"html": "<html></html>", "story_id": "s1", "template_key": "t"}
+
+        not_modified = client.get("/stories/s1/html", headers={"If-None-Match": '"e1"'})
+        assert (not_modified.status_code, not_modified.content, not_modified.headers["etag"]) == (304, b"", '"e1"')
+        assert client.get("/stories/s1/html", headers={"If-None-Match": '"old"'}).status_code == 200
+    finally:
+        app.dependency_overrides.clear()
+    assert calls == ["s1", "s1", "s1"]
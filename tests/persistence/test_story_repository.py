@@ -3,13 +3,15 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
 
 from app.domain.dto import (
     DocInsights,
     ImageAsset,
     Mode,
+    NarrationSegment,
+    NarrationTrack,
     SemanticChunk,
     SlideBlock,
     SlideDeck,
@@ -94,3 +96,23 @@ def test_story_repository_updates_existing_record():
     assert fetched.category == "History"
     assert fetched.prompt_news == "updated news"
 
+
+def test_story_repository_keeps_narration_track_without_a_schema_change():
+    repo, session_factory = make_repository()
+    track = NarrationTrack(
+        provider="elevenlabs",
+        audio_url="https://cdn/story.mp3",
+        duration_seconds=12.5,
+        silence_padding_ms=400,
+        segments=[NarrationSegment(slide_index=0, placeholder_id="title", start_seconds=0.0, duration_seconds=12.5)],
+    )
+    record = make_story_record().model_copy(update={"narration_track": track})
+
+    repo.save(record)
+    fetched = repo.get(str(record.id))
+
+    assert fetched.narration_track == track
+    assert fetched.doc_insights == record.doc_insights
+    # Deployed ``stories`` tables predate the track; it must not need a column of its own
+    columns = {column["name"] for column in inspect(session_factory().get_bind()).get_columns("stories")}
+    assert "narration_track" not in columns
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
-from app.domain.dto import DocInsights, Entity, EntityMap, SemanticChunk
-from app.services.analysis import CompositeAnalysisFacade, HeuristicFunctionAnalyzer, PromptRecommendationAnalyzer
+from app.domain.dto import AnalysisReport, DocInsights, Entity, EntityMap, SemanticChunk
+from app.services.analysis import (
+    AnalysisContext,
+    CompositeAnalysisFacade,
+    HeuristicFunctionAnalyzer,
+    PromptRecommendationAnalyzer,
+)
 
 
 def make_insights(text: str, entities: list[Entity] | None = None) -> DocInsights:
@@ -68,3 +73,80 @@ def test_facade_merges_clusters_and_prompts():
     assert "Need statistics on adoption rate." in report.gaps
     assert any(prompt.startswith("How does") for prompt in report.recommended_prompts)
 
+
+def test_analyzers_share_one_lazily_built_context():
+    insights = make_insights("Flood waters rose overnight. Flood relief camps opened across the district.")
+    context = AnalysisContext.of(insights)
+
+    assert AnalysisContext.of(insights) is context
+    assert "tokens" not in vars(context)  # nothing computed until an analyzer asks
+    assert context.keywords(limit=1) == ["flood"]
+    assert len(context.sentences) == 2
+
+    seen = []
+
+    class RecordingAnalyzer(HeuristicFunctionAnalyzer):
+        def analyze(self, insights, context=None):
+            seen.append(context)
+            return super().analyze(insights, context)
+
+    CompositeAnalysisFacade([RecordingAnalyzer(), RecordingAnalyzer()]).analyze(insights)
+    assert seen == [context, context]
+
+    insights.semantic_chunks = [SemanticChunk(id="chunk-2", text="Budget talks resume")]
+    assert AnalysisContext.of(insights) is not context
+
+
+def test_context_memo_entry_is_dropped_with_its_insights():
+    import gc
+
+    before = len(AnalysisContext._memo)
+    for index in range(20):
+        insights = make_insights(f"Story {index}: flood waters rose overnight.")
+        CompositeAnalysisFacade([HeuristicFunctionAnalyzer()]).analyze(insights)
+    del insights
+    gc.collect()
+
+    assert len(AnalysisContext._memo) == before
+
+
+def test_context_is_rebuilt_when_chunks_are_replaced_even_if_ids_are_reused():
+    def chunk_text(index: int) -> str:
+        # Built at runtime so every text is a fresh allocation of the same size
+        return "".join(["flood relief " * 150, f"update {index}"])
+
+    insights = make_insights(chunk_text(0))
+    previous = AnalysisContext.of(insights)
+
+    for index in range(1, 10):
+        # Drop the old text before creating the new one, so its id is free to be reused
+        insights.semantic_chunks.clear()
+        insights.semantic_chunks.append(SemanticChunk(id="chunk-1", text=chunk_text(index)))
+        context = AnalysisContext.of(insights)
+        assert context is not previous
+        previous = context
+    assert previous.text.endswith("update 9")
+
+
+def test_concurrent_facade_merges_in_strategy_order():
+    import threading
+    import time
+
+    class SlowAnalyzer(HeuristicFunctionAnalyzer):
+        def __init__(self, prompt: str, delay: float):
+            self.prompt = prompt
+            self.delay = delay
+            self.thread = None
+
+        def analyze(self, insights, context=None):
+            time.sleep(self.delay)
+            self.thread = threading.current_thread().name
+            return AnalysisReport(recommended_prompts=[self.prompt])
+
+    first, second = SlowAnalyzer("first", 0.05), SlowAnalyzer("second", 0.0)
+    facade = CompositeAnalysisFacade([first, second], max_workers=2)
+
+    report = facade.analyze(make_insights("Markets rallied on Friday."))
+
+    assert report.recommended_prompts == ["first", "second"]
+    assert first.thread.startswith("analysis") and second.thread.startswith("analysis")
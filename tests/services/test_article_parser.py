@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from app.services.article_parser import NativeArticleParser
+from app.services.url_extractor import URLContentExtractor
+
+PAGE = """<html><head><title>Example News | Budget passes</title>
+<meta property="og:title" content="Budget passes">
+<meta property="og:image" content="/img/hero.jpg">
+<script>var tracking = "Do not include this script text in the article";</script></head>
+<body><nav><a href="/">Home</a> <a href="/world">World news, politics and a long list of sections</a></nav>
+<article><h1>Budget passes</h1>
+<div class="share-bar">Share this story on Facebook, Twitter and WhatsApp with your friends</div>
+<p>The city council voted on Tuesday to approve the new school budget. It passed 7-2.</p>
+<img src="/img/inline.jpg"><img src="/static/logo.svg">
+<p>Officials said the money would fund forty new teachers across the district.
+<p>Construction of two new campuses begins next spring, according to the plan.</p>
+<div class="related"><p>Related: Council debates transport plan for the coming decade</p></div>
+</article>
+<footer>Copyright 2024 Example News Corporation. All rights reserved worldwide.</footer></body></html>"""
+
+
+def test_native_parser_strips_boilerplate_and_harvests_images():
+    article = NativeArticleParser().parse("https://news.example.com/2024/budget", PAGE)
+
+    assert article.title == "Budget passes"
+    assert article.text.split("\n\n") == [
+        "The city council voted on Tuesday to approve the new school budget. It passed 7-2.",
+        "Officials said the money would fund forty new teachers across the district.",
+        "Construction of two new campuses begins next spring, according to the plan.",
+    ]
+    assert article.summary.startswith("The city council voted on Tuesday")
+    assert len(article.summary) <= 300
+    assert article.top_image_url == "https://news.example.com/img/hero.jpg"
+    assert article.images == ["https://news.example.com/img/hero.jpg", "https://news.example.com/img/inline.jpg"]
+
+
+def test_extractor_falls_back_to_newspaper_for_thin_pages():
+    class Extractor(URLContentExtractor):
+        fallback_calls = 0
+
+        def parse_with_newspaper(self, url, html):
+            Extractor.fallback_calls += 1
+            return None
+
+    extractor = Extractor(min_article_chars=100)
+
+    assert extractor.parse("https://news.example.com/a", PAGE).title == "Budget passes"
+    assert Extractor.fallback_calls == 0
+    assert extractor.parse("https://news.example.com/b", "<html><p>Too short.</p></html>") is None
+    assert Extractor.fallback_calls == 1
+
+
+def test_native_parser_matches_chrome_hints_on_whole_class_tokens():
+    page = """<html><body><div class="story-commentary"><div id="shareholders_letter">
+<p>The company told shareholders that quarterly revenue rose by twelve percent on strong demand.</p>
+</div></div><div class="comments-list"><p>Great article, thanks for writing this up for all of us!</p></div>
+<div class="site_header"><p>Subscribe now and get unlimited access to every story we publish.</p></div></body></html>"""
+
+    article = NativeArticleParser().parse("https://news.example.com/2024/results", page)
+
+    assert article.text == "The company told shareholders that quarterly revenue rose by twelve percent on strong demand."
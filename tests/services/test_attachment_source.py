@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+from types import SimpleNamespace
+
+import httpx
+
+from app.services.attachment_source import LocalFileSource, SharedSourceLoader, StreamingSource, as_source, http_source
+
+
+def test_local_file_source_hashes_through_mmap(tmp_path):
+    payload = b"%PDF-1.7\n" + bytes(range(256)) * 64
+    path = tmp_path / "scan.pdf"
+    path.write_bytes(payload)
+
+    source = LocalFileSource(path)
+    with source.mapped() as view:
+        assert view[:8] == b"%PDF-1.7"
+    assert source.sha256() == hashlib.sha256(payload).hexdigest()
+    assert source.size == len(payload)
+    assert as_source(source) is source
+    assert as_source(b"") is None
+
+
+def test_streaming_source_downloads_once_when_materialized():
+    opened = []
+
+    @contextlib.contextmanager
+    def opener():
+        opened.append(1)
+        yield io.BytesIO(b"abc" * 1000)
+
+    source = StreamingSource("s3://bucket/key", opener)
+    local = source.materialize()
+    assert source.materialize() is local
+    assert local.sha256() == hashlib.sha256(b"abc" * 1000).hexdigest()
+    with local.open() as first, local.open() as second:
+        assert first.read(3) == b"abc"
+        assert second.read() == b"abc" * 1000
+    assert source.size == 3000
+    assert len(opened) == 1
+
+
+def test_http_source_streams_response_body():
+    body = b"x" * (3 * 1024 * 1024 + 5)
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body)))
+
+    source = http_source("https://blob.example.com/a.png", client=client)
+
+    assert sum(len(chunk) for chunk in source.iter_chunks()) == len(body)
+    assert source.read_bytes() == body
+
+
+def test_shared_loader_reuses_sources_within_a_scope_and_closes_them_after():
+    contents = [b"v1"]
+
+    @contextlib.contextmanager
+    def opener():
+        yield io.BytesIO(contents[0])
+
+    opened = []
+
+    def open_source(attachment):
+        opened.append(attachment.uri)
+        return StreamingSource(attachment.uri, opener)
+
+    loader = SharedSourceLoader(open_source)
+    attachment = SimpleNamespace(uri="s3://bucket/scan.pdf")
+
+    with loader.scope():
+        source = loader(attachment)
+        assert loader(attachment) is source
+        spooled = source.materialize()
+    assert spooled._spool.closed
+    assert opened == ["s3://bucket/scan.pdf"]
+
+    # The object was re-uploaded at the same key; the next scope sees the new content
+    contents[0] = b"v2"
+    with loader.scope():
+        assert loader(attachment).materialize().read_bytes() == b"v2"
+    assert len(opened) == 2
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import os
+
+from app.services.cache import DiskCache, TTLCache
+
+
+def test_cache_expires_and_evicts_entries():
+    now = [0.0]
+    cache = TTLCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    now[0] = 11.0
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats.evictions, stats.expirations, stats.size) == (1, 1, 1)
+
+
+def test_disk_cache_round_trips_and_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=300)
+    for index, key in enumerate(["aa01", "bb02", "cc03"]):
+        cache.put(key, {"text": "x" * 80})
+        os.utime(tmp_path / key[:2] / f"{key}.json", (index, index))
+    assert cache.get("aa01") == {"text": "x" * 80}  # refreshes mtime, so "bb02" is now the oldest
+
+    cache.put("dd04", {"text": "y" * 80})
+
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") is not None
+    assert cache.total_bytes <= 300
+    stats = DiskCache(tmp_path, max_bytes=300).stats()
+    assert stats.size == 2
+    assert cache.stats().evictions == 2
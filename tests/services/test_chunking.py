@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from app.services.chunking import SemanticChunker, count_tokens
+
+
+def test_chunker_packs_paragraphs_and_splits_long_ones_on_sentences():
+    short = "Short intro paragraph with seven words."
+    long_paragraph = " ".join(f"Sentence number {index} has exactly six tokens." for index in range(12))
+    chunker = SemanticChunker(max_tokens=30, overlap_sentences=1)
+
+    windows = chunker.split(f"{short}\n\n{short}\n\n{long_paragraph}")
+
+    assert windows[0] == f"{short}\n\n{short}"
+    assert all(count_tokens(window) <= 30 for window in windows)
+    assert windows[1].startswith("Sentence number 0 has")
+    # consecutive windows of a split paragraph share one sentence of overlap
+    assert windows[2].startswith(windows[1].split(". ")[-1].rstrip("."))
+
+
+def test_chunker_builds_semantic_chunks_with_position_metadata():
+    chunks = SemanticChunker(max_tokens=20).chunk(
+        "First paragraph here.\n\n" + "word " * 45, id_prefix="att-1", source_id="att-1", metadata={"media_type": "pdf"}
+    )
+
+    assert [chunk.id for chunk in chunks] == ["att-1:chunk-1", "att-1:chunk-2", "att-1:chunk-3", "att-1:chunk-4"]
+    assert chunks[0].metadata == {"media_type": "pdf", "chunk_index": 0, "chunk_count": 4}
+    assert {chunk.source_id for chunk in chunks} == {"att-1"}
+
+
+def test_count_tokens_keeps_devanagari_vowel_signs_inside_words():
+    # \w alone splits these five words at their vowel signs into ten pieces
+    assert count_tokens("मौसम विभाग ने चेतावनी दी") == 5
+    assert count_tokens("बाढ़ राहत शिविर। Flood relief camps.") == 6
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+
+from app.services.classification import LabeledText, StoryClassifier
+from app.services.model_clients import NewsModelClient
+
+SPORTS = {"category": "Sports", "subcategory": "Cricket", "emotion": "Joy"}
+WEATHER = {"category": "Environment", "subcategory": "Weather", "emotion": "Fear"}
+
+EXAMPLES = [
+    LabeledText("India won the cricket match as the captain scored a century at the stadium", SPORTS),
+    LabeledText("The batsman hit a century and the bowler took five wickets in the test match", SPORTS),
+    LabeledText("भारत ने क्रिकेट मैच जीता, कप्तान ने स्टेडियम में शतक लगाया", SPORTS),
+    LabeledText("Heavy rain and flood warnings as the cyclone approaches the coast", WEATHER),
+    LabeledText("The weather department issued a flood alert after heavy rain in the district", WEATHER),
+    LabeledText("भारी बारिश से बाढ़ का खतरा, मौसम विभाग ने चेतावनी जारी की", WEATHER),
+]
+
+
+class CountingLanguageModel:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def complete(self, system_prompt: str, user_prompt: str) -> str:
+        self.calls += 1
+        return json.dumps({"category": "Politics", "subcategory": "Elections", "emotion": "Neutral"})
+
+
+def test_classifier_learns_heads_and_round_trips(tmp_path):
+    classifier = StoryClassifier.train(EXAMPLES, epochs=20)
+
+    result = classifier.classify("मौसम विभाग ने भारी बारिश और बाढ़ की चेतावनी दी")
+    assert result.as_tuple() == ("Environment", "Weather", "Fear")
+    assert classifier.evaluate(EXAMPLES)["category_accuracy"] == 1.0
+
+    path = tmp_path / "model.json"
+    classifier.save(path)
+    loaded = StoryClassifier.load(path)
+    assert loaded.classify("cricket captain century").as_tuple() == ("Sports", "Cricket", "Joy")
+    assert abs(loaded.classify(EXAMPLES[0].text).confidence - classifier.classify(EXAMPLES[0].text).confidence) < 1e-4
+
+
+def test_news_client_uses_llm_only_below_confidence_threshold():
+    classifier = StoryClassifier.train(EXAMPLES, epochs=20)
+    article = "The captain scored a century and India won the cricket match at the stadium today."
+
+    confident = CountingLanguageModel()
+    client = NewsModelClient(confident, classifier=classifier, min_classifier_confidence=0.5)
+    assert client._classify(article, "English") == (("Sports", "Cricket", "Joy"), "local")
+    assert confident.calls == 0
+
+    unsure = CountingLanguageModel()
+    client = NewsModelClient(unsure, classifier=classifier, min_classifier_confidence=1.01)
+    assert client._detect_category_subcategory_emotion(article, "English") == ("Politics", "Elections", "Neutral")
+    assert unsure.calls == 1
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import threading
+import time
 from typing import Optional
 
+import httpx
+import pytest
+
 from app.domain.dto import AttachmentDescriptor, Entity, SemanticChunk, StructuredJobRequest
+from app.services.attachment_source import http_source, s3_source
+from app.services.cache import DiskCache
 from app.services.document_intelligence import (
+    AzureDocumentIntelligenceAdapter,
     DefaultDocumentIntelligencePipeline,
     OCRAdapter,
     OCRExtraction,
     ParserAdapter,
     ParserResult,
+    PdfTextLayerAdapter,
 )
+from app.services.url_extractor import ArticleExtractionResult, URLContentExtractor
 
 
 class StubOCRAdapter(OCRAdapter):
@@ -84,3 +94,256 @@ def test_pipeline_defaults_when_no_parser():
     assert insights.summaries == []
     assert insights.entities.entities == {}
 
+
+class StubURLExtractor(URLContentExtractor):
+    def __init__(self, delays: dict[str, float], release: Optional[threading.Event] = None):
+        super().__init__()
+        self.delays = delays
+        self.release = release
+
+    def fetch(self, url: str) -> Optional[str]:
+        if self.release is not None and self.delays[url] < 0:
+            self.release.wait(5)
+            return None
+        time.sleep(self.delays[url])
+        return f"<html>{url}</html>"
+
+    def parse(self, url: str, html: str) -> Optional[ArticleExtractionResult]:
+        return ArticleExtractionResult(title=url, text=html, summary="", top_image_url=f"{url}/top.jpg")
+
+
+def test_pipeline_fetches_urls_concurrently_and_keeps_order():
+    urls = ["https://a.example.com/", "https://b.example.com/", "https://c.example.com/"]
+    extractor = StubURLExtractor({urls[0]: 0.3, urls[1]: 0.1, urls[2]: 0.2})
+    pipeline = DefaultDocumentIntelligencePipeline([], [], url_extractor=extractor)
+
+    started = time.perf_counter()
+    insights = pipeline.run(StructuredJobRequest(url_list=urls, attachments=[], focus_keywords=[]))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.55  # sequential fetching would take 0.6s
+    assert [chunk.source_id for chunk in insights.semantic_chunks] == urls
+    assert insights.metadata["article_images"] == [f"{url}/top.jpg" for url in urls]
+
+
+def test_pipeline_skips_urls_past_deadline():
+    urls = ["https://fast.example.com/", "https://hung.example.com/"]
+    release = threading.Event()
+    extractor = StubURLExtractor({urls[0]: 0.0, urls[1]: -1}, release=release)
+    pipeline = DefaultDocumentIntelligencePipeline([], [], url_extractor=extractor, url_deadline_seconds=0.2)
+
+    try:
+        insights = pipeline.run(StructuredJobRequest(url_list=urls, attachments=[], focus_keywords=[]))
+    finally:
+        release.set()
+
+    assert [chunk.source_id for chunk in insights.semantic_chunks] == [urls[0]]
+
+
+def test_pipeline_deadline_counts_from_each_urls_own_start():
+    urls = ["https://a.example.com/", "https://b.example.com/"]
+    extractor = StubURLExtractor({urls[0]: 0.15, urls[1]: 0.15})
+    pipeline = DefaultDocumentIntelligencePipeline(
+        [], [], url_extractor=extractor, url_fetch_workers=1, url_deadline_seconds=0.25
+    )
+
+    insights = pipeline.run(StructuredJobRequest(url_list=urls, attachments=[], focus_keywords=[]))
+
+    # b waits 0.15s for the only worker; a shared 0.25s budget would have dropped it
+    assert [chunk.source_id for chunk in insights.semantic_chunks] == urls
+
+
+class SlowOCRAdapter(StubOCRAdapter):
+    def extract(self, attachment: AttachmentDescriptor) -> Optional[OCRExtraction]:
+        time.sleep(0.2 if attachment.id == "att-0" else 0.05)
+        return OCRExtraction(attachment=attachment, text=f"text {attachment.id}", language="en", metadata={})
+
+
+def test_pipeline_runs_attachments_concurrently_in_input_order():
+    pipeline = DefaultDocumentIntelligencePipeline([SlowOCRAdapter("image/png", "")], [], ocr_workers=4)
+    attachments = [
+        AttachmentDescriptor(id=f"att-{index}", uri=f"s3://{index}.png", media_type="image/png", metadata={})
+        for index in range(4)
+    ]
+
+    started = time.perf_counter()
+    insights = pipeline.run(StructuredJobRequest(attachments=attachments, focus_keywords=[]))
+
+    assert time.perf_counter() - started < 0.35  # sequential OCR would take 0.35s
+    assert [chunk.text for chunk in insights.semantic_chunks] == [f"text att-{index}" for index in range(4)]
+
+
+def test_azure_adapter_polls_with_retry_after_and_backoff():
+    polls = iter([("running", {"retry-after": "5"}), ("running", {}), ("running", {}), ("succeeded", {})])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(202, headers={"operation-location": "https://di.example.com/op/1", "retry-after": "2"})
+        status, headers = next(polls)
+        payload = {"status": status}
+        if status == "succeeded":
+            payload["analyzeResult"] = {"pages": [{"lines": [{"content": "Hello"}, {"content": "World"}]}]}
+        return httpx.Response(200, json=payload, headers=headers)
+
+    sleeps: list[float] = []
+    adapter = AzureDocumentIntelligenceAdapter(
+        endpoint="https://di.example.com",
+        api_key="key",
+        attachment_loader=lambda attachment: b"%PDF",
+        poll_initial_interval=1.0,
+        poll_backoff=2.0,
+        poll_max_interval=3.0,
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        sleep=sleeps.append,
+        clock=lambda: sum(sleeps),
+    )
+
+    extraction = adapter.extract(
+        AttachmentDescriptor(id="doc", uri="s3://doc.pdf", media_type="application/pdf", metadata={})
+    )
+
+    assert extraction.text == "Hello\nWorld"
+    assert sleeps == [2.0, 5.0, 3.0, 3.0]  # submit Retry-After, poll Retry-After, then capped backoff
+
+
+def test_azure_adapter_cache_hit_skips_network(tmp_path):
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.method)
+        if request.method == "POST":
+            return httpx.Response(202, headers={"operation-location": "https://di.example.com/op/1"})
+        return httpx.Response(
+            200, json={"status": "succeeded", "analyzeResult": {"pages": [{"lines": [{"content": "Cached"}]}]}}
+        )
+
+    def make_adapter(api_version: str) -> AzureDocumentIntelligenceAdapter:
+        return AzureDocumentIntelligenceAdapter(
+            endpoint="https://di.example.com",
+            api_key="key",
+            api_version=api_version,
+            attachment_loader=lambda attachment: b"%PDF same bytes",
+            client=httpx.Client(transport=httpx.MockTransport(handler)),
+            sleep=lambda seconds: None,
+            cache=DiskCache(tmp_path),
+        )
+
+    adapter = make_adapter("2024-02-29-preview")
+    first = adapter.extract(AttachmentDescriptor(id="a", uri="s3://a.pdf", media_type="application/pdf", metadata={}))
+    second = adapter.extract(AttachmentDescriptor(id="b", uri="s3://b.pdf", media_type="application/pdf", metadata={}))
+    make_adapter("2024-11-30").extract(
+        AttachmentDescriptor(id="c", uri="s3://c.pdf", media_type="application/pdf", metadata={})
+    )
+
+    assert first.text == second.text == "Cached"
+    assert second.attachment.id == "b"
+    assert requests == ["POST", "GET", "POST", "GET"]  # new API version misses the cache
+
+
+class NoSuchKey(Exception):
+    """Stands in for botocore's ``ClientError`` subclass of the same name."""
+
+
+class MissingObjectS3Client:
+    def get_object(self, Bucket: str, Key: str):
+        raise NoSuchKey(f"An error occurred (NoSuchKey) when calling the GetObject operation: {Key}")
+
+
+@pytest.mark.parametrize("cached", [False, True])
+@pytest.mark.parametrize(
+    "make_source",
+    [
+        lambda: s3_source(MissingObjectS3Client(), "bucket", "missing.pdf"),
+        lambda: http_source(
+            "https://bucket.s3.amazonaws.com/missing.pdf",
+            client=httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(404))),
+        ),
+    ],
+    ids=["s3-no-such-key", "http-404"],
+)
+def test_azure_adapter_skips_attachments_that_cannot_be_read(tmp_path, make_source, cached):
+    def handler(request: httpx.Request) -> httpx.Response:
+        request.read()  # a real transport consumes the streamed body before Azure answers
+        return httpx.Response(202, headers={"operation-location": "https://di.example.com/op"})
+
+    adapter = AzureDocumentIntelligenceAdapter(
+        endpoint="https://di.example.com",
+        api_key="key",
+        attachment_loader=lambda attachment: make_source(),
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        sleep=lambda seconds: None,
+        cache=DiskCache(tmp_path) if cached else None,
+    )
+    pipeline = DefaultDocumentIntelligencePipeline([adapter], [])
+    attachment = AttachmentDescriptor(id="gone", uri="s3://bucket/missing.pdf", media_type="application/pdf", metadata={})
+
+    insights = pipeline.run(StructuredJobRequest(attachments=[attachment], focus_keywords=[]))
+
+    assert insights.semantic_chunks == []
+
+def make_pdf(page_texts: list[str]) -> bytes:
+    """Minimal single-font PDF with one text line per page."""
+    page_ids = [4 + 2 * index for index in range(len(page_texts))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % pid for pid in page_ids) + b"] /Count %d >>" % len(page_ids),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for pid, text in zip(page_ids, page_texts):
+        stream = f"BT /F1 10 Tf 20 700 Td ({text}) Tj ET".encode() if text else b""
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % (pid + 1)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def test_pdf_text_layer_adapter_handles_born_digital_and_defers_scans():
+    pytest.importorskip("pypdf")
+    documents = {
+        "digital": make_pdf(["Press release: the ministry announced a new rail line today.", "Second page text here."]),
+        "scanned": make_pdf(["", ""]),
+    }
+    local = PdfTextLayerAdapter(attachment_loader=lambda attachment: documents[attachment.id], min_chars_per_page=20)
+    remote = StubOCRAdapter(media_type="application/pdf", text="ocr text")
+    pipeline = DefaultDocumentIntelligencePipeline([local, remote], [])
+
+    insights = pipeline.run(
+        StructuredJobRequest(
+            attachments=[
+                AttachmentDescriptor(id=name, uri=f"s3://{name}.pdf", media_type="application/pdf", metadata={})
+                for name in documents
+            ],
+            focus_keywords=[],
+        )
+    )
+
+    assert insights.semantic_chunks[0].text.startswith("Press release: the ministry announced")
+    assert insights.semantic_chunks[0].metadata["source"] == "pdf_text_layer"
+    assert insights.semantic_chunks[1].text == "ocr text"
+    assert remote.calls == ["scanned"]
+
+
+def test_pdf_text_layer_adapter_marks_documents_past_max_pages(caplog):
+    pytest.importorskip("pypdf")
+    pdf = make_pdf([f"Page {index} of the annual budget statement." for index in range(3)])
+    adapter = PdfTextLayerAdapter(attachment_loader=lambda attachment: pdf, min_chars_per_page=20, max_pages=2)
+    attachment = AttachmentDescriptor(id="budget", uri="s3://budget.pdf", media_type="application/pdf", metadata={})
+
+    extraction = adapter.extract(attachment)
+
+    assert "Page 2" not in extraction.text
+    assert extraction.metadata["pages"] == 3
+    assert extraction.metadata["pages_extracted"] == 2
+    assert extraction.metadata["truncated"] is True
+    assert "first 2 only" in caplog.text
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import os
+
+from app.domain.dto import StructuredJobRequest
+from app.services.document_intelligence import DefaultDocumentIntelligencePipeline
+from app.services.gazetteer import AhoCorasickAutomaton, GazetteerEntityExtractor, GazetteerEntry
+
+
+def test_automaton_matches_leftmost_longest_on_word_boundaries():
+    automaton = AhoCorasickAutomaton(
+        [
+            GazetteerEntry("Delhi", "New Delhi", "LOCATION"),
+            GazetteerEntry("New Delhi", "New Delhi", "LOCATION"),
+            GazetteerEntry("भारत", "India", "LOCATION"),
+            GazetteerEntry("he", "He", "PERSON"),
+        ]
+    )
+
+    text = "Rains lashed NEW DELHI and Delhiites stayed home; भारतीय मौसम विभाग ने भारत में चेतावनी दी"
+    matches = automaton.find(text)
+
+    assert [(text[m.start : m.end], m.entry.canonical) for m in matches] == [
+        ("NEW DELHI", "New Delhi"),
+        ("भारत", "India"),
+    ]
+
+
+def test_extractor_counts_aliases_and_reloads_changed_files(tmp_path):
+    (tmp_path / "person.txt").write_text("# people\nNarendra Modi | PM Modi | नरेंद्र मोदी\n", encoding="utf-8")
+    extractor = GazetteerEntityExtractor(tmp_path, check_interval_seconds=0)
+
+    entities = extractor.extract("PM Modi met farmers. नरेंद्र मोदी ने कहा कि Narendra Modi ...")
+    assert [(e.type, e.name, e.metadata["mentions"]) for e in entities] == [("PERSON", "Narendra Modi", 3)]
+    assert entities[0].metadata["aliases"] == ["PM Modi", "नरेंद्र मोदी", "Narendra Modi"]
+    first = extractor.automaton
+
+    org = tmp_path / "org.txt"
+    org.write_text("Indian Space Research Organisation | ISRO | इसरो\n", encoding="utf-8")
+    os.utime(org, (1, 1))
+    assert extractor.automaton is not first
+    assert [e.name for e in extractor.extract("इसरो launches")] == ["Indian Space Research Organisation"]
+    assert extractor.automaton is extractor.automaton  # unchanged files: cached
+
+
+def test_pipeline_tags_entities_in_text_input(tmp_path):
+    (tmp_path / "location.txt").write_text("Assam | असम\nBrahmaputra | ब्रह्मपुत्र\n", encoding="utf-8")
+    pipeline = DefaultDocumentIntelligencePipeline(
+        ocr_adapters=[],
+        parser_adapters=[],
+        entity_extractor=GazetteerEntityExtractor(tmp_path),
+    )
+
+    insights = pipeline.run(StructuredJobRequest(text_input="असम में ब्रह्मपुत्र खतरे के निशान से ऊपर, Assam on alert"))
+
+    locations = insights.entities.get("LOCATION")
+    assert [entity.name for entity in locations] == ["Assam", "Brahmaputra"]
+    assert locations[0].metadata["mentions"] == 2
+    assert locations[0].metadata["chunk_ids"] == ["payload:text"]
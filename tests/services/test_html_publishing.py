@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import gzip
+
+from app.services import html_publishing
+from app.services.html_publishing import IMMUTABLE_CACHE_CONTROL, minify_amp_html, publish_html
+
+PAGE = """<!doctype html>
+<html amp lang="en">
+  <head>
+    <!-- analytics goes here -->
+    <style amp-boilerplate>body{-webkit-animation:-amp-start 8s steps(1,end) 0s 1 normal both}</style>
+    <noscript><style amp-boilerplate>body{-webkit-animation:none}</style></noscript>
+    <style amp-custom>
+      /* brand */
+      .title , .text :hover { content: "a  b;" ;  width: calc(100% - 2px) ; }
+    </style>
+    <script type="application/ld+json">{"headline":  "Floods"}</script>
+  </head>
+  <body>
+    <amp-img   src="a.png"
+       alt="two  spaces"   layout="fill" ></amp-img>
+    <p>Heavy    rain
+       in Assam</p>
+    <pre>  keep
+   this  </pre>
+  </body>
+</html>
+"""
+
+
+class RecordingS3:
+    def __init__(self) -> None:
+        self.objects = {}
+
+    def put_object(self, **kwargs) -> None:
+        self.objects[kwargs["Key"]] = kwargs
+
+
+def test_minify_keeps_amp_boilerplate_scripts_and_attribute_values():
+    html = minify_amp_html(PAGE)
+
+    assert "<!--" not in html
+    assert '<style amp-custom>.title,.text :hover{content:"a  b;";width:calc(100% - 2px)}</style>' in html
+    assert "<style amp-boilerplate>body{-webkit-animation:-amp-start 8s steps(1,end) 0s 1 normal both}</style>" in html
+    assert "<noscript><style amp-boilerplate>body{-webkit-animation:none}</style></noscript>" in html
+    assert '<script type="application/ld+json">{"headline":  "Floods"}</script>' in html
+    assert '<amp-img src="a.png" alt="two  spaces" layout="fill"></amp-img>' in html
+    assert "<p>Heavy rain\nin Assam</p>" in html
+    assert "<pre>  keep\n   this  </pre>" in html
+    assert len(html) < len(PAGE)
+
+
+def test_publish_stores_encoded_variants_with_headers():
+    s3 = RecordingS3()
+    key = publish_html(s3, "bucket", "stories/abc.html", PAGE, max_age_seconds=60)
+
+    assert key == "stories/abc.html"
+    identity = s3.objects[key]
+    assert identity["Body"] == minify_amp_html(PAGE).encode("utf-8")
+    assert (identity["ContentType"], identity["CacheControl"]) == ("text/html; charset=utf-8", "public, max-age=60")
+    assert "ContentEncoding" not in identity
+    compressed = s3.objects["stories/abc.html.gz"]
+    assert compressed["ContentEncoding"] == "gzip" and gzip.decompress(compressed["Body"]) == identity["Body"]
+    assert ("stories/abc.html.br" in s3.objects) == (html_publishing.brotli is not None)
+
+
+def test_content_hashed_keys_are_immutable_and_track_content():
+    s3 = RecordingS3()
+    first = publish_html(s3, "bucket", "abc.html", PAGE, content_hashed=True)
+    second = publish_html(s3, "bucket", "abc.html", PAGE.replace("Floods", "Drought"), content_hashed=True)
+
+    assert first.startswith("abc.") and first.endswith(".html") and first != second
+    assert publish_html(RecordingS3(), "bucket", "abc.html", PAGE, content_hashed=True) == first
+    assert {obj["CacheControl"] for obj in s3.objects.values()} == {IMMUTABLE_CACHE_CONTROL}
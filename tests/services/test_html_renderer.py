@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+
+import httpx
+
+from app.domain.dto import Mode
+from app.services.html_renderer import TemplateLoader
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_file_templates_are_reread_only_after_modification(tmp_path):
+    template_dir = tmp_path / "news_template"
+    template_dir.mkdir()
+    path = template_dir / "t.html"
+    path.write_text("v1", encoding="utf-8")
+    loader = TemplateLoader(template_base_path=template_dir)
+
+    first = loader.fetch("t", Mode.NEWS)
+    assert loader.fetch("t", Mode.NEWS) is first
+    path.write_text("v2!", encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    second = loader.fetch("t", Mode.NEWS)
+
+    assert (second.text, second.version != first.version) == ("v2!", True)
+    stats = loader.cache_stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 1)
+
+
+def test_url_templates_revalidate_with_etag_after_max_age():
+    requests = []
+    body = {"text": "<html>v1</html>", "etag": '"abc"'}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == body["etag"]:
+            return httpx.Response(304)
+        return httpx.Response(200, text=body["text"], headers={"ETag": body["etag"]})
+
+    clock = FakeClock()
+    loader = TemplateLoader(
+        max_age_seconds=60, http_client=httpx.Client(transport=httpx.MockTransport(handler)), clock=clock
+    )
+    url = "https://templates.example.org/t.html"
+
+    assert loader.load(url, Mode.NEWS, source="url") == "<html>v1</html>"
+    loader.load(url, Mode.NEWS, source="url")  # fresh: no request
+    clock.now = 61
+    assert loader.fetch(url, Mode.NEWS, source="url").version == "abc"  # 304
+    body.update(text="<html>v2</html>", etag='"def"')
+    loader.invalidate(url, source="url")
+    assert loader.load(url, Mode.NEWS, source="url") == "<html>v2</html>"
+
+    assert requests == [None, '"abc"', None]
+    stats = loader.cache_stats()
+    assert (stats.hits, stats.revalidations, stats.misses) == (1, 1, 2)
+
+
+def test_remote_template_served_stale_when_revalidation_fails():
+    calls = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        if calls["count"] > 1:
+            raise httpx.ConnectError("down", request=request)
+        return httpx.Response(200, text="cached", headers={"ETag": '"x"'})
+
+    clock = FakeClock()
+    loader = TemplateLoader(
+        max_age_seconds=1, http_client=httpx.Client(transport=httpx.MockTransport(handler)), clock=clock
+    )
+    url = "https://templates.example.org/t.html"
+    loader.load(url, Mode.NEWS, source="url")
+    clock.now = 5
+
+    assert loader.load(url, Mode.NEWS, source="url") == "cached"
+    assert calls["count"] == 2
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+import pytest
+
+from app.domain.dto import DocInsights, ImageAsset, Mode, SlideBlock, SlideDeck, StoryRecord, VoiceAsset
+from app.services.html_renderer import HTMLTemplateRenderer
+from app.services.html_templates import SLIDES_MARKER, CompiledTemplate, CompiledTemplateCache, LoadedTemplate
+from app.services.sanitization import clean_markdown, cleanup_urls
+
+
+def make_record(mode: Mode, template_key: str) -> StoryRecord:
+    return StoryRecord(
+        id=UUID(int=7),
+        mode=mode,
+        category="News",
+        input_language="en",
+        slide_count=6,
+        template_key=template_key,
+        doc_insights=DocInsights(summaries=["Summary"]),
+        slide_deck=SlideDeck(
+            template_key=template_key,
+            language_code="en",
+            slides=[SlideBlock(placeholder_id=f"s{i}", text=f"**Slide {i}** about `floods`") for i in range(6)],
+        ),
+        image_assets=[ImageAsset(source="ai", original_object_key="a.png", resized_variants=["https://cdn/a.png"])],
+        voice_assets=[VoiceAsset(provider="azure_basic", audio_url="https://cdn/a.mp3")],
+        canurl="https://story/primary",
+    )
+
+
+def test_compiled_template_fills_slots_in_one_pass():
+    template = CompiledTemplate(
+        "<h1>{{title}}</h1><p>{{title|safe}}</p>{{missing}}{{title|upper}}" + SLIDES_MARKER + "{{body}}"
+    )
+    calls = []
+
+    def transform(value: str) -> str:
+        calls.append(value)
+        return value.strip()
+
+    html = template.render(
+        {"title": " Flood ", "body": "{{title}}", "unused": "x"},
+        transform=transform,
+        raw={SLIDES_MARKER: "<slide/>"},
+    )
+
+    assert html == "<h1>Flood</h1><p>Flood</p>{{missing}}{{title|upper}}<slide/>{{title}}"
+    assert calls == [" Flood ", "{{title}}"]  # once per key actually used
+    assert template.placeholders == {"title", "body", "missing"}
+
+
+@pytest.mark.parametrize("mode,template_key", [(Mode.NEWS, "test-news-1"), (Mode.CURIOUS, "curious-template-1")])
+def test_renderer_output_matches_per_key_replacement(mode, template_key):
+    renderer = HTMLTemplateRenderer()
+    record = make_record(mode, template_key)
+
+    placeholders = renderer._mapper.map(record)
+    expected = renderer._loader.load(template_key, mode)
+    for key, value in placeholders.items():
+        cleaned = clean_markdown(str(value))
+        expected = expected.replace(f"{{{{{key}}}}}", cleaned).replace(f"{{{{{key}|safe}}}}", cleaned)
+    slides = renderer._generate_all_slides(record, template_key, placeholders)
+    expected = cleanup_urls(expected.replace(SLIDES_MARKER, slides))
+
+    assert renderer.render(record, template_key) == expected
+
+
+def test_compiled_cache_parses_each_template_version_once():
+    cache = CompiledTemplateCache()
+
+    first = cache.get(LoadedTemplate("t.html", "v1 {{x}}", "1"))
+    assert cache.get(LoadedTemplate("t.html", "v1 {{x}}", "1")) is first
+    assert cache.get(LoadedTemplate("t.html", "v2 {{x}}", "2")).render({"x": "!"}) == "v2 !"
+    assert cache.stats().hits == 1
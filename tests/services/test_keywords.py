@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from app.services.keywords import DocumentFrequencyTable, KeywordExtractor, segment_terms
+
+
+def test_segments_keep_hindi_words_and_break_at_stopwords():
+    segments = segment_terms("ब्रह्मपुत्र नदी खतरे के निशान से ऊपर है। Relief camps, in Assam")
+
+    assert segments == [["ब्रह्मपुत्र", "नदी", "खतरे"], ["निशान"], ["ऊपर"], ["relief", "camps"], ["assam"]]
+
+
+def test_repeated_phrases_rank_and_corpus_idf_demotes_common_terms():
+    text = (
+        "Flood relief camps opened in Dhubri. Officials said flood relief camps need boats. "
+        "The government said the government will send boats and government doctors."
+    )
+    table = DocumentFrequencyTable()
+    extractor = KeywordExtractor(table)
+    assert extractor.extract(text, limit=3)[:2] == ["flood relief camps", "government"]
+
+    for _ in range(50):
+        extractor.observe(segment_terms("The government announced a government scheme."))
+    assert "government" not in extractor.extract(text, limit=2)
+    assert extractor.extract(text, limit=1) == ["flood relief camps"]
+
+
+def test_document_frequency_table_persists(tmp_path):
+    path = tmp_path / "df.json"
+    table = DocumentFrequencyTable(path, autosave_every=2)
+    table.add_document(["flood", "assam"])
+    assert not path.exists()
+    table.add_document(["flood"])
+
+    reloaded = DocumentFrequencyTable(path)
+    assert reloaded.documents == 2
+    assert reloaded.frequencies(["flood", "assam", "budget"]) == [2, 1, 0]
+
+
+def test_document_frequency_tables_sharing_a_path_merge_on_save(tmp_path):
+    path = tmp_path / "df.json"
+    first, second = DocumentFrequencyTable(path), DocumentFrequencyTable(path)
+    first.add_document(["flood", "assam"])
+    second.add_document(["flood", "budget"])
+    second.add_document(["budget"])
+
+    first.save()
+    second.save()
+
+    reloaded = DocumentFrequencyTable(path)
+    assert reloaded.documents == 3
+    assert reloaded.frequencies(["flood", "assam", "budget"]) == [2, 1, 2]
+    assert second.frequencies(["assam"]) == [1]  # the last writer also picks up the others' documents
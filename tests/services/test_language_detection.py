@@ -4,11 +4,13 @@ from dataclasses import dataclass
 
 import pytest
 
-from app.domain.dto import IntakePayload
+from app.domain.dto import DocInsights, IntakePayload, SemanticChunk
 from app.services.language_detection import (
+    CascadingLanguageDetectionStrategy,
     DefaultLanguageDetectionService,
     FastTextLanguageDetectionStrategy,
     LanguageDetectionStrategy,
+    ScriptProfileLanguageStrategy,
 )
 
 
@@ -78,3 +80,101 @@ def test_fasttext_strategy_removes_label_prefix():
     assert language_code == "es"
     assert pytest.approx(confidence, rel=1e-6) == 0.42
 
+
+
+def test_script_profile_strategy_separates_english_and_hindi():
+    strategy = ScriptProfileLanguageStrategy()
+
+    english = strategy.detect("Create a story about the budget and its impact on the middle class")
+    hindi = strategy.detect("प्रधानमंत्री ने आज नई दिल्ली में किसानों के लिए नई योजना की घोषणा की है।")
+    romanized = strategy.detect("Mumbai mein baarish ki wajah se local trains band hai")
+
+    assert english[0] == "en" and english[1] >= 0.7
+    assert hindi[0] == "hi" and hindi[1] >= 0.7
+    assert romanized[0] == "hi"
+
+
+def test_cascade_stops_at_first_confident_stage_and_records_path():
+    class FailingStrategy(LanguageDetectionStrategy):
+        def detect(self, text: str):
+            raise RuntimeError("translator down")
+
+    remote = StubStrategy(language="mr", confidence=0.95)
+    cascade = CascadingLanguageDetectionStrategy(
+        [("local", StubStrategy(language="hi", confidence=0.4)), ("azure", FailingStrategy()), ("fasttext", remote)],
+        min_confidence=0.7,
+    )
+    service = DefaultLanguageDetectionService(strategy=cascade)
+
+    metadata = service.detect(make_payload())
+    assert metadata.language_code == "mr"
+    assert metadata.detection_path == ["local:hi:0.40", "azure:error", "fasttext:mr:0.95"]
+
+    unused = StubStrategy(language="mr", confidence=0.95)
+    confident_local = CascadingLanguageDetectionStrategy(
+        [("local", StubStrategy(language="en", confidence=0.9)), ("fasttext", unused)]
+    )
+    assert confident_local.detect("Hello world") == ("en", 0.9)
+    assert unused.called_with is None
+
+
+def test_url_only_request_takes_language_from_cached_content_sample():
+    class CountingStrategy(LanguageDetectionStrategy):
+        def __init__(self):
+            self.calls = 0
+
+        def detect(self, text: str):
+            self.calls += 1
+            return ScriptProfileLanguageStrategy().detect(text)
+
+    counting = CountingStrategy()
+    service = DefaultLanguageDetectionService(strategy=CascadingLanguageDetectionStrategy([("script", counting)]))
+    payload = make_payload(text_prompt=None, notes=None, prompt_keywords=[], urls=["https://news.example.in/story"])
+
+    requested = service.detect(payload)
+    assert requested.detection_path == ["request:deferred"]
+    assert counting.calls == 0
+
+    article = "प्रधानमंत्री ने आज नई दिल्ली में किसानों के लिए नई योजना की घोषणा की है। " * 40
+    insights = DocInsights(semantic_chunks=[SemanticChunk(id="url-1:chunk-1", text=article)])
+    first = service.detect_content(insights, requested)
+    second = service.detect_content(insights, requested)
+
+    assert first.language_code == second.language_code == "hi"
+    assert first.detection_path[-1].startswith("content:script:hi")
+    assert second.detection_path[-1] == "content:cached"
+    assert counting.calls == 1
+
+
+def test_fasttext_detect_many_uses_one_batched_predict():
+    class BatchModel:
+        def __init__(self):
+            self.calls = []
+
+        def predict(self, text, k: int = 1):
+            self.calls.append(text)
+            return [["__label__hi"], ["__label__en"]], [[0.97], [0.88]]
+
+    model = BatchModel()
+    strategy = FastTextLanguageDetectionStrategy(model_path="dummy.bin", loader=lambda _: model)
+
+    results = strategy.detect_many(["नमस्ते\nदुनिया", "hello\nworld"])
+
+    assert [code for code, _ in results] == ["hi", "en"]
+    assert model.calls == [["नमस्ते दुनिया", "hello world"]]
+
+
+@pytest.mark.parametrize(
+    "prompt,expected",
+    [("Budget 2024", "en"), ("climate change", "en"), ("AI regulation news", "en"), ("बजट 2024", "hi"), ("மழை", "ta")],
+)
+def test_weak_guesses_fall_back_to_default_unless_script_is_unambiguous(prompt, expected):
+    script = ScriptProfileLanguageStrategy()
+    service = DefaultLanguageDetectionService(
+        strategy=CascadingLanguageDetectionStrategy([("script", script)], fallback=script.detect_by_script)
+    )
+
+    metadata = service.detect(make_payload(text_prompt=prompt, notes=None, urls=[], prompt_keywords=[]))
+
+    assert metadata.language_code == expected
+    assert metadata.detection_path[-1].startswith("fallback:")
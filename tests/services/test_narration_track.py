@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import pytest
+
+from app.domain.dto import LanguageMetadata, SlideBlock, SlideDeck, VoiceAsset
+from app.services.narration_track import NarrationInput, NarrationTrackAssembler, iter_frames
+from app.services.voice_synthesis import DefaultVoiceSynthesisService, VoiceGenerationResult
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, mono, no CRC -> 417-byte frames of 1152 samples.
+HEADER = bytes((0xFF, 0xFB, 0x90, 0xC0))
+FRAME_SECONDS = 1152 / 44100
+
+
+def make_mp3(frame_count: int, fill: int = 0x11, id3: bool = False) -> bytes:
+    frames = (HEADER + bytes([fill]) * 413) * frame_count
+    if id3:
+        frames = b"ID3\x04\x00\x00\x00\x00\x00\x05" + b"\x00" * 5 + frames
+    return frames
+
+
+class RecordingStorage:
+    def __init__(self):
+        self.calls: list[tuple[VoiceGenerationResult, str]] = []
+
+    def store(self, *, audio: VoiceGenerationResult, filename: str) -> VoiceAsset:
+        self.calls.append((audio, filename))
+        return VoiceAsset(
+            provider=(audio.metadata or {}).get("provider") or "voice",
+            audio_url=f"https://cdn.example.com/{filename}",
+        )
+
+
+def make_input(index: int, audio: bytes) -> NarrationInput:
+    return NarrationInput(
+        slide_index=index,
+        slide=SlideBlock(placeholder_id=f"slide_{index}", text="text"),
+        audio_bytes=audio,
+        asset=VoiceAsset(provider="stub", audio_url=f"https://cdn.example.com/{index}.mp3"),
+    )
+
+
+def test_assembler_concatenates_frames_with_silence_and_offsets():
+    storage = RecordingStorage()
+    assembler = NarrationTrackAssembler(storage, silence_padding_ms=int(FRAME_SECONDS * 2 * 1000))
+
+    track = assembler.assemble(
+        [make_input(0, make_mp3(3, id3=True)), make_input(1, b"AZURE:en:stub"), make_input(2, make_mp3(5))],
+        provider="azure_basic",
+    )
+
+    assert track is not None
+    combined, filename = storage.calls[0]
+    assert filename.endswith("-narration.mp3")
+    frames = list(iter_frames(combined.audio_bytes))
+    assert len(frames) == 3 + 2 + 5
+    assert frames[3].data[4:] == bytes(413)  # silent padding frames
+    assert [segment.slide_index for segment in track.segments] == [0, 2]
+    assert track.segments[1].start_seconds == pytest.approx(5 * FRAME_SECONDS, abs=1e-3)
+    assert track.duration_seconds == pytest.approx(10 * FRAME_SECONDS, abs=1e-3)
+    assert track.provider == "azure_basic"
+
+
+def test_assembler_returns_none_without_mp3_audio():
+    storage = RecordingStorage()
+    assembler = NarrationTrackAssembler(storage)
+
+    assert assembler.assemble([make_input(0, b"ELEVENLABS:en:text")], provider="elevenlabs_pro") is None
+    assert storage.calls == []
+
+
+def test_voice_service_builds_track_from_in_memory_audio():
+    class Provider:
+        name = "stub"
+
+        def supports(self, provider_id: str) -> bool:
+            return provider_id == self.name
+
+        def synthesize(self, text: str, *, language: str) -> VoiceGenerationResult:
+            return VoiceGenerationResult(audio_bytes=make_mp3(2), format="mp3", metadata={"provider": "stub"})
+
+    storage = RecordingStorage()
+    service = DefaultVoiceSynthesisService(
+        [Provider()], storage, track_assembler=NarrationTrackAssembler(storage, silence_padding_ms=0)
+    )
+    deck = SlideDeck(
+        template_key="modern",
+        slides=[SlideBlock(placeholder_id="cover", text="Title"), SlideBlock(placeholder_id="slide_1", text="Body")],
+    )
+
+    assets, track = service.synthesize_with_track(deck, LanguageMetadata(language_code="en", confidence=0.9), "stub")
+
+    assert len(assets) == 2
+    assert len(storage.calls) == 3  # two slides + combined track
+    assert [str(segment.audio_url) for segment in track.segments] == [str(asset.audio_url) for asset in assets]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+
+from app.domain.dto import SemanticChunk
+from app.services import ranking
+from app.services.ranking import BM25Ranker, select_chunks
+
+
+def make_chunk(source: str, index: int, text: str) -> SemanticChunk:
+    return SemanticChunk(id=f"{source}:chunk-{index}", text=text, source_id=source)
+
+
+DOCUMENTS = [
+    "The monsoon flooded villages along the river and farmers lost their crops.",
+    "Cricket fans celebrated the final match late into the night.",
+    "Flood relief camps opened as the river kept rising near the villages.",
+    "A new metro line will open next year in the city centre.",
+]
+
+
+def test_bm25_numpy_and_python_paths_agree(monkeypatch):
+    scores = BM25Ranker().score("river flood villages", DOCUMENTS)
+    monkeypatch.setattr(ranking, "np", None)
+    fallback = BM25Ranker().score("river flood villages", DOCUMENTS)
+
+    assert fallback == pytest.approx(scores)
+    assert scores[2] > scores[0] > scores[1] == scores[3] == 0.0
+
+
+def test_select_chunks_keeps_each_source_lede_then_best_matches_in_order():
+    chunks = [make_chunk("a", index, text) for index, text in enumerate(DOCUMENTS)] + [
+        make_chunk("b", 0, "Second source lede about the weather office warning."),
+    ]
+
+    selected = select_chunks(chunks, "flood relief river", budget_chars=210)
+
+    assert [chunk.id for chunk in selected] == ["a:chunk-0", "a:chunk-2", "b:chunk-0"]
+    assert select_chunks(chunks, "flood", budget_chars=10_000) == chunks
+
+
+def test_bm25_matches_whole_hindi_words():
+    documents = ["असम में बाढ़ से गांव डूबे", "क्रिकेट फाइनल में जीत", "बाढ़ राहत शिविर खोले गए"]
+
+    assert ranking.tokenize("बाढ़ राहत") == ["बाढ़", "राहत"]
+    scores = BM25Ranker().score("राहत शिविर", documents)
+    assert scores[2] > scores[0] == scores[1] == 0.0
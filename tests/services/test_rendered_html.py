@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from uuid import UUID
+
+from app.domain.dto import DocInsights, Mode, SlideBlock, SlideDeck, StoryRecord
+from app.services.html_renderer import HTMLTemplateRenderer, TemplateLoader
+from app.services.rendered_html import RenderedStoryCache, etag_matches
+
+
+def make_record(title: str = "Floods") -> StoryRecord:
+    return StoryRecord(
+        id=UUID(int=9),
+        mode=Mode.NEWS,
+        category="News",
+        input_language="en",
+        slide_count=4,
+        template_key="t",
+        doc_insights=DocInsights(summaries=[title]),
+        slide_deck=SlideDeck(template_key="t", language_code="en", slides=[SlideBlock(placeholder_id="s1", text=title)]),
+        created_at=datetime(2024, 1, 1),
+    )
+
+
+def test_cached_html_reused_until_template_changes_or_story_saved(tmp_path):
+    path = tmp_path / "t.html"
+    path.write_text("<h1>{{storytitle}}</h1>v1", encoding="utf-8")
+    cache = RenderedStoryCache(HTMLTemplateRenderer(template_loader=TemplateLoader(template_base_path=tmp_path)))
+    loads = []
+
+    def load(title="Floods"):
+        loads.append(title)
+        return make_record(title)
+
+    first = cache.get("9", load)
+    assert cache.get("9", load) is first
+    assert len(loads) == 1
+
+    path.write_text("<h1>{{storytitle}}</h1>v2", encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    second = cache.get("9", load)
+    assert second.html.endswith("v2") and second.etag != first.etag
+    assert second.key[:3] == first.key[:3] and second.template_version != first.template_version
+
+    cache.invalidate("9")
+    third = cache.get("9", lambda: load("Drought"))
+    assert third.record_version != second.record_version
+    assert loads == ["Floods", "Floods", "Drought"]
+
+
+def test_etag_matching_uses_weak_comparison():
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"abc", "def"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"abcd"', etag)
+    assert not etag_matches(None, etag)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.s3_clients import S3ClientRegistry
+
+
+class CountingRegistry(S3ClientRegistry):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.created = []
+
+    def _create(self, region, access_key, secret_key):
+        self.created.append((region, access_key, secret_key, self._max_pool_connections))
+        return object()
+
+
+def test_registry_builds_one_client_per_region_and_credentials():
+    registry = CountingRegistry()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(pool.map(lambda _: registry.client(region="ap-south-1"), range(32)))
+
+    assert len({id(client) for client in clients}) == 1
+    assert registry.client(region="ap-south-1", access_key="", secret_key="") is clients[0]
+    assert registry.client(region="ap-south-1", access_key="AK", secret_key="SK") is not clients[0]
+    assert registry.client(region="us-east-1") is not clients[0]
+    assert len(registry.created) == 3
+
+
+def test_configure_rebuilds_clients_with_new_pool_size():
+    registry = CountingRegistry(max_pool_connections=10)
+    first = registry.client(region="ap-south-1")
+    registry.configure(max_pool_connections=64)
+
+    assert registry.client(region="ap-south-1") is not first
+    assert [created[-1] for created in registry.created] == [10, 64]
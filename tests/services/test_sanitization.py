@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import random
+import re
+
+import pytest
+
+from app.services.sanitization import clean_markdown, clean_markdown_line, clean_markdown_paragraphs, cleanup_urls
+
+
+# The per-call re.sub chains the sanitization module replaced; outputs must stay byte-identical.
+def legacy_markdown(text: str) -> str:
+    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
+    text = re.sub(r'\*([^*]+)\*', r'\1', text)
+    text = re.sub(r'#+\s*', '', text)
+    text = re.sub(r'`([^`]+)`', r'\1', text)
+    return re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
+
+
+def legacy_paragraphs(text: str) -> str:
+    text = re.sub(r'^---+$', '', legacy_markdown(text), flags=re.MULTILINE)
+    return re.sub(r'\n\s*\n\s*\n+', '\n\n', text).strip()
+
+
+def legacy_line(text: str) -> str:
+    return re.sub(r'\s+', ' ', legacy_markdown(text)).strip()
+
+
+def legacy_cleanup_urls(html: str) -> str:
+    html = re.sub(r'\{(\s*https?://[^\s"\'<>}]+)\}', r"\1", html)
+    html = re.sub(r'(\s*https?://[^\s"\'<>}]+)\}', r"\1", html)
+    html = re.sub(r'\{(\s*https?://[^\s"\'<>}]+)', r"\1", html)
+    html = re.sub(r'(href|src|content|url|poster-portrait-src|publisher-logo-src)="\{([^"]+)\}"', r'\1="\2"', html)
+    html = re.sub(r"(href|src|content|url|poster-portrait-src|publisher-logo-src)='\{([^']+)\}'", r"\1='\2'", html)
+    html = re.sub(r'"\{([^"]+)\}"', r'"\1"', html)
+    return re.sub(r':\s*"\{([^"]+)\}"', r': "\1"', html)
+
+
+MARKDOWN_CORPUS = [
+    "",
+    "Plain text with no markup.",
+    "## **Floods** in *Assam*: see [the report](https://example.org/r) and `data`",
+    "***both*** and **unclosed *mixed** markup*",
+    "[#](x) then *a#* and `#` and [a](#x)",
+    "Title\n\n---\n\n\n  \nBody with odd　spaces\x1c\n\n\n\nEnd  ",
+    "# Heading\n### Sub\t\nमौसम **विभाग** ने *चेतावनी* दी",
+]
+
+HTML_CORPUS = [
+    '<a href="{https://a.example/x}">x</a><img src=\'{https://a.example/i.png}\'>',
+    '<amp-story publisher-logo-src="{{https://cdn/logo.png}}" poster-portrait-src="{https://cdn/p.jpg}">',
+    '{"@context": "{https://schema.org}", "headline": "{Floods}", "url":"{https://s/1}"}',
+    "{ {http://x} and {http://a}} and http://a}b} and { https://spaced.example}",
+    '<style amp-custom>body{margin:0}a{color:red}</style><p>{not a url}</p>',
+    'key: "{{nested}}" url="{http://u}" content=\'{x\'} "{"',
+]
+
+
+def fuzz_corpus(fragments, count, seed):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(fragments) for _ in range(rng.randint(0, 24))) for _ in range(count)]
+
+
+@pytest.mark.parametrize(
+    "cleaner,legacy",
+    [
+        (clean_markdown, lambda text: legacy_markdown(text).strip()),
+        (clean_markdown_paragraphs, legacy_paragraphs),
+        (clean_markdown_line, legacy_line),
+    ],
+)
+def test_markdown_cleaners_match_legacy_chains(cleaner, legacy):
+    fragments = ["*", "**", "#", "`", "[", "]", "(", ")", "](", "---", "-", "\n", " ", "\t", " ", "a", "ब", "x y"]
+    for text in MARKDOWN_CORPUS + fuzz_corpus(fragments, 3000, seed=48):
+        assert cleaner(text) == legacy(text), repr(text)
+
+
+def test_cleanup_urls_matches_legacy_chain():
+    fragments = ["{", "}", '"', "'", "=", ":", " ", "\n", "https://", "http://", "a.b/c", "<", ">", "src", "href", "url", "x"]
+    for html in HTML_CORPUS + fuzz_corpus(fragments, 3000, seed=48):
+        assert cleanup_urls(html) == legacy_cleanup_urls(html), repr(html)
+
+
+def test_cleanup_urls_leaves_clean_documents_untouched():
+    html = '<style amp-custom>a{color:red}</style><script type="application/ld+json">{"url": "https://s/1"}</script>'
+    assert cleanup_urls(html) is html
+    assert cleanup_urls('<img src="{https://cdn/a.png}">') == '<img src="https://cdn/a.png">'
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from app.services import summarization
+from app.services.summarization import TextRankSummarizer
+
+ENGLISH = (
+    "Heavy monsoon rain flooded villages along the river on Monday. "
+    "Cricket scores from the weekend were announced. "
+    "Flood waters damaged crops across the district and farmers asked for relief. "
+    "Relief camps in the flooded district received food and medicine. "
+    "A local festival went ahead as planned."
+)
+HINDI = (
+    "मानसून की बारिश से नदी में बाढ़ आ गई। "
+    "क्रिकेट मैच का नतीजा घोषित हुआ। "
+    "बाढ़ से किसानों की फसलें बर्बाद हो गईं और राहत की मांग की गई। "
+    "राहत शिविरों में बाढ़ पीड़ितों को भोजन भेजा गया।"
+)
+
+
+def test_textrank_prefers_central_sentences_and_keeps_source_order():
+    summarizer = TextRankSummarizer()
+
+    ranked = summarizer.rank_sentences(ENGLISH)
+    summary = summarizer.summarize(ENGLISH, max_chars=160)
+
+    assert {sentence.index for sentence in ranked[:2]} == {2, 3}
+    assert ranked[-1].text in {"A local festival went ahead as planned.", "Cricket scores from the weekend were announced."}
+    assert summary == (
+        "Flood waters damaged crops across the district and farmers asked for relief. "
+        "Relief camps in the flooded district received food and medicine."
+    )
+
+
+def test_textrank_handles_devanagari_and_falls_back_to_lead_without_numpy(monkeypatch):
+    ranked = TextRankSummarizer().rank_sentences(HINDI)
+    assert len(ranked) == 4
+    assert ranked[-1].text == "क्रिकेट मैच का नतीजा घोषित हुआ।"
+
+    monkeypatch.setattr(summarization, "np", None)
+    assert TextRankSummarizer().summarize(ENGLISH, max_sentences=1) == (
+        "Heavy monsoon rain flooded villages along the river on Monday."
+    )
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from app.services.text_segmentation import segment_for_speech, split_sentences
+
+
+def test_split_sentences_handles_latin_and_devanagari_terminators():
+    text = "पहला वाक्य। दूसरा वाक्य! Third sentence? \"Quoted end.\" Last one"
+
+    assert split_sentences(text) == [
+        "पहला वाक्य।",
+        "दूसरा वाक्य!",
+        "Third sentence?",
+        "\"Quoted end.\"",
+        "Last one",
+    ]
+
+
+def test_segment_for_speech_packs_sentences_and_splits_long_clauses():
+    long_sentence = "alpha beta, " * 30 + "end."
+    text = "Short one. Short two. " + long_sentence
+
+    chunks = segment_for_speech(text, max_chars=60)
+
+    assert chunks[0] == "Short one. Short two."
+    assert all(len(chunk) <= 60 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
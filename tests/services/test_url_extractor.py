@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import gzip
+import time
+from typing import Optional
+
+import httpx
+
+from app.services.cache import TTLCache
+from app.services.url_extractor import ArticleExtractionResult, URLContentExtractor, normalize_url
+
+
+class ScriptedExtractor(URLContentExtractor):
+    def __init__(self, responses: list[httpx.Response], cache: TTLCache):
+        super().__init__(cache=cache)
+        self.responses = responses
+        self.requests: list[Optional[dict[str, str]]] = []
+        self.parsed: list[str] = []
+
+    def _download(self, url: str, headers: Optional[dict[str, str]] = None) -> Optional[httpx.Response]:
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+    def parse(self, url: str, html: str) -> Optional[ArticleExtractionResult]:
+        self.parsed.append(html)
+        return ArticleExtractionResult(title="Title", text=html, summary="")
+
+
+def test_normalize_url_drops_tracking_params_and_fragment():
+    assert normalize_url("HTTPS://News.Example.com:443/story?b=2&utm_source=x&a=1#top") == (
+        "https://news.example.com/story?a=1&b=2"
+    )
+    # Some sites address content with ``ref``; only well-known click identifiers are dropped
+    assert normalize_url("https://example.com/view?ref=42&fbclid=abc&gclid=def") == "https://example.com/view?ref=42"
+
+
+def test_conditional_get_reuses_cached_parse_on_304():
+    cache = TTLCache(max_entries=4, ttl_seconds=60)
+    extractor = ScriptedExtractor(
+        [
+            httpx.Response(200, text="<p>v1</p>", headers={"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024"}),
+            httpx.Response(304),
+            httpx.Response(200, text="<p>v2</p>"),
+        ],
+        cache,
+    )
+
+    first = extractor.extract("https://example.com/a?utm_medium=email")
+    second = extractor.extract("https://example.com/a")
+    third = extractor.extract("https://example.com/a")
+
+    assert second is first
+    assert third.text == "<p>v2</p>"
+    assert extractor.parsed == ["<p>v1</p>", "<p>v2</p>"]
+    assert extractor.requests[1] == {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 Jan 2024"}
+    stats = extractor.cache_stats()
+    assert (stats.hits, stats.misses, stats.revalidations) == (2, 1, 1)
+
+
+def test_download_deadline_frees_the_worker_from_a_trickling_host():
+    def trickle():
+        for _ in range(50):
+            time.sleep(0.02)
+            yield b"<p>still loading</p>"
+
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=trickle())))
+    extractor = URLContentExtractor(download_deadline_seconds=0.1, client=client)
+
+    started = time.perf_counter()
+    assert extractor.fetch("https://slow.example.com/story") is None
+    assert time.perf_counter() - started < 0.5  # the whole body would take a second
+
+
+def test_download_deadline_keeps_compressed_bodies_readable():
+    body = "<p>Flood relief camps opened across the district.</p>"
+    compressed = gzip.compress(body.encode())
+    client = httpx.Client(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=compressed, headers={"Content-Encoding": "gzip"})
+        )
+    )
+    extractor = URLContentExtractor(download_deadline_seconds=5, client=client)
+
+    assert extractor.fetch("https://news.example.com/story") == body
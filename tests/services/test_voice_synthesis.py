@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass
 
+import pytest
+
 from app.domain.dto import LanguageMetadata, Mode, SlideBlock, SlideDeck, VoiceAsset
 from app.services.voice_synthesis import (
     AzureTTSClient,
+    ChunkedVoiceProvider,
     DefaultVoiceSynthesisService,
     ElevenLabsClient,
+    HedgedVoiceProvider,
+    LatencyTracker,
+    ProviderCircuitBreaker,
     VoiceGenerationResult,
     VoiceProvider,
     VoiceStorageService,
+    VoiceSynthesisError,
 )
 
 
@@ -90,3 +99,175 @@ def test_elevenlabs_and_azure_clients_generate_bytes():
     assert res1.audio_bytes.startswith(b"ELEVENLABS")
     assert res2.audio_bytes.startswith(b"AZURE")
 
+
+def test_voice_service_skips_a_slide_when_every_provider_fails():
+    class FailsOnBody(StubVoiceProvider):
+        def synthesize(self, text: str, *, language: str) -> VoiceGenerationResult:
+            if text.startswith("This slide"):
+                raise VoiceSynthesisError("All voice providers failed")
+            return super().synthesize(text, language=language)
+
+    storage = StubStorage()
+    service = DefaultVoiceSynthesisService(
+        [FailsOnBody(VoiceGenerationResult(audio_bytes=b"bytes", format="mp3"))], storage
+    )
+
+    assets = service.synthesize(make_deck(), make_language(), provider="stub")
+
+    assert len(assets) == 1 and len(storage.calls) == 1  # the title slide's audio is kept
+
+
+class ScriptedProvider:
+    def __init__(self, name: str, *, fail: bool = False, gate: threading.Event | None = None):
+        self.name = name
+        self._fail = fail
+        self._gate = gate
+        self.calls = 0
+
+    def supports(self, provider_id: str) -> bool:
+        return provider_id == self.name
+
+    def synthesize(self, text: str, *, language: str) -> VoiceGenerationResult:
+        self.calls += 1
+        if self._gate is not None:
+            self._gate.wait(timeout=5)
+        if self._fail:
+            raise RuntimeError(f"{self.name} down")
+        return VoiceGenerationResult(audio_bytes=self.name.encode(), format="mp3", metadata={"provider": self.name})
+
+
+def test_hedged_provider_fires_secondary_when_primary_is_slow():
+    gate = threading.Event()
+    primary = ScriptedProvider("elevenlabs_pro", gate=gate)
+    secondary = ScriptedProvider("azure_basic")
+    hedged = HedgedVoiceProvider([primary, secondary], latency=LatencyTracker(initial_delay=0.05))
+
+    result = hedged.synthesize("Hello", language="en")
+    gate.set()
+
+    assert hedged.supports("elevenlabs_pro")
+    assert result.audio_bytes == b"azure_basic"
+    assert primary.calls == 1 and secondary.calls == 1
+
+
+def test_hedged_provider_skips_open_circuit_until_cooldown():
+    now = [0.0]
+    breaker = ProviderCircuitBreaker(failure_threshold=2, cooldown_seconds=30, clock=lambda: now[0])
+    primary = ScriptedProvider("elevenlabs_pro", fail=True)
+    secondary = ScriptedProvider("azure_basic")
+    hedged = HedgedVoiceProvider([primary, secondary], breaker=breaker, latency=LatencyTracker(initial_delay=5))
+
+    for _ in range(3):
+        assert hedged.synthesize("Hello", language="en").audio_bytes == b"azure_basic"
+
+    assert primary.calls == 2  # circuit opened after the second failure
+    now[0] = 31.0
+    hedged.synthesize("Hello", language="en")
+    assert primary.calls == 3  # half-open trial after the cooldown
+
+
+def test_circuit_breaker_lets_a_single_trial_call_through_when_half_open():
+    now = [0.0]
+    breaker = ProviderCircuitBreaker(failure_threshold=1, cooldown_seconds=30, clock=lambda: now[0])
+    breaker.record_failure("elevenlabs_pro")
+    assert not breaker.acquire("elevenlabs_pro")
+
+    now[0] = 31.0
+    assert breaker.acquire("elevenlabs_pro")
+    assert not breaker.acquire("elevenlabs_pro") and not breaker.is_available("elevenlabs_pro")
+
+    breaker.record_failure("elevenlabs_pro")  # trial failed: cooldown starts over
+    assert not breaker.acquire("elevenlabs_pro")
+    now[0] = 62.0
+    assert breaker.acquire("elevenlabs_pro")
+    breaker.record_success("elevenlabs_pro")
+    assert breaker.acquire("elevenlabs_pro") and breaker.acquire("elevenlabs_pro")
+
+
+def test_hedged_provider_sends_concurrent_callers_elsewhere_during_a_half_open_trial():
+    now = [0.0]
+    breaker = ProviderCircuitBreaker(failure_threshold=1, cooldown_seconds=30, clock=lambda: now[0])
+    breaker.record_failure("elevenlabs_pro")
+    now[0] = 31.0
+    gate = threading.Event()
+    primary = ScriptedProvider("elevenlabs_pro", gate=gate)
+    secondary = ScriptedProvider("azure_basic")
+    hedged = HedgedVoiceProvider([primary, secondary], breaker=breaker, latency=LatencyTracker(initial_delay=5))
+
+    trial = threading.Thread(target=hedged.synthesize, args=("Hello",), kwargs={"language": "en"})
+    trial.start()
+    try:
+        while breaker.is_available("elevenlabs_pro"):  # until the trial call has been claimed
+            time.sleep(0.001)
+        results = [hedged.synthesize("Hello", language="en") for _ in range(3)]
+    finally:
+        gate.set()
+        trial.join()
+
+    assert [result.audio_bytes for result in results] == [b"azure_basic"] * 3
+    assert primary.calls == 1
+
+def test_hedged_provider_raises_when_every_provider_fails():
+    hedged = HedgedVoiceProvider([ScriptedProvider("a", fail=True), ScriptedProvider("b", fail=True)])
+
+    with pytest.raises(VoiceSynthesisError):
+        hedged.synthesize("Hello", language="en")
+
+
+def test_latency_tracker_uses_percentile_of_recent_samples():
+    tracker = LatencyTracker(percentile=0.9, min_samples=3, initial_delay=2.0, min_delay=0.0, max_delay=10.0)
+    assert tracker.hedge_delay("p") == 2.0
+
+    for seconds in [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]:
+        tracker.record("p", seconds)
+
+    assert tracker.hedge_delay("p") == pytest.approx(1.0)
+
+
+def test_chunked_provider_synthesizes_sentences_in_parallel_and_joins_frames():
+    frame = bytes((0xFF, 0xFB, 0x90, 0xC0)) + b"\x00" * 413
+
+    class RecordingProvider(ScriptedProvider):
+        def __init__(self):
+            super().__init__("azure_basic")
+            self.texts: list[str] = []
+
+        def synthesize(self, text: str, *, language: str) -> VoiceGenerationResult:
+            self.texts.append(text)
+            return VoiceGenerationResult(audio_bytes=frame * 2, format="mp3", metadata={"provider": self.name})
+
+    inner = RecordingProvider()
+    chunked = ChunkedVoiceProvider(inner, threshold_chars=50, chunk_chars=40)
+
+    short = chunked.synthesize("Brief text.", language="en")
+    long_result = chunked.synthesize("यह पहला वाक्य है। This is the second sentence. And a third one here.", language="hi")
+
+    assert short.audio_bytes == frame * 2
+    assert long_result.metadata["chunks"] == 3
+    assert long_result.audio_bytes == frame * 6
+    assert sorted(inner.texts[1:]) == sorted(["यह पहला वाक्य है।", "This is the second sentence.", "And a third one here."])
+
+
+def test_chunked_provider_resynthesizes_when_chunks_come_from_different_streams():
+    mpeg1 = bytes((0xFF, 0xFB, 0x90, 0xC0)) + b"\x00" * 413  # 44.1 kHz, as ElevenLabs returns
+    mpeg2 = bytes((0xFF, 0xF3, 0x88, 0xC0)) + b"\x00" * 284  # 16 kHz, as Azure returns
+
+    class MixedProvider(ScriptedProvider):
+        def __init__(self):
+            super().__init__("hedged")
+            self.texts: list[str] = []
+            self.lock = threading.Lock()
+
+        def synthesize(self, text: str, *, language: str) -> VoiceGenerationResult:
+            with self.lock:
+                self.texts.append(text)
+            if text.startswith("This"):
+                return VoiceGenerationResult(audio_bytes=mpeg2 * 2, format="mp3", metadata={"provider": "azure_basic"})
+            return VoiceGenerationResult(audio_bytes=mpeg1 * 2, format="mp3", metadata={"provider": "elevenlabs"})
+
+    inner = MixedProvider()
+    text = "First sentence is here. This is the second sentence. And a third one here."
+    result = ChunkedVoiceProvider(inner, threshold_chars=50, chunk_chars=40).synthesize(text, language="en")
+
+    assert inner.texts[-1] == text  # whole slide in one call
+    assert result.audio_bytes == mpeg1 * 2 and "chunks" not in (result.metadata or {})
@@ -0,0 +1,168 @@
+"""Train and evaluate the local story classifier (category / subcategory / emotion).
+
+Usage::
+
+    python train_classifier.py train --out models/story_classifier.json [--database-url URL | --jsonl FILE]
+    python train_classifier.py eval --model models/story_classifier.json [--database-url URL | --jsonl FILE]
+
+Training data comes from the ``stories`` table (news stories whose ``doc_insights``
+carry the labels recorded at generation time) or from a JSONL export with ``text``,
+``category``, ``subcategory`` and ``emotion`` fields. Labels produced by the local
+classifier itself or by the failure default are skipped unless ``--include-local`` is
+given, so the model does not learn from its own guesses. ``train`` holds out a fraction
+of the examples and prints the evaluation; point ``STORY_CLASSIFIER_MODEL_PATH`` at the
+written model to enable it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.domain.dto import DocInsights, Mode  # noqa: E402
+from app.services.classification import HEADS, HashedFeaturizer, LabeledText, StoryClassifier  # noqa: E402
+from app.services.model_clients import SOURCE_TEXT_BUDGET  # noqa: E402
+from app.services.ranking import ranking_query, select_chunks  # noqa: E402
+
+TRUSTED_SOURCES = {"llm", "request"}
+
+
+def examples_from_jsonl(path: Path) -> Iterator[LabeledText]:
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            labels = {name: str(row[name]) for name in HEADS if row.get(name)}
+            if row.get("text") and labels:
+                yield LabeledText(row["text"], labels)
+
+
+def examples_from_database(database_url: str, include_local: bool = False) -> Iterator[LabeledText]:
+    from sqlalchemy import select
+
+    from app.persistence.database import create_session_factory
+    from app.persistence.story_repository import StoryORM
+
+    factory = create_session_factory(database_url)
+    with factory() as session:
+        rows = session.execute(select(StoryORM.category, StoryORM.doc_insights).where(StoryORM.mode == Mode.NEWS.value))
+        for category, doc_insights in rows:
+            insights = DocInsights(**(doc_insights or {}))
+            # Same text selection NewsModelClient classifies at generation time
+            selected = select_chunks(insights.semantic_chunks, ranking_query(insights), SOURCE_TEXT_BUDGET)
+            text = "\n\n".join(chunk.text.strip() for chunk in selected)
+            if not text:
+                continue
+            labels = {}
+            recorded = insights.metadata.get("classification") or {}
+            if include_local or recorded.get("source") in TRUSTED_SOURCES:
+                labels = {name: str(recorded[name]) for name in HEADS if recorded.get(name)}
+            elif category and category != Mode.NEWS.value.title():
+                # Older stories only have the category the user picked
+                labels = {"category": category}
+            if labels:
+                yield LabeledText(text, labels)
+
+
+def load_examples(args: argparse.Namespace) -> List[LabeledText]:
+    if args.jsonl:
+        return list(examples_from_jsonl(Path(args.jsonl)))
+    database_url = args.database_url
+    if not database_url:
+        from app.config import get_settings
+
+        database_url = get_settings().database.url
+    return list(examples_from_database(database_url, include_local=args.include_local))
+
+
+def print_report(report: dict, min_confidence: float) -> None:
+    for name in HEADS:
+        if f"{name}_accuracy" in report:
+            print(f"  {name:<12} accuracy {report[f'{name}_accuracy']:.3f}")
+    print(
+        f"  at confidence >= {min_confidence:.2f}: coverage {report['coverage']:.3f}, "
+        f"all-heads accuracy {report['covered_accuracy']:.3f} (remaining stories go to the LLM)"
+    )
+
+
+def train(args: argparse.Namespace) -> int:
+    examples = load_examples(args)
+    if len(examples) < 2:
+        print("not enough labelled stories to train", file=sys.stderr)
+        return 1
+    random.Random(args.seed).shuffle(examples)
+    holdout = int(len(examples) * args.holdout)
+    evaluation, training = examples[:holdout], examples[holdout:]
+
+    started = time.perf_counter()
+    try:
+        classifier = StoryClassifier.train(
+            training,
+            featurizer=HashedFeaturizer(hash_bits=args.hash_bits),
+            epochs=args.epochs,
+            learning_rate=args.learning_rate,
+            seed=args.seed,
+        )
+    except ValueError as exc:
+        # Stories generated before subcategory/emotion were recorded carry only a category
+        print(f"cannot train: {exc}; every head ({', '.join(HEADS)}) needs labelled stories", file=sys.stderr)
+        return 1
+    print(f"trained on {len(training)} stories in {time.perf_counter() - started:.1f}s")
+    for name, head in classifier.heads.items():
+        print(f"  {name:<12} {len(head.labels)} labels, {len(head.weights)} active features")
+    if evaluation:
+        print(f"held-out evaluation ({len(evaluation)} stories):")
+        print_report(classifier.evaluate(evaluation, args.min_confidence), args.min_confidence)
+    classifier.save(args.out)
+    print(f"wrote {args.out}")
+    return 0
+
+
+def evaluate(args: argparse.Namespace) -> int:
+    classifier = StoryClassifier.load(args.model)
+    examples = load_examples(args)
+    if not examples:
+        print("no labelled stories to evaluate", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    report = classifier.evaluate(examples, args.min_confidence)
+    elapsed = time.perf_counter() - started
+    print(f"evaluated {len(examples)} stories ({elapsed / len(examples) * 1e6:.0f} µs per story):")
+    print_report(report, args.min_confidence)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, handler in (("train", train), ("eval", evaluate)):
+        command = commands.add_parser(name)
+        source = command.add_mutually_exclusive_group()
+        source.add_argument("--database-url", help="Stories database (default: settings database.url)")
+        source.add_argument("--jsonl", help="Labelled examples, one JSON object per line")
+        command.add_argument("--include-local", action="store_true", help="Also learn from local-classifier labels")
+        command.add_argument("--min-confidence", type=float, default=0.7)
+        command.set_defaults(handler=handler)
+        if name == "train":
+            command.add_argument("--out", required=True)
+            command.add_argument("--epochs", type=int, default=10)
+            command.add_argument("--learning-rate", type=float, default=0.5)
+            command.add_argument("--hash-bits", type=int, default=18)
+            command.add_argument("--holdout", type=float, default=0.1)
+            command.add_argument("--seed", type=int, default=13)
+        else:
+            command.add_argument("--model", required=True)
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())